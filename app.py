@@ -6,15 +6,35 @@ Flask 백엔드 서버
 import os
 import json
 import re
-import sqlite3
+import base64
+import binascii
 import hashlib
 import secrets
 from datetime import datetime
-import urllib.request
-import urllib.error
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from functools import wraps
-from flask import Flask, render_template, request, jsonify, session, g
+from flask import Flask, Response, render_template, request, jsonify, session, g, stream_with_context
 from dotenv import load_dotenv
+from database import ConnectionPool, insert_history_items
+from migrations import migrate
+import recipe_search
+from ingredient_index import IngredientIndex
+from recipe_corpus import RecipeCorpus
+import ingredient_names
+from ingredient_names import canonical_key, canonical_names
+from cache import LRUCache, SQLiteCache, TieredCache
+from phash import PerceptualHashIndex, dhash, is_informative
+from http_pool import HTTPConnectionPool
+from streaming import IncrementalRecipeParser, format_sse, iter_sse_data
+from llm_response import SalvageStats, first_json, salvage_json, strip_think
+from jobs import JobQueue, FINISHED_STATUSES
+from image_prep import ImagePreprocessor, in_worker_process
+from singleflight import SingleFlight
+from model_scoreboard import (
+    ModelScoreboard, OUTCOME_OK, OUTCOME_RATE_LIMITED, OUTCOME_PARSE_ERROR, OUTCOME_ERROR
+)
 
 load_dotenv()
 
@@ -23,9 +43,16 @@ app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB 제한
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', secrets.token_hex(32))
 
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
-BASE_URL = "https://openrouter.ai/api/v1"
+BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')  # 모의 서버 사용 시 변경
 DATABASE = 'smart_recipe.db'
 
+# SQLite 연결 설정 (연결 풀, WAL 모드)
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # 밀리초
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 16000))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))  # 바이트 (0이면 비활성화)
+SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', 16))  # 동시에 빌려줄 수 있는 최대 연결 수
+SQLITE_STORE_POOL_SIZE = int(os.getenv('SQLITE_STORE_POOL_SIZE', 8))  # 캐시/작업 큐/색인용 연결 풀 크기
+
 # 이미지 인식 모델 (우선순위)
 IMAGE_MODELS = [
     "google/gemma-3-27b-it:free",
@@ -40,76 +67,196 @@ TEXT_MODELS = [
     "deepseek/deepseek-r1-0528:free",
 ]
 
+# OpenRouter 커넥션 풀 설정
+OPENROUTER_POOL_SIZE = int(os.getenv('OPENROUTER_POOL_SIZE', 8))
+OPENROUTER_POOL_IDLE_TIMEOUT = float(os.getenv('OPENROUTER_POOL_IDLE_TIMEOUT', 60))  # 초
+OPENROUTER_POOL_WARMUP = int(os.getenv('OPENROUTER_POOL_WARMUP', 1))  # 시작 시 미리 열어둘 연결 수
+
+# 모델 레이스 모드: 1순위 모델 호출 후 지연 시간 내 응답이 없으면 다음 모델을 동시에 호출
+MODEL_RACE_MODE = os.getenv('MODEL_RACE_MODE', '0') == '1'
+MODEL_HEDGE_DELAY = float(os.getenv('MODEL_HEDGE_DELAY', 4))  # 초
+MODEL_RACE_MAX_CONCURRENCY = int(os.getenv('MODEL_RACE_MAX_CONCURRENCY', 2))  # 요청당 동시 호출 수
+MODEL_RACE_WORKERS = int(os.getenv('MODEL_RACE_WORKERS', 16))
+
+# 모델 점수판 / 서킷 브레이커 설정
+MODEL_STATS_WINDOW = int(os.getenv('MODEL_STATS_WINDOW', 100))  # 모델별 최근 호출 기록 수
+MODEL_STATS_MAX_AGE = float(os.getenv('MODEL_STATS_MAX_AGE', 300))  # 기록 유지 기간 (초)
+MODEL_BREAKER_THRESHOLD = int(os.getenv('MODEL_BREAKER_THRESHOLD', 5))  # 브레이커가 열리는 연속 실패 수
+MODEL_BREAKER_RESET = float(os.getenv('MODEL_BREAKER_RESET', 60))  # 반열림까지 대기 시간 (초)
+
+# 비동기 작업 큐 설정
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))  # 작업 워커 스레드 수
+JOB_MAX_PENDING = int(os.getenv('JOB_MAX_PENDING', 100))  # 대기열 최대 길이
+JOB_RETENTION = int(os.getenv('JOB_RETENTION', 24 * 3600))  # 완료 작업 보관 기간 (초)
+JOB_EVENTS_TIMEOUT = int(os.getenv('JOB_EVENTS_TIMEOUT', 300))  # SSE 구독 최대 시간 (초)
+JOB_LEASE = int(os.getenv('JOB_LEASE', 120))  # 실행 중 작업 임대 시간 (초), 갱신이 끊기면 다른 프로세스가 회수
+
+# 비전 모델 업로드 전 이미지 전처리 설정 (Pillow 필요)
+IMAGE_PREP_ENABLED = os.getenv('IMAGE_PREP_ENABLED', '1') == '1'
+IMAGE_MAX_EDGE = int(os.getenv('IMAGE_MAX_EDGE', 1280))  # 긴 변 최대 픽셀
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'JPEG')  # JPEG 또는 WEBP
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', 85))
+IMAGE_PREP_WORKERS = int(os.getenv('IMAGE_PREP_WORKERS', 2))  # 0이면 요청 스레드에서 실행
+
+# 바이너리 업로드 읽기 설정
+UPLOAD_CHUNK_SIZE = 64 * 1024
+BINARY_UPLOAD_TYPES = ('multipart/form-data', 'application/octet-stream')
+
+# 동일 요청 병합 설정 (프로세스 간 병합은 멀티 워커 배포용)
+SINGLEFLIGHT_CROSS_PROCESS = os.getenv('SINGLEFLIGHT_CROSS_PROCESS', '0') == '1'
+SINGLEFLIGHT_LEASE_TTL = int(os.getenv('SINGLEFLIGHT_LEASE_TTL', 120))  # 초
+
+# 저장 레시피 목록 페이지 크기
+RECIPES_PAGE_SIZE = int(os.getenv('RECIPES_PAGE_SIZE', 20))
+RECIPES_MAX_PAGE_SIZE = int(os.getenv('RECIPES_MAX_PAGE_SIZE', 100))
+
+# 저장 레시피 응답 필드: API 이름 -> (컬럼, JSON 디코딩 여부)
+RECIPE_FIELDS = {
+    'id': ('id', False),
+    'name': ('recipe_name', False),
+    'recipe': ('recipe_data', True),
+    'ingredients': ('ingredients', True),
+    'cuisine_type': ('cuisine_type', False),
+    'difficulty': ('difficulty', False),
+    'cook_time': ('cook_time', False),
+    'rating': ('rating', False),
+    'notes': ('notes', False),
+    'tags': ('tags', True),
+    'created_at': ('created_at', False),
+}
+
+# 재료 이름 정규화 동의어 사전 ({"표준 이름": ["동의어", ...]})
+INGREDIENT_SYNONYMS_PATH = os.getenv('INGREDIENT_SYNONYMS_PATH', ingredient_names.DEFAULT_SYNONYMS_PATH)
+
+# 재료 역색인 (보유 재료로 만들 수 있는 저장 레시피 찾기)
+INGREDIENT_INDEX_TTL = int(os.getenv('INGREDIENT_INDEX_TTL', 300))  # 초
+INGREDIENT_INDEX_MAX_USERS = int(os.getenv('INGREDIENT_INDEX_MAX_USERS', 1000))  # 메모리에 유지할 사용자 수
+
+# 로컬 레시피 코퍼스 (LLM 호출 전 재료 구성이 맞는 레시피 검색)
+RECIPE_CORPUS_ENABLED = os.getenv('RECIPE_CORPUS_ENABLED', '1') == '1'
+RECIPE_CORPUS_PATH = os.getenv(
+    'RECIPE_CORPUS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recipe_corpus.json')
+)
+RECIPE_CORPUS_MIN_COVERAGE = float(os.getenv('RECIPE_CORPUS_MIN_COVERAGE', 0.8))  # 레시피 재료 중 보유 비율
+RECIPE_CORPUS_MAX_MISSING = int(os.getenv('RECIPE_CORPUS_MAX_MISSING', 2))  # 허용 부족 재료 수
+RECIPE_CORPUS_LEARN = os.getenv('RECIPE_CORPUS_LEARN', '1') == '1'  # LLM 생성 레시피를 코퍼스에 추가
+
+# 이미지 분석 결과 캐시 설정
+ANALYZE_CACHE_TTL = int(os.getenv('ANALYZE_CACHE_TTL', 7 * 24 * 3600))  # 초
+ANALYZE_CACHE_MEMORY_SIZE = int(os.getenv('ANALYZE_CACHE_MEMORY_SIZE', 256))
+ANALYZE_CACHE_MAX_ROWS = int(os.getenv('ANALYZE_CACHE_MAX_ROWS', 10000))
+# 유사 이미지로 간주할 최대 해밍 거리 (64비트 dHash, 음수면 비활성화)
+PHASH_MAX_DISTANCE = int(os.getenv('PHASH_MAX_DISTANCE', 6))
+# 켜진(또는 꺼진) 비트가 이보다 적은 해시(단색/단순 그라데이션)는 유사 이미지 매칭에 사용하지 않음
+PHASH_MIN_BITS = int(os.getenv('PHASH_MIN_BITS', 8))
+PHASH_PRUNE_INTERVAL = int(os.getenv('PHASH_PRUNE_INTERVAL', 600))  # 만료된 캐시 항목의 해시 정리 주기 (초)
+
+# 레시피 생성 결과 캐시 설정
+RECIPE_CACHE_TTL = int(os.getenv('RECIPE_CACHE_TTL', 24 * 3600))  # 초
+RECIPE_TRUNCATED_CACHE_TTL = int(os.getenv('RECIPE_TRUNCATED_CACHE_TTL', 300))  # 잘린 응답에서 복구한 레시피 (초)
+RECIPE_CACHE_MEMORY_SIZE = int(os.getenv('RECIPE_CACHE_MEMORY_SIZE', 512))
+RECIPE_CACHE_MAX_ROWS = int(os.getenv('RECIPE_CACHE_MAX_ROWS', 5000))
+
+
+# 재료 이름 정규화기 (추출/캐시 키/통계/역색인 공용, 마이그레이션 전에 설정)
+ingredient_names.configure(INGREDIENT_SYNONYMS_PATH)
+
 
 # ===== 데이터베이스 =====
 
+SQLITE_PRAGMAS = {
+    'busy_timeout': SQLITE_BUSY_TIMEOUT,
+    'cache_size': -SQLITE_CACHE_SIZE_KB,
+    'mmap_size': SQLITE_MMAP_SIZE,
+}
+db_pool = ConnectionPool(DATABASE, max_size=SQLITE_POOL_SIZE, pragmas=SQLITE_PRAGMAS)
+
+# 캐시/작업 큐/해시 색인/코퍼스/병합 임대용 풀 (요청 연결을 쥔 채 빌리므로 요청 풀과 나눠 서로 기다리지 않게 함)
+store_pool = ConnectionPool(DATABASE, max_size=SQLITE_STORE_POOL_SIZE, pragmas=SQLITE_PRAGMAS)
+
+
 def get_db():
-    """데이터베이스 연결"""
+    """데이터베이스 연결 (요청 동안 풀에서 빌림)"""
     if 'db' not in g:
-        g.db = sqlite3.connect(DATABASE)
-        g.db.row_factory = sqlite3.Row
+        g.db = db_pool.connect()
     return g.db
 
 
 @app.teardown_appcontext
 def close_db(exception):
-    """요청 종료 시 DB 연결 해제"""
+    """요청 종료 시 미완료 트랜잭션 정리 후 연결을 풀에 반납"""
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        db_pool.release(db)
 
 
 def init_db():
-    """데이터베이스 초기화"""
-    db = sqlite3.connect(DATABASE)
-    db.executescript('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            nickname TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS user_preferences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER UNIQUE REFERENCES users(id) ON DELETE CASCADE,
-            allergies TEXT DEFAULT '[]',
-            dietary_restrictions TEXT DEFAULT '[]',
-            preferred_cuisines TEXT DEFAULT '[]',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS saved_recipes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-            recipe_name TEXT NOT NULL,
-            recipe_data TEXT NOT NULL,
-            ingredients TEXT DEFAULT '[]',
-            cuisine_type TEXT,
-            difficulty TEXT,
-            cook_time TEXT,
-            rating INTEGER CHECK (rating >= 1 AND rating <= 5),
-            notes TEXT,
-            tags TEXT DEFAULT '[]',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS analysis_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-            detected_ingredients TEXT DEFAULT '[]',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-    ''')
-    db.commit()
-    db.close()
-
-
-# 앱 시작 시 DB 초기화
-with app.app_context():
-    init_db()
+    """데이터베이스 초기화 (미적용 스키마 마이그레이션 실행)"""
+    db = db_pool.connect()
+    try:
+        migrate(db)
+    finally:
+        db_pool.release(db)
+
+# 이미지 분석 결과 캐시 (SHA-256 이미지 다이제스트 키)
+analysis_cache = TieredCache(
+    LRUCache(max_size=ANALYZE_CACHE_MEMORY_SIZE, ttl=ANALYZE_CACHE_TTL),
+    SQLiteCache(store_pool, 'analysis_cache', max_rows=ANALYZE_CACHE_MAX_ROWS, ttl=ANALYZE_CACHE_TTL)
+)
+
+# 지각 해시 인덱스 (유사 이미지 → 분석 캐시 다이제스트, 시작 시 로드)
+phash_index = PerceptualHashIndex(store_pool, live_digests=analysis_cache.keys, prune_interval=PHASH_PRUNE_INTERVAL)
+
+# OpenRouter keep-alive 커넥션 풀 (시작 시 백그라운드에서 미리 연결)
+openrouter_pool = HTTPConnectionPool(
+    max_size=OPENROUTER_POOL_SIZE,
+    idle_timeout=OPENROUTER_POOL_IDLE_TIMEOUT
+)
+
+# 모델 레이스용 스레드 풀
+model_executor = ThreadPoolExecutor(max_workers=MODEL_RACE_WORKERS, thread_name_prefix='model-race')
+
+# 모델별 지연/오류 점수판 (호출 순서 동적 결정)
+model_scoreboard = ModelScoreboard(
+    window=MODEL_STATS_WINDOW,
+    max_age=MODEL_STATS_MAX_AGE,
+    failure_threshold=MODEL_BREAKER_THRESHOLD,
+    reset_timeout=MODEL_BREAKER_RESET
+)
+
+# 잘린 레시피 응답 복구 통계
+salvage_stats = SalvageStats()
+
+# 비동기 작업 큐 (처리 함수는 라우트 정의부에서 등록)
+job_queue = JobQueue(store_pool, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, retention=JOB_RETENTION,
+                     lease=JOB_LEASE)
+
+# 이미지 전처리 프로세스 풀 (첫 사용 시 생성)
+image_preprocessor = ImagePreprocessor(
+    max_edge=IMAGE_MAX_EDGE,
+    image_format=IMAGE_FORMAT,
+    quality=IMAGE_QUALITY,
+    workers=IMAGE_PREP_WORKERS
+)
+
+# 동일 업스트림 호출 병합
+request_coalescer = SingleFlight(
+    store_pool if SINGLEFLIGHT_CROSS_PROCESS else None,
+    lease_ttl=SINGLEFLIGHT_LEASE_TTL
+)
+
+# 사용자별 저장 레시피 재료 역색인 (첫 조회 시 로드, 저장/삭제 시 증분 갱신)
+ingredient_index = IngredientIndex(ttl=INGREDIENT_INDEX_TTL, max_users=INGREDIENT_INDEX_MAX_USERS)
+
+# 로컬 레시피 코퍼스 (번들 + 누적된 LLM 레시피, 시작 시 로드)
+recipe_corpus = RecipeCorpus(store_pool, bundle_path=RECIPE_CORPUS_PATH) if RECIPE_CORPUS_ENABLED else None
+
+# 레시피 생성 결과 캐시 (정규화된 요청 키)
+recipe_cache = TieredCache(
+    LRUCache(max_size=RECIPE_CACHE_MEMORY_SIZE, ttl=RECIPE_CACHE_TTL),
+    SQLiteCache(store_pool, 'recipe_cache', max_rows=RECIPE_CACHE_MAX_ROWS, ttl=RECIPE_CACHE_TTL)
+)
 
 
 def hash_password(password):
@@ -139,7 +286,7 @@ def get_current_user():
 # ===== OpenRouter API =====
 
 def call_openrouter(model, messages, timeout=60):
-    """OpenRouter API 호출"""
+    """OpenRouter API 호출 (keep-alive 커넥션 풀 사용)"""
     url = f"{BASE_URL}/chat/completions"
     headers = {
         "Content-Type": "application/json",
@@ -150,34 +297,185 @@ def call_openrouter(model, messages, timeout=60):
         "messages": messages
     }).encode('utf-8')
 
-    req = urllib.request.Request(url, data=data, headers=headers)
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8')
-        try:
-            return {"error": json.loads(error_body)}
-        except:
-            return {"error": {"message": error_body}}
+        response = openrouter_pool.request('POST', url, body=data, headers=headers, timeout=timeout)
     except Exception as e:
         return {"error": {"message": str(e)}}
 
+    body = response.body.decode('utf-8')
+    if response.status >= 400:
+        try:
+            result = {"error": json.loads(body)}
+        except ValueError:
+            result = {"error": {"message": body}}
+        result["status"] = response.status
+    else:
+        try:
+            result = json.loads(body)
+        except ValueError as e:
+            result = {"error": {"message": str(e)}}
+    result["timing"] = response.timing()
+    return result
+
+
+def stream_openrouter(model, messages, timeout=90):
+    """OpenRouter 스트리밍 호출 (stream: true)
+
+    ('content', 텍스트 조각) 또는 ('error', 오류) 튜플을 순서대로 반환
+    """
+    url = f"{BASE_URL}/chat/completions"
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Accept": "text/event-stream"
+    }
+    data = json.dumps({
+        "model": model,
+        "messages": messages,
+        "stream": True
+    }).encode('utf-8')
+
+    try:
+        with openrouter_pool.stream('POST', url, body=data, headers=headers, timeout=timeout) as response:
+            if response.status >= 400:
+                body = response.read().decode('utf-8')
+                try:
+                    error = json.loads(body)
+                    error = error.get('error', error) if isinstance(error, dict) else {"message": body}
+                except ValueError:
+                    error = {"message": body}
+                yield 'error', dict(error, status=response.status)
+                return
+            for payload in iter_sse_data(response.iter_lines()):
+                try:
+                    chunk = json.loads(payload)
+                except ValueError:
+                    continue
+                if 'error' in chunk:
+                    yield 'error', chunk['error']
+                    return
+                choices = chunk.get('choices') or [{}]
+                delta = (choices[0].get('delta') or {}).get('content')
+                if delta:
+                    yield 'content', delta
+            response.read()  # [DONE] 이후 남은 본문을 비워 연결 재사용
+    except Exception as e:
+        yield 'error', {"message": str(e)}
+
+
+def error_outcome(error, status=None):
+    """오류를 점수판 결과 유형으로 분류"""
+    if isinstance(error, dict):
+        status = status or error.get('status')
+        if error.get('code') == 429:
+            return OUTCOME_RATE_LIMITED
+    return OUTCOME_RATE_LIMITED if status == 429 else OUTCOME_ERROR
+
+
+def try_model(model, messages, timeout, parse):
+    """모델 1개 호출 후 응답 파싱 및 점수판 기록. (content, parsed), error 튜플 반환"""
+    if not model_scoreboard.acquire(model):
+        return None, {"message": f"{model} 모델이 일시적으로 차단되었습니다"}
+
+    start = time.monotonic()
+    result = call_openrouter(model, messages, timeout=timeout)
+    latency = time.monotonic() - start
+
+    if "error" in result:
+        model_scoreboard.record(model, error_outcome(result['error'], result.get('status')), latency)
+        return None, result['error']
+
+    try:
+        content = result['choices'][0]['message']['content']
+        parsed = parse(content)
+    except Exception:
+        parsed = None
+    if parsed is None:
+        model_scoreboard.record(model, OUTCOME_PARSE_ERROR, latency)
+        return None, {"message": "응답을 해석할 수 없습니다"}
+
+    model_scoreboard.record(model, OUTCOME_OK, latency)
+    return (content, parsed), None
+
+
+def is_fatal_error(error):
+    """다음 모델로 넘어가도 소용없는 오류인지 (429 외의 오류 코드)"""
+    error_code = error.get('code') if isinstance(error, dict) else None
+    return bool(error_code and error_code != 429)
+
+
+def race_models(models, messages, timeout, parse):
+    """헤지 레이스: 지연 시간마다 다음 모델을 추가 호출하고 첫 유효 응답 채택"""
+    queue = list(models)
+    pending = {}
+    last_error = None
+    stop = False
+
+    def launch():
+        model = queue.pop(0)
+        pending[model_executor.submit(try_model, model, messages, timeout, parse)] = model
+
+    launch()
+    while pending:
+        can_hedge = queue and not stop and len(pending) < MODEL_RACE_MAX_CONCURRENCY
+        done, _ = wait(list(pending), timeout=MODEL_HEDGE_DELAY if can_hedge else None,
+                       return_when=FIRST_COMPLETED)
+        for future in done:
+            model = pending.pop(future)
+            outcome, error = future.result()
+            if error is None:
+                # 나머지 호출은 취소(시작 전) 또는 결과 무시
+                for other in pending:
+                    other.cancel()
+                return model, outcome[0], outcome[1], None
+            last_error = error
+            if is_fatal_error(error):
+                stop = True
+        # 실패했거나 헤지 지연이 지나면 다음 모델 투입
+        if queue and not stop and len(pending) < MODEL_RACE_MAX_CONCURRENCY:
+            launch()
+
+    return None, None, None, last_error
+
+
+def call_models(models, messages, timeout, parse):
+    """모델 목록을 점수순으로 호출하여 첫 유효 응답 반환
+
+    반환: (model, content, parsed, error) - 성공 시 error는 None
+    """
+    models = model_scoreboard.ranked(models)
+    if MODEL_RACE_MODE and len(models) > 1:
+        return race_models(models, messages, timeout, parse)
+
+    last_error = None
+    for model in models:
+        outcome, error = try_model(model, messages, timeout, parse)
+        if error is None:
+            return model, outcome[0], outcome[1], None
+        last_error = error
+        if is_fatal_error(error):
+            break
+    return None, None, None, last_error
+
 
 # ===== Step 1: 이미지 분석 =====
 
+def ingredient_list(value):
+    """JSON 값에서 재료 목록 (배열 또는 {"ingredients": [...]} 객체, 아니면 None)"""
+    if isinstance(value, dict):
+        value = value.get('ingredients')
+    if isinstance(value, list) and all(isinstance(i, (str, dict)) for i in value):
+        return [i.get('name') if isinstance(i, dict) else i for i in value]
+    return None
+
+
 def extract_ingredients(text):
     """텍스트에서 재료 배열 추출"""
-    json_match = re.search(r'\[.*?\]', text, re.DOTALL)
-    if json_match:
-        try:
-            ingredients = json.loads(json_match.group())
-            if isinstance(ingredients, list):
-                return [str(i).strip() for i in ingredients if i]
-        except json.JSONDecodeError:
-            pass
+    ingredients = ingredient_list(first_json(text, accept=lambda v: ingredient_list(v) is not None))
+    if ingredients is not None:
+        return canonical_names(str(i) for i in ingredients if i)
 
-    lines = re.split(r'[,\n]', text)
+    lines = re.split(r'[,\n]', strip_think(text))
     ingredients = []
     for line in lines:
         cleaned = re.sub(r'^[\d\.\-\*\•]+\s*', '', line.strip())
@@ -185,11 +483,94 @@ def extract_ingredients(text):
         if cleaned and len(cleaned) > 1 and len(cleaned) < 50:
             ingredients.append(cleaned)
 
-    return ingredients[:30]
+    return canonical_names(ingredients)[:30]
+
+
+def decode_image(base64_image):
+    """Base64 이미지 디코딩 (실패 시 원본 문자열 바이트)"""
+    try:
+        return base64.b64decode(base64_image)
+    except (binascii.Error, ValueError):
+        return base64_image.encode('utf-8')
+
+
+def image_digest(image_bytes):
+    """이미지 바이트의 SHA-256 다이제스트"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def find_cached_analysis(image_bytes, digest):
+    """동일 이미지 또는 지각 해시가 가까운 이미지의 캐시된 분석 결과 조회"""
+    cached = analysis_cache.get(digest)
+    if cached is not None:
+        return cached, None
+
+    if PHASH_MAX_DISTANCE < 0:
+        return None, None
+    phash = dhash(image_bytes)
+    if phash is None or not is_informative(phash, PHASH_MIN_BITS):
+        return None, None
+    # 가까운 순으로 캐시에 남아 있는 항목을 찾고, 만료/제거된 항목의 해시는 정리
+    expired = []
+    for distance, similar_digest in phash_index.find(phash, PHASH_MAX_DISTANCE):
+        cached = analysis_cache.get(similar_digest)
+        if cached is not None:
+            analysis_cache.set(digest, cached)
+            phash_index.remove(expired)
+            return dict(cached, match_distance=distance), phash
+        expired.append(similar_digest)
+    phash_index.remove(expired)
+    return None, phash
 
 
 def analyze_image(base64_image, mime_type="image/jpeg"):
-    """이미지 분석하여 재료 추출"""
+    """이미지 분석하여 재료 추출 (동일/유사 이미지는 캐시에서 반환)"""
+    return analyze_image_bytes(decode_image(base64_image), mime_type, base64_image=base64_image)
+
+
+def analyze_image_bytes(image_bytes, mime_type="image/jpeg", digest=None, base64_image=None):
+    """이미지 바이트 분석 (digest/base64_image를 이미 계산했다면 재사용)"""
+    if digest is None:
+        digest = image_digest(image_bytes)
+    cached, phash = find_cached_analysis(image_bytes, digest)
+    if cached is not None:
+        return cached_analysis_result(cached)
+
+    # 같은 이미지를 동시에 분석 중이면 그 결과를 공유
+    result, shared = request_coalescer.do(
+        f'analyze:{digest}',
+        lambda: run_image_analysis(image_bytes, mime_type, digest, phash, base64_image),
+        lookup=lambda: cached_analysis_result(analysis_cache.get(digest))
+    )
+    return dict(result, coalesced=True) if shared else result
+
+
+def cached_analysis_result(cached):
+    """캐시 항목을 분석 결과 형식으로 변환 (없으면 None)"""
+    if cached is None:
+        return None
+    result = {
+        "success": True,
+        "ingredients": canonical_names(cached['ingredients']),
+        "model": cached['model'],
+        "cached": True
+    }
+    if 'match_distance' in cached:
+        result['match_distance'] = cached['match_distance']
+    return result
+
+
+def run_image_analysis(image_bytes, mime_type, digest, phash, base64_image=None):
+    """비전 모델 호출로 재료 분석 후 캐시 저장"""
+    # 업로드 전 축소/재인코딩 (캐시 키는 원본 기준)
+    preprocess_stats = None
+    if IMAGE_PREP_ENABLED and image_preprocessor.available:
+        processed, mime_type, preprocess_stats = image_preprocessor.process(image_bytes, mime_type)
+        if preprocess_stats['reencoded']:
+            image_bytes, base64_image = processed, None
+    if base64_image is None:
+        base64_image = base64.b64encode(image_bytes).decode('ascii')
+
     prompt = """이 냉장고/식재료 사진에서 보이는 모든 식재료를 분석해주세요.
 
 다음 JSON 형식으로만 응답해주세요:
@@ -217,40 +598,83 @@ def analyze_image(base64_image, mime_type="image/jpeg"):
         }
     ]
 
-    for model in IMAGE_MODELS:
-        result = call_openrouter(model, messages, timeout=60)
-        if "error" not in result:
-            content = result['choices'][0]['message']['content']
-            ingredients = extract_ingredients(content)
-            return {
-                "success": True,
-                "ingredients": ingredients,
-                "model": model,
-                "raw_response": content
-            }
-        error_code = result.get('error', {}).get('code')
-        if error_code and error_code != 429:
-            break
+    model, content, ingredients, error = call_models(IMAGE_MODELS, messages, 60, extract_ingredients)
+    if error is None:
+        analysis_cache.set(digest, {"ingredients": ingredients, "model": model})
+        if phash is not None:
+            phash_index.add(phash, digest)
+        result = {
+            "success": True,
+            "ingredients": ingredients,
+            "model": model,
+            "raw_response": content
+        }
+    else:
+        result = {
+            "success": False,
+            "error": error.get('message', '알 수 없는 오류') if error else '알 수 없는 오류',
+            "ingredients": []
+        }
 
-    return {
-        "success": False,
-        "error": result.get('error', {}).get('message', '알 수 없는 오류'),
-        "ingredients": []
-    }
+    if preprocess_stats is not None:
+        result['preprocess'] = preprocess_stats
+    return result
 
 
 # ===== Step 2: 레시피 생성 =====
 
+# 복구한 레시피에 반드시 있어야 하는 필드와 비어 있을 때 채울 기본값
+RECIPE_REQUIRED_FIELDS = ('name', 'ingredients', 'steps')
+RECIPE_FIELD_DEFAULTS = {
+    "description": "",
+    "difficulty": "중급",
+    "cookTime": "30분",
+    "servings": 2,
+    "tips": ""
+}
+
+
+def is_recipe_object(value):
+    """레시피 최상위 객체인지 (잘린 응답 안의 재료 객체 등 중첩 객체 제외)"""
+    return isinstance(value, dict) and ('ingredients' in value or 'steps' in value)
+
+
+def complete_salvaged_recipe(recipe):
+    """잘린 응답에서 복구한 레시피 검증 (필수 필드가 비면 None, 선택 필드는 기본값)"""
+    if not isinstance(recipe, dict):
+        return None
+    recipe = dict(RECIPE_FIELD_DEFAULTS, **recipe)
+    recipe['ingredients'] = [
+        item for item in recipe.get('ingredients') or []
+        if (isinstance(item, dict) and item.get('name')) or (isinstance(item, str) and item.strip())
+    ]
+    recipe['steps'] = [step for step in recipe.get('steps') or [] if isinstance(step, str) and step.strip()]
+    if not all(recipe.get(field) for field in RECIPE_REQUIRED_FIELDS):
+        return None
+    return recipe
+
+
+def parse_recipe_response(text):
+    """텍스트에서 레시피 추출. (레시피, 잘린 응답에서 복구했는지) 반환
+
+    첫 번째 완전한 JSON 객체 → 잘린 JSON 복구 → JSON이 없으면 텍스트 파싱 순서.
+    잘린 JSON에 필수 필드가 없으면 None (다음 모델로 넘어감)
+    """
+    recipe = first_json(text, openers='{', accept=is_recipe_object)
+    if recipe is not None:
+        return recipe, False
+    salvaged = salvage_json(text, openers='{', accept=lambda v: isinstance(v, dict))
+    if salvaged is not None:
+        recipe = complete_salvaged_recipe(salvaged)
+        salvage_stats.record(recipe is not None)
+        return (recipe, True) if recipe is not None else None
+    return parse_recipe_text(strip_think(text)), False
+
+
 def extract_recipe_json(text):
-    """텍스트에서 레시피 JSON 추출"""
-    json_match = re.search(r'\{[\s\S]*\}', text)
-    if json_match:
-        try:
-            recipe = json.loads(json_match.group())
-            return recipe
-        except json.JSONDecodeError:
-            pass
-    return parse_recipe_text(text)
+    """텍스트에서 레시피 JSON 추출 (복구 여부 없이 레시피만, 실패 시 None)"""
+    parsed = parse_recipe_response(text)
+    return parsed[0] if parsed is not None else None
 
 
 def parse_recipe_text(text):
@@ -309,8 +733,18 @@ def parse_recipe_text(text):
     return recipe
 
 
-def generate_recipe(ingredients, cuisine, difficulty, cook_time, servings):
-    """AI로 레시피 생성"""
+def recipe_cache_key(ingredients, cuisine, difficulty, cook_time, servings):
+    """레시피 요청 정규화 키 (재료 표준 이름·중복 제거·정렬)"""
+    normalized = sorted({canonical_key(str(i)) for i in ingredients} - {''})
+    payload = json.dumps(
+        [normalized, str(cuisine).strip(), str(difficulty).strip(), str(cook_time).strip(), str(servings).strip()],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_recipe_messages(ingredients, cuisine, difficulty, cook_time, servings):
+    """레시피 생성 프롬프트 메시지 구성"""
     prompt = f"""당신은 전문 요리사입니다. 주어진 재료로 맛있는 요리 레시피를 추천해주세요.
 
 사용 가능한 재료: {', '.join(ingredients)}
@@ -344,34 +778,187 @@ def generate_recipe(ingredients, cuisine, difficulty, cook_time, servings):
 - 단계는 구체적이고 따라하기 쉽게 작성
 - 반드시 유효한 JSON 형식으로 응답"""
 
-    messages = [
+    return [
         {"role": "user", "content": prompt}
     ]
 
-    last_error = None
-    for model in TEXT_MODELS:
-        result = call_openrouter(model, messages, timeout=90)
-        if "error" not in result:
-            content = result['choices'][0]['message']['content']
-            recipe = extract_recipe_json(content)
-            return {
-                "success": True,
-                "recipe": recipe,
-                "model": model,
-                "raw_response": content
-            }
-        last_error = result.get('error', {})
-        error_code = last_error.get('code')
-        if error_code and error_code != 429:
-            break
+
+def generate_recipe(ingredients, cuisine, difficulty, cook_time, servings, use_cache=True):
+    """AI로 레시피 생성 (use_cache=False면 캐시를 건너뛰고 새로 생성)"""
+    cache_key = recipe_cache_key(ingredients, cuisine, difficulty, cook_time, servings)
+    if use_cache:
+        cached = cached_recipe_result(recipe_cache.get(cache_key))
+        if cached is not None:
+            return cached
+        local = find_corpus_recipe(ingredients, cuisine, difficulty, cook_time, servings)
+        if local is not None:
+            return local
+
+    # 같은 요청이 동시에 진행 중이면 그 결과를 공유 (새로 생성 요청은 별도 병합)
+    messages = build_recipe_messages(ingredients, cuisine, difficulty, cook_time, servings)
+    result, shared = request_coalescer.do(
+        f'recipe:{cache_key}' if use_cache else f'recipe-fresh:{cache_key}',
+        lambda: run_recipe_generation(messages, cache_key, cuisine),
+        lookup=(lambda: cached_recipe_result(recipe_cache.get(cache_key))) if use_cache else None
+    )
+    return dict(result, coalesced=True) if shared else result
+
+
+def cached_recipe_result(cached):
+    """캐시 항목을 레시피 결과 형식으로 변환 (없으면 None)"""
+    if cached is None:
+        return None
+    result = {
+        "success": True,
+        "recipe": cached['recipe'],
+        "model": cached['model'],
+        "cached": True
+    }
+    if cached.get('truncated'):
+        result['truncated'] = True
+    return result
+
+
+def find_corpus_recipe(ingredients, cuisine, difficulty, cook_time, servings):
+    """로컬 코퍼스에서 보유 재료와 난이도/조리 시간/인분이 맞는 레시피 검색 (없으면 None)"""
+    if recipe_corpus is None:
+        return None
+    found = recipe_corpus.find(
+        ingredients, cuisine,
+        min_coverage=RECIPE_CORPUS_MIN_COVERAGE,
+        max_missing=RECIPE_CORPUS_MAX_MISSING,
+        difficulty=difficulty,
+        cook_time=cook_time,
+        servings=servings
+    )
+    if found is None:
+        return None
+    recipe, match = found
+    return {
+        "success": True,
+        "recipe": recipe,
+        "model": "local-corpus",
+        "source": "corpus",
+        "coverage": match['coverage']
+    }
+
+
+def remember_recipe(cache_key, recipe, model, cuisine, truncated=False):
+    """생성된 레시피를 캐시에 저장하고 코퍼스에 추가
+
+    잘린 응답에서 복구한 레시피는 짧게만 캐시해 곧 다시 요청하면 완전한 레시피를 새로 생성하고, 코퍼스에는 넣지 않음
+    """
+    if truncated:
+        recipe_cache.set(cache_key, {"recipe": recipe, "model": model, "truncated": True},
+                         ttl=RECIPE_TRUNCATED_CACHE_TTL)
+        return
+    recipe_cache.set(cache_key, {"recipe": recipe, "model": model})
+    if recipe_corpus is not None and RECIPE_CORPUS_LEARN:
+        recipe_corpus.add(recipe, cuisine)
+
+
+def run_recipe_generation(messages, cache_key, cuisine=None):
+    """텍스트 모델 호출로 레시피 생성 후 캐시/코퍼스 저장"""
+    model, content, parsed, error = call_models(TEXT_MODELS, messages, 90, parse_recipe_response)
+    if error is None:
+        recipe, truncated = parsed
+        remember_recipe(cache_key, recipe, model, cuisine, truncated)
+        result = {
+            "success": True,
+            "recipe": recipe,
+            "model": model,
+            "raw_response": content
+        }
+        if truncated:
+            result['truncated'] = True
+        return result
 
     return {
         "success": False,
-        "error": last_error.get('message', '알 수 없는 오류') if last_error else '알 수 없는 오류',
+        "error": error.get('message', '알 수 없는 오류') if error else '알 수 없는 오류',
         "recipe": None
     }
 
 
+def generate_recipe_stream(ingredients, cuisine, difficulty, cook_time, servings, use_cache=True):
+    """레시피 생성 SSE 스트림 (완성된 필드/재료/단계부터 이벤트 전송)
+
+    이벤트: model, field, ingredient, step, reset(모델 전환), done, error
+    """
+    cache_key = recipe_cache_key(ingredients, cuisine, difficulty, cook_time, servings)
+    if use_cache:
+        cached = (
+            cached_recipe_result(recipe_cache.get(cache_key))
+            or find_corpus_recipe(ingredients, cuisine, difficulty, cook_time, servings)
+        )
+        if cached is not None:
+            yield format_sse('done', cached)
+            return
+
+    messages = build_recipe_messages(ingredients, cuisine, difficulty, cook_time, servings)
+    last_error = None
+    for model in model_scoreboard.ranked(TEXT_MODELS):
+        if not model_scoreboard.acquire(model):
+            continue
+
+        parser = IncrementalRecipeParser()
+        parts = []
+        emitted = False
+        error = None
+        parsed = None
+        outcome = None
+        start = time.monotonic()
+        upstream = stream_openrouter(model, messages, timeout=90)
+        try:
+            yield format_sse('model', {"model": model})
+            for kind, value in upstream:
+                if kind == 'error':
+                    error = value
+                    break
+                parts.append(value)
+                for event, data in parser.feed(value):
+                    emitted = True
+                    yield format_sse(event, data)
+
+            if error is None:
+                content = ''.join(parts)
+                parsed = parse_recipe_response(content) if content.strip() else None
+                if parsed is not None:
+                    outcome = OUTCOME_OK
+                else:
+                    outcome = OUTCOME_PARSE_ERROR
+                    error = {"message": "응답을 해석할 수 없습니다"}
+            else:
+                outcome = error_outcome(error)
+        finally:
+            # 클라이언트가 연결을 끊거나(GeneratorExit) 예외로 끝나면 결과 없이 시험 호출 예약만 해제
+            upstream.close()
+            if outcome is None:
+                model_scoreboard.release(model)
+            else:
+                model_scoreboard.record(model, outcome, time.monotonic() - start)
+
+        if outcome == OUTCOME_OK:
+            recipe, truncated = parsed
+            remember_recipe(cache_key, recipe, model, cuisine, truncated)
+            result = {"success": True, "recipe": recipe, "model": model}
+            if truncated:
+                result['truncated'] = True
+            yield format_sse('done', result)
+            return
+
+        last_error = error
+        if emitted:
+            yield format_sse('reset', {"model": model})
+        if is_fatal_error(error):
+            break
+
+    yield format_sse('error', {
+        "success": False,
+        "error": last_error.get('message', '알 수 없는 오류') if last_error else '알 수 없는 오류'
+    })
+
+
 # ===== 라우트: 페이지 =====
 
 @app.route('/')
@@ -382,14 +969,8 @@ def index():
 
 # ===== 라우트: Step 1 & 2 API =====
 
-@app.route('/api/analyze', methods=['POST'])
-def analyze():
-    """이미지 분석 API"""
-    data = request.get_json()
-    if not data or 'image' not in data:
-        return jsonify({"success": False, "error": "이미지가 필요합니다"}), 400
-
-    image_data = data['image']
+def parse_image_data(image_data):
+    """data URL 또는 순수 Base64 문자열에서 (base64, MIME 타입) 추출"""
     if ',' in image_data:
         header, base64_image = image_data.split(',', 1)
         mime_match = re.search(r'data:([^;]+)', header)
@@ -397,21 +978,81 @@ def analyze():
     else:
         base64_image = image_data
         mime_type = 'image/jpeg'
+    return base64_image, mime_type
 
-    result = analyze_image(base64_image, mime_type)
+
+def save_analysis_history(db, user_id, ingredients):
+    """분석 히스토리 저장 (재료는 정규화 테이블에도 기록)"""
+    ingredients = canonical_names(ingredients)
+    cursor = db.execute(
+        'INSERT INTO analysis_history (user_id, detected_ingredients) VALUES (?, ?)',
+        (user_id, json.dumps(ingredients))
+    )
+    insert_history_items(db, cursor.lastrowid, user_id, ingredients)
+    db.commit()
+
+
+def read_image_upload(stream):
+    """업로드 본문을 청크 단위로 하나의 버퍼에 모으면서 SHA-256 계산. (바이트, 다이제스트) 반환
+
+    분석 단계(base64 인코딩, 전처리)가 이미지 전체를 필요로 하므로 복사본 없이 bytearray 하나만 유지
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        buffer += chunk
+    return buffer, digest.hexdigest()
+
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze():
+    """이미지 분석 API (JSON data URL, multipart/form-data, 바이너리 본문 지원)"""
+    if request.mimetype in BINARY_UPLOAD_TYPES or request.mimetype.startswith('image/'):
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('image')
+            if upload is None:
+                return jsonify({"success": False, "error": "이미지가 필요합니다"}), 400
+            stream, mime_type = upload.stream, upload.mimetype
+        else:
+            stream, mime_type = request.stream, request.mimetype
+
+        image_bytes, digest = read_image_upload(stream)
+        if not image_bytes:
+            return jsonify({"success": False, "error": "이미지가 필요합니다"}), 400
+        if not mime_type.startswith('image/'):
+            mime_type = 'image/jpeg'
+        result = analyze_image_bytes(image_bytes, mime_type, digest)
+    else:
+        data = request.get_json()
+        if not data or 'image' not in data:
+            return jsonify({"success": False, "error": "이미지가 필요합니다"}), 400
+        base64_image, mime_type = parse_image_data(data['image'])
+        result = analyze_image(base64_image, mime_type)
 
     # 로그인한 사용자면 히스토리 저장
     if 'user_id' in session and result.get('success'):
-        db = get_db()
-        db.execute(
-            'INSERT INTO analysis_history (user_id, detected_ingredients) VALUES (?, ?)',
-            (session['user_id'], json.dumps(result['ingredients']))
-        )
-        db.commit()
+        save_analysis_history(get_db(), session['user_id'], result['ingredients'])
 
     return jsonify(result)
 
 
+def read_recipe_options(data):
+    """레시피 요청 본문에서 생성 옵션 추출"""
+    ingredients = data.get('ingredients') or []
+    return {
+        "ingredients": canonical_names(ingredients if isinstance(ingredients, list) else [ingredients]),
+        "cuisine": data.get('cuisine', '상관없음'),
+        "difficulty": data.get('difficulty', '중급'),
+        "cook_time": data.get('cookTime', '30분 이내'),
+        "servings": data.get('servings', 2),
+        "use_cache": not bool(data.get('fresh', False))
+    }
+
+
 @app.route('/api/recipe', methods=['POST'])
 def recipe():
     """레시피 생성 API"""
@@ -419,19 +1060,202 @@ def recipe():
     if not data or 'ingredients' not in data:
         return jsonify({"success": False, "error": "재료 목록이 필요합니다"}), 400
 
-    ingredients = data.get('ingredients', [])
-    cuisine = data.get('cuisine', '상관없음')
-    difficulty = data.get('difficulty', '중급')
-    cook_time = data.get('cookTime', '30분 이내')
-    servings = data.get('servings', 2)
-
-    if not ingredients:
+    options = read_recipe_options(data)
+    if not options['ingredients']:
         return jsonify({"success": False, "error": "최소 1개 이상의 재료가 필요합니다"}), 400
 
-    result = generate_recipe(ingredients, cuisine, difficulty, cook_time, servings)
+    result = generate_recipe(**options)
     return jsonify(result)
 
 
+@app.route('/api/recipe/stream', methods=['POST'])
+def recipe_stream():
+    """레시피 생성 API (Server-Sent Events 스트리밍)"""
+    data = request.get_json()
+    if not data or 'ingredients' not in data:
+        return jsonify({"success": False, "error": "재료 목록이 필요합니다"}), 400
+
+    options = read_recipe_options(data)
+    if not options['ingredients']:
+        return jsonify({"success": False, "error": "최소 1개 이상의 재료가 필요합니다"}), 400
+
+    return Response(
+        stream_with_context(generate_recipe_stream(**options)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ===== 비동기 작업 API =====
+
+def run_analyze_job(payload, user_id):
+    """이미지 분석 작업 (로그인 사용자는 히스토리 저장)"""
+    result = analyze_image(payload['image'], payload['mime_type'])
+    if user_id and result.get('success'):
+        db = db_pool.connect()
+        try:
+            save_analysis_history(db, user_id, result['ingredients'])
+        finally:
+            db_pool.release(db)
+    return result
+
+
+def run_recipe_job(payload, user_id):
+    """레시피 생성 작업"""
+    return generate_recipe(**payload)
+
+
+job_queue.register('analyze', run_analyze_job)
+job_queue.register('recipe', run_recipe_job)
+
+
+def start_services():
+    """시작 작업: DB 마이그레이션, 해시 색인/코퍼스 로드, 커넥션 미리 연결, 작업 처리 스레드 시작"""
+    init_db()
+    phash_index.load()
+    if recipe_corpus is not None:
+        recipe_corpus.load()
+    if OPENROUTER_API_KEY and OPENROUTER_POOL_WARMUP > 0:
+        threading.Thread(
+            target=openrouter_pool.warmup,
+            args=(BASE_URL, OPENROUTER_POOL_WARMUP),
+            daemon=True
+        ).start()
+    job_queue.start()
+
+
+# 이미지 전처리 프로세스(spawn)가 이 모듈을 다시 불러올 때는 시작 작업을 모두 건너뜀 (연결 풀은 지연 생성)
+if not in_worker_process():
+    start_services()
+
+
+def submit_job(kind, payload):
+    """작업 등록 응답 (대기열이 가득 차면 503)"""
+    job_id = job_queue.submit(kind, payload, session.get('user_id'))
+    if job_id is None:
+        return jsonify({"success": False, "error": "요청이 많습니다. 잠시 후 다시 시도해주세요"}), 503
+    return jsonify({"success": True, "job_id": job_id, "status": "queued"}), 202
+
+
+def find_job(job_id):
+    """작업 조회 (다른 사용자의 작업은 None)"""
+    job = job_queue.get(job_id)
+    if job is None or (job['user_id'] and job['user_id'] != session.get('user_id')):
+        return None
+    return job
+
+
+def job_response(job):
+    """작업 상태 응답 본문"""
+    return {
+        "success": True,
+        "job": {
+            "id": job['id'],
+            "kind": job['kind'],
+            "status": job['status'],
+            "result": job['result'],
+            "error": job['error'],
+            "created_at": job['created_at'],
+            "updated_at": job['updated_at']
+        }
+    }
+
+
+@app.route('/api/jobs/analyze', methods=['POST'])
+def submit_analyze_job():
+    """이미지 분석 작업 등록"""
+    data = request.get_json()
+    if not data or 'image' not in data:
+        return jsonify({"success": False, "error": "이미지가 필요합니다"}), 400
+
+    base64_image, mime_type = parse_image_data(data['image'])
+    return submit_job('analyze', {"image": base64_image, "mime_type": mime_type})
+
+
+@app.route('/api/jobs/recipe', methods=['POST'])
+def submit_recipe_job():
+    """레시피 생성 작업 등록"""
+    data = request.get_json()
+    if not data or 'ingredients' not in data:
+        return jsonify({"success": False, "error": "재료 목록이 필요합니다"}), 400
+
+    options = read_recipe_options(data)
+    if not options['ingredients']:
+        return jsonify({"success": False, "error": "최소 1개 이상의 재료가 필요합니다"}), 400
+
+    return submit_job('recipe', options)
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """작업 상태/결과 조회 (폴링)"""
+    job = find_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다"}), 404
+    return jsonify(job_response(job))
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """작업 상태 변경 구독 (Server-Sent Events)"""
+    job = find_job(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다"}), 404
+
+    def events():
+        last_status = None
+        deadline = time.monotonic() + JOB_EVENTS_TIMEOUT
+        while time.monotonic() < deadline:
+            current = job_queue.get(job_id)
+            if current is None:
+                break
+            if current['status'] != last_status:
+                last_status = current['status']
+                if last_status in FINISHED_STATUSES:
+                    yield format_sse('done', job_response(current)['job'])
+                    return
+                yield format_sse('status', {"id": job_id, "status": last_status})
+            else:
+                yield ": ping\n\n"
+            job_queue.wait(timeout=15)
+        yield format_sse('timeout', {"id": job_id, "status": last_status})
+
+    return Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """캐시 적중/실패 통계"""
+    return jsonify({
+        "success": True,
+        "caches": {
+            "analysis": analysis_cache.stats(),
+            "recipe": recipe_cache.stats()
+        },
+        "connection_pool": openrouter_pool.stats(),
+        "database": db_pool.stats(),
+        "store_database": store_pool.stats(),
+        "ingredient_index": ingredient_index.stats(),
+        "recipe_corpus": recipe_corpus.stats() if recipe_corpus is not None else None,
+        "ingredient_names": ingredient_names.default_canonicalizer().stats()
+    })
+
+
+@app.route('/api/models/status', methods=['GET'])
+def models_status():
+    """모델별 지연/오류 점수판 및 서킷 브레이커 상태"""
+    return jsonify({
+        "success": True,
+        "image_models": model_scoreboard.snapshot(IMAGE_MODELS),
+        "text_models": model_scoreboard.snapshot(TEXT_MODELS),
+        "salvage": salvage_stats.stats()
+    })
+
+
 # ===== Step 3: 인증 API =====
 
 @app.route('/api/auth/register', methods=['POST'])
@@ -606,38 +1430,156 @@ def save_recipe():
         json.dumps(data.get('tags', []))
     ))
     db.commit()
+    ingredient_index.add(session['user_id'], cursor.lastrowid, recipe_data.get('name', '저장된 레시피'), recipe_data)
 
     return jsonify({"success": True, "recipe_id": cursor.lastrowid})
 
 
+def saved_recipe_to_dict(row, fields=RECIPE_FIELDS):
+    """saved_recipes 행을 API 응답 형식으로 변환 (요청한 필드의 JSON만 디코딩)"""
+    result = {}
+    for field in fields:
+        column, is_json = RECIPE_FIELDS[field]
+        result[field] = json.loads(row[column]) if is_json else row[column]
+    return result
+
+
+def parse_recipe_fields(value):
+    """fields= 쿼리 파라미터 파싱 (없으면 전체 필드, 알 수 없는 필드면 None)"""
+    if not value:
+        return list(RECIPE_FIELDS)
+    fields = []
+    for name in value.split(','):
+        name = name.strip()
+        if name not in RECIPE_FIELDS:
+            return None
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def encode_recipe_cursor(row):
+    """다음 페이지 커서 (created_at, id)"""
+    raw = json.dumps([row['created_at'], row['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_recipe_cursor(cursor):
+    """커서 해석. (created_at, id) 반환 (형식이 틀리면 None)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, recipe_id = json.loads(raw)
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if not isinstance(created_at, str) or not isinstance(recipe_id, int):
+        return None
+    return created_at, recipe_id
+
+
 @app.route('/api/recipes', methods=['GET'])
 @login_required
 def get_saved_recipes():
-    """저장된 레시피 목록"""
+    """저장된 레시피 목록 (최신순, fields=로 필드 선택)
+
+    limit이나 cursor를 주면 키셋 페이지네이션 (next_cursor 포함), 둘 다 없으면 기존처럼 전체 목록
+    """
+    fields = parse_recipe_fields(request.args.get('fields'))
+    if fields is None:
+        return jsonify({
+            "success": False,
+            "error": f"지원하지 않는 필드입니다 (가능: {', '.join(RECIPE_FIELDS)})"
+        }), 400
+
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    try:
+        limit = int(request.args.get('limit', RECIPES_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"success": False, "error": "limit은 숫자여야 합니다"}), 400
+    limit = max(1, min(limit, RECIPES_MAX_PAGE_SIZE))
+
+    # 커서 계산용 id, created_at은 항상 조회
+    columns = ['id', 'created_at'] + [
+        RECIPE_FIELDS[f][0] for f in fields if f not in ('id', 'created_at')
+    ]
+    sql = f'SELECT {", ".join(columns)} FROM saved_recipes WHERE user_id = ?'
+    params = [session['user_id']]
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        position = decode_recipe_cursor(cursor)
+        if position is None:
+            return jsonify({"success": False, "error": "잘못된 커서입니다"}), 400
+        sql += ' AND (created_at, id) < (?, ?)'
+        params.extend(position)
+
+    sql += ' ORDER BY created_at DESC, id DESC'
+    if not paginated:
+        rows = get_db().execute(sql, params).fetchall()
+        return jsonify({"success": True, "recipes": [saved_recipe_to_dict(r, fields) for r in rows]})
+
+    sql += ' LIMIT ?'
+    params.append(limit + 1)  # 다음 페이지 존재 여부 확인용 1개 추가 조회
+
     db = get_db()
-    recipes = db.execute('''
-        SELECT * FROM saved_recipes
-        WHERE user_id = ?
-        ORDER BY created_at DESC
-    ''', (session['user_id'],)).fetchall()
+    rows = db.execute(sql, params).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
-    result = []
-    for r in recipes:
-        result.append({
-            "id": r['id'],
-            "name": r['recipe_name'],
-            "recipe": json.loads(r['recipe_data']),
-            "ingredients": json.loads(r['ingredients']),
-            "cuisine_type": r['cuisine_type'],
-            "difficulty": r['difficulty'],
-            "cook_time": r['cook_time'],
-            "rating": r['rating'],
-            "notes": r['notes'],
-            "tags": json.loads(r['tags']),
-            "created_at": r['created_at']
-        })
+    return jsonify({
+        "success": True,
+        "recipes": [saved_recipe_to_dict(r, fields) for r in rows],
+        "next_cursor": encode_recipe_cursor(rows[-1]) if has_more else None
+    })
+
+
+@app.route('/api/recipes/search', methods=['GET'])
+@login_required
+def search_saved_recipes():
+    """저장된 레시피 전문 검색 (관련도순, limit·offset 페이지네이션, 일치 부분 강조)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"success": False, "error": "검색어를 입력해주세요"}), 400
+
+    try:
+        limit = int(request.args.get('limit', RECIPES_PAGE_SIZE))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({"success": False, "error": "limit과 offset은 숫자여야 합니다"}), 400
+    limit = max(1, min(limit, RECIPES_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    results, has_more = recipe_search.search(get_db(), session['user_id'], query, limit, offset)
+    return jsonify({
+        "success": True,
+        "recipes": results,
+        "next_offset": offset + limit if has_more else None
+    })
 
-    return jsonify({"success": True, "recipes": result})
+
+@app.route('/api/recipes/match', methods=['POST'])
+@login_required
+def match_saved_recipes():
+    """보유 재료로 만들 수 있는 저장 레시피 (부족 재료 적은 순, 재료 보유율 높은 순)"""
+    data = request.get_json(silent=True) or {}
+    ingredients = data.get('ingredients')
+    if not isinstance(ingredients, list) or not ingredients:
+        return jsonify({"success": False, "error": "재료 목록이 필요합니다"}), 400
+
+    try:
+        limit = max(1, min(int(data.get('limit', 10)), RECIPES_MAX_PAGE_SIZE))
+        max_missing = data.get('max_missing')
+        max_missing = int(max_missing) if max_missing is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "limit과 max_missing은 숫자여야 합니다"}), 400
+
+    start = time.perf_counter()
+    ingredient_index.load_user(get_db(), session['user_id'])
+    results = ingredient_index.match(session['user_id'], ingredients, limit, max_missing)
+    return jsonify({
+        "success": True,
+        "recipes": results,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
 
 
 @app.route('/api/recipes/<int:recipe_id>', methods=['GET'])
@@ -653,22 +1595,7 @@ def get_recipe_detail(recipe_id):
     if not r:
         return jsonify({"success": False, "error": "레시피를 찾을 수 없습니다"}), 404
 
-    return jsonify({
-        "success": True,
-        "recipe": {
-            "id": r['id'],
-            "name": r['recipe_name'],
-            "recipe": json.loads(r['recipe_data']),
-            "ingredients": json.loads(r['ingredients']),
-            "cuisine_type": r['cuisine_type'],
-            "difficulty": r['difficulty'],
-            "cook_time": r['cook_time'],
-            "rating": r['rating'],
-            "notes": r['notes'],
-            "tags": json.loads(r['tags']),
-            "created_at": r['created_at']
-        }
-    })
+    return jsonify({"success": True, "recipe": saved_recipe_to_dict(r)})
 
 
 @app.route('/api/recipes/<int:recipe_id>', methods=['PUT'])
@@ -725,6 +1652,7 @@ def delete_recipe(recipe_id):
 
     db.execute('DELETE FROM saved_recipes WHERE id = ?', (recipe_id,))
     db.commit()
+    ingredient_index.remove(session['user_id'], recipe_id)
 
     return jsonify({"success": True})
 
@@ -757,40 +1685,31 @@ def get_analysis_history():
 @app.route('/api/history/stats', methods=['GET'])
 @login_required
 def get_stats():
-    """통계 정보"""
+    """통계 정보 (트리거로 갱신되는 user_stats 집계 테이블 조회)"""
     db = get_db()
 
-    # 저장된 레시피 수
-    recipe_count = db.execute(
-        'SELECT COUNT(*) as count FROM saved_recipes WHERE user_id = ?',
+    # 저장된 레시피 수, 분석 횟수
+    stats = db.execute(
+        'SELECT recipe_count, analysis_count FROM user_stats WHERE user_id = ?',
         (session['user_id'],)
-    ).fetchone()['count']
-
-    # 분석 횟수
-    analysis_count = db.execute(
-        'SELECT COUNT(*) as count FROM analysis_history WHERE user_id = ?',
-        (session['user_id'],)
-    ).fetchone()['count']
+    ).fetchone()
 
     # 자주 사용하는 재료
-    history = db.execute(
-        'SELECT detected_ingredients FROM analysis_history WHERE user_id = ?',
-        (session['user_id'],)
-    ).fetchall()
-
-    ingredient_counts = {}
-    for h in history:
-        for ing in json.loads(h['detected_ingredients']):
-            ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-
-    top_ingredients = sorted(ingredient_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_ingredients = db.execute('''
+        SELECT i.name, s.count
+        FROM user_ingredient_stats s
+        JOIN ingredients i ON i.id = s.ingredient_id
+        WHERE s.user_id = ? AND s.count > 0
+        ORDER BY s.count DESC, s.ingredient_id
+        LIMIT 10
+    ''', (session['user_id'],)).fetchall()
 
     return jsonify({
         "success": True,
         "stats": {
-            "saved_recipes": recipe_count,
-            "analysis_count": analysis_count,
-            "top_ingredients": [{"name": k, "count": v} for k, v in top_ingredients]
+            "saved_recipes": stats['recipe_count'] if stats else 0,
+            "analysis_count": stats['analysis_count'] if stats else 0,
+            "top_ingredients": [{"name": r['name'], "count": r['count']} for r in top_ingredients]
         }
     })
 
@@ -0,0 +1,170 @@
+"""
+SQLite 동시 읽기/쓰기 처리량 벤치마크
+요청마다 연결을 새로 여는 기존 방식(롤백 저널)과 연결 풀(WAL) 비교
+
+읽기 스레드는 저장 레시피 목록 조회(/api/recipes), 쓰기 스레드는 분석 히스토리 저장을 흉내냄
+--per-request를 주면 요청마다 새 스레드에서 실행 (Flask 개발 서버 threaded=True와 같은 방식)
+
+사용법: python benchmarks/bench_db.py [--readers 8] [--writers 2] [--duration 5] [--rows 2000] [--per-request]
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ConnectionPool
+
+SCHEMA = '''
+    CREATE TABLE saved_recipes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        recipe_name TEXT NOT NULL,
+        recipe_data TEXT NOT NULL,
+        rating INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE analysis_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        detected_ingredients TEXT DEFAULT '[]',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+READ_SQL = 'SELECT * FROM saved_recipes WHERE user_id = ? ORDER BY created_at DESC LIMIT 20'
+WRITE_SQL = 'INSERT INTO analysis_history (user_id, detected_ingredients) VALUES (?, ?)'
+
+
+def create_database(path, rows):
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    recipe = json.dumps({"name": "김치찌개", "steps": ["재료 손질"] * 10}, ensure_ascii=False)
+    db.executemany(
+        'INSERT INTO saved_recipes (user_id, recipe_name, recipe_data, rating) VALUES (?, ?, ?, ?)',
+        [(i % 50, f'레시피 {i}', recipe, i % 5 + 1) for i in range(rows)]
+    )
+    db.commit()
+    db.close()
+
+
+def baseline_connect(path):
+    """기존 방식: 요청마다 새 연결 (기본 롤백 저널)"""
+    def connect():
+        db = sqlite3.connect(path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def release(db):
+        db.close()
+    return connect, release
+
+
+def pooled_connect(path, max_size):
+    """풀 방식: 요청 동안 연결을 빌리고 반납 (WAL)"""
+    pool = ConnectionPool(path, pragmas={'busy_timeout': 30000}, max_size=max_size)
+    return pool.connect, pool.release, pool
+
+
+def in_new_thread(func):
+    """요청마다 새 스레드에서 실행하고 끝날 때까지 대기"""
+    def run(*args):
+        thread = threading.Thread(target=func, args=args)
+        thread.start()
+        thread.join()
+    return run
+
+
+def run(connect, release, readers, writers, duration, per_request=False):
+    counts = {'read': 0, 'write': 0, 'error': 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+    wrap = in_new_thread if per_request else (lambda func: func)
+
+    def count(kind):
+        with lock:
+            counts[kind] += 1
+
+    @wrap
+    def read(n):
+        db = connect()
+        try:
+            db.execute(READ_SQL, (n % 50,)).fetchall()
+            count('read')
+        except sqlite3.OperationalError:
+            count('error')
+        finally:
+            release(db)
+
+    @wrap
+    def write(n, payload):
+        db = connect()
+        try:
+            db.execute(WRITE_SQL, (n, payload))
+            db.commit()
+            count('write')
+        except sqlite3.OperationalError:
+            count('error')
+        finally:
+            release(db)
+
+    def reader(n):
+        while time.perf_counter() < stop:
+            read(n)
+
+    def writer(n):
+        payload = json.dumps(['계란', '우유', '당근'], ensure_ascii=False)
+        while time.perf_counter() < stop:
+            write(n, payload)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--per-request', action='store_true', help='요청마다 새 스레드에서 실행')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_db_')
+    try:
+        print("=" * 60)
+        pattern = '요청마다 새 스레드' if args.per_request else '고정 스레드'
+        print(f"SQLite 동시성 벤치마크 (읽기 {args.readers}, 쓰기 {args.writers}, {args.duration}초, {pattern})")
+        print("=" * 60)
+        for label, factory in (('기존 (요청별 연결)', baseline_connect), ('풀 + WAL', pooled_connect)):
+            path = os.path.join(workdir, f'{factory.__name__}.db')
+            create_database(path, args.rows)
+            if factory is pooled_connect:
+                connect, release, pool = factory(path, args.readers + args.writers)
+            else:
+                (connect, release), pool = factory(path), None
+            counts = run(connect, release, args.readers, args.writers, args.duration, args.per_request)
+            print(f"\n📊 {label}")
+            print(f"   읽기: {counts['read'] / args.duration:,.0f}회/초")
+            print(f"   쓰기: {counts['write'] / args.duration:,.0f}회/초")
+            print(f"   잠금 오류: {counts['error']}")
+            if pool is not None:
+                stats = pool.stats()
+                print(f"   연결 생성: {stats['created']}, 재사용: {stats['reused']:,}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+재료 역색인 조회 벤치마크
+사용자 한 명의 저장 레시피 수(기본 10k)에 따른 "보유 재료로 만들 수 있는 레시피" 조회 시간 측정
+
+사용법: python benchmarks/bench_ingredient_index.py [--recipes 10000] [--vocabulary 300] [--queries 500]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingredient_index import IngredientIndex, _UserIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recipes', type=int, default=10000)
+    parser.add_argument('--vocabulary', type=int, default=300)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # 자주 쓰는 재료가 더 많이 등장하도록 가중치 부여
+    vocabulary = [f'재료{chr(0xAC00 + i)}' for i in range(args.vocabulary)]
+    weights = [1 / (i + 1) for i in range(args.vocabulary)]
+
+    index = IngredientIndex()
+    user = _UserIndex()
+    start = time.perf_counter()
+    for recipe_id in range(args.recipes):
+        ingredients = set(rng.choices(vocabulary, weights, k=rng.randint(4, 12)))
+        index._add(user, recipe_id, f'레시피 {recipe_id}', ingredients)
+    index._users[1] = user
+    build_time = time.perf_counter() - start
+
+    timings = []
+    candidates = 0
+    for _ in range(args.queries):
+        detected = set(rng.choices(vocabulary, weights, k=rng.randint(3, 10)))
+        start = time.perf_counter()
+        results = index.match(1, detected, limit=10)
+        timings.append(time.perf_counter() - start)
+        candidates += bool(results)
+
+    timings.sort()
+    print("=" * 60)
+    print(f"재료 역색인 벤치마크 (레시피 {args.recipes:,}개, 재료 종류 {args.vocabulary})")
+    print("=" * 60)
+    print(f"   인덱스 구축: {build_time:.2f}초")
+    print(f"   조회 {args.queries}회 중 결과 있음: {candidates}회")
+    print(f"   조회 p50: {statistics.median(timings) * 1000:.3f}ms")
+    print(f"   조회 p95: {timings[int(len(timings) * 0.95) - 1] * 1000:.3f}ms")
+    print(f"   조회 최대: {timings[-1] * 1000:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+재료 이름 정규화 벤치마크
+동의어/분량/괄호/대소문자 변형을 섞은 재료 문자열 목록(기본 200k)에 대한 정규화 처리량과
+표준 이름으로 합쳐지는 비율 측정
+
+사용법: python benchmarks/bench_ingredient_names.py [--strings 200000] [--synonyms data/ingredient_synonyms.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingredient_names import DEFAULT_SYNONYMS_PATH, IngredientCanonicalizer
+
+QUANTITIES = ['', ' 1개', ' 200g', ' 2큰술', ' (10개)', ' 약간', ' 1/2컵', ': 적당량', ' [다진 것]']
+PREFIXES = ['', '', '', '- ', '2 ', '½ ']
+
+
+def variants(rng, names, count):
+    """표준 이름/동의어에 분량·괄호·대소문자·전각 변형을 붙인 문자열 목록"""
+    result = []
+    for _ in range(count):
+        name = rng.choice(names)
+        if name.isascii() and rng.random() < 0.3:
+            name = name.title() if rng.random() < 0.5 else name.upper()
+        if rng.random() < 0.05:
+            name = ''.join(chr(ord(c) + 0xFEE0) if '!' <= c <= '~' else c for c in name)  # 전각
+        result.append(rng.choice(PREFIXES) + name + rng.choice(QUANTITIES))
+    return result
+
+
+def throughput(func, strings):
+    start = time.perf_counter()
+    for name in strings:
+        func(name)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(strings) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--strings', type=int, default=200000)
+    parser.add_argument('--synonyms', default=DEFAULT_SYNONYMS_PATH)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open(args.synonyms, encoding='utf-8') as f:
+        synonyms = json.load(f)
+    names = [name for canonical, aliases in synonyms.items() for name in (canonical, *aliases)]
+    strings = variants(random.Random(args.seed), names, args.strings)
+
+    start = time.perf_counter()
+    canonicalizer = IngredientCanonicalizer(synonyms)
+    build_time = time.perf_counter() - start
+    uncached = IngredientCanonicalizer(synonyms, memo_size=0)
+
+    cold_time, cold_rate = throughput(uncached.canonicalize, strings)
+    throughput(canonicalizer.canonicalize, strings)  # 메모 채우기
+    warm_time, warm_rate = throughput(canonicalizer.canonicalize, strings)
+
+    canonical = {canonicalizer.canonicalize(name) for name in strings}
+    unknown = sum(1 for name in canonical if name not in synonyms)
+
+    print("=" * 60)
+    print(f"재료 이름 정규화 벤치마크 ({len(strings):,}개, 동의어 {len(names)}개)")
+    print("=" * 60)
+    print(f"   사전 구성: {build_time * 1000:.2f}ms")
+    print(f"   메모 없음: {cold_time:.2f}초 ({cold_rate:,.0f}개/초, {cold_time / len(strings) * 1e6:.2f}µs/개)")
+    print(f"   메모 적중: {warm_time:.2f}초 ({warm_rate:,.0f}개/초, {warm_time / len(strings) * 1e6:.2f}µs/개)")
+    print(f"   서로 다른 원본 문자열: {len(set(strings)):,}개 → 표준 이름 {len(canonical):,}개")
+    print(f"   사전에 없는 결과: {unknown}개")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+LLM 응답 파서 벤치마크
+기록된 모델 응답(benchmarks/llm_responses.jsonl)에 대해 기존 정규식 추출과 선형 스캐너의
+파싱 성공률과 처리량 비교. --think-chars로 추론 블록을 늘려 긴 응답에서의 차이를 측정
+레시피 응답을 여러 지점에서 잘라 복구(salvage_json) 후 필수 필드가 남는 비율도 측정
+
+사용법: python benchmarks/bench_llm_response.py [--repeat 200] [--think-chars 0]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_response import first_json, salvage_json
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_responses.jsonl')
+
+
+def regex_recipe(text):
+    """기존 extract_recipe_json의 JSON 단계 (탐욕적 정규식)"""
+    json_match = re.search(r'\{[\s\S]*\}', text)
+    if json_match:
+        try:
+            return json.loads(json_match.group())
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def regex_ingredients(text):
+    """기존 extract_ingredients의 JSON 단계 (비탐욕적 정규식)"""
+    json_match = re.search(r'\[.*?\]', text, re.DOTALL)
+    if json_match:
+        try:
+            ingredients = json.loads(json_match.group())
+            if isinstance(ingredients, list):
+                return [str(i).strip() for i in ingredients if i]
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def ingredient_names(value):
+    if isinstance(value, dict):
+        value = value.get('ingredients')
+    if not isinstance(value, list):
+        return None
+    return [i.get('name') if isinstance(i, dict) else i for i in value]
+
+
+def is_recipe(value):
+    return isinstance(value, dict) and ('ingredients' in value or 'steps' in value)
+
+
+def scanner_recipe(text):
+    return first_json(text, openers='{', accept=is_recipe)
+
+
+def scanner_ingredients(text):
+    return ingredient_names(first_json(text, accept=lambda v: ingredient_names(v) is not None))
+
+
+PARSERS = {
+    'regex': {'recipe': regex_recipe, 'ingredients': regex_ingredients},
+    'scanner': {'recipe': scanner_recipe, 'ingredients': scanner_ingredients},
+}
+
+
+def is_success(entry, result):
+    expected = entry['expected']
+    if expected is None:
+        return result is None
+    if entry['kind'] == 'recipe':
+        return isinstance(result, dict) and result.get('name') == expected
+    return result == expected
+
+
+def is_usable(recipe):
+    """복구 결과에 레시피 필수 필드(name, ingredients, steps)가 모두 있는지"""
+    return isinstance(recipe, dict) and all(recipe.get(f) for f in ('name', 'ingredients', 'steps'))
+
+
+def salvage_rate(entries, fractions=(0.5, 0.7, 0.8, 0.9, 0.95)):
+    """레시피 응답을 JSON 길이의 각 비율 지점에서 잘랐을 때 (복구 시도, 사용 가능) 수"""
+    attempts = usable = 0
+    for entry in entries:
+        text = entry['text']
+        start = text.find('{', text.rfind('</think>') + 1)
+        end = text.rfind('}') + 1
+        if entry['kind'] != 'recipe' or entry['expected'] is None or start < 0:
+            continue
+        for fraction in fractions:
+            truncated = text[:start + int((end - start) * fraction)]
+            attempts += 1
+            usable += is_usable(salvage_json(truncated, openers='{', accept=lambda v: isinstance(v, dict)))
+    return attempts, usable
+
+
+def pad_think(entry, chars):
+    """응답 앞에 괄호가 섞인 긴 추론 블록 추가"""
+    if chars <= 0:
+        return entry
+    filler = '재료 {계란, 양파} 조합과 [후보 요리]를 검토한다. '
+    think = '<think>\n' + filler * (chars // len(filler) + 1) + '\n</think>\n'
+    return dict(entry, text=think[:chars] + '\n</think>\n' + entry['text'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_PATH)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--think-chars', type=int, default=0, help='응답마다 앞에 붙일 추론 블록 길이 (문자 수)')
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding='utf-8') as f:
+        entries = [pad_think(json.loads(line), args.think_chars) for line in f if line.strip()]
+    total_chars = sum(len(e['text']) for e in entries)
+
+    print("=" * 60)
+    print(f"LLM 응답 파서 벤치마크 (응답 {len(entries)}개, 평균 {total_chars // len(entries):,}자, {args.repeat}회 반복)")
+    print("=" * 60)
+    for name, parsers in PARSERS.items():
+        failures = [e['note'] for e in entries if not is_success(e, parsers[e['kind']](e['text']))]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for entry in entries:
+                parsers[entry['kind']](entry['text'])
+        elapsed = time.perf_counter() - start
+        parsed = len(entries) * args.repeat
+        print(f"\n[{name}]")
+        print(f"   성공률: {len(entries) - len(failures)}/{len(entries)}")
+        print(f"   처리량: {parsed / elapsed:,.0f}개/초 ({total_chars * args.repeat / elapsed / 1e6:.1f}M자/초)")
+        for note in failures:
+            print(f"   ❌ {note}")
+
+    attempts, usable = salvage_rate(entries)
+    print("\n[잘린 레시피 복구]")
+    print(f"   필수 필드 유지: {usable}/{attempts} ({usable / attempts:.0%}) - 나머지는 다음 모델로 넘어감")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+지각 해시 인덱스 조회 벤치마크
+멀티 인덱스 해시에 저장된 해시 수(기본 100k)에 따른 유사 이미지 조회 시간 측정
+
+사용법: python benchmarks/bench_phash.py [--size 100000] [--queries 1000] [--distance 6]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phash import MultiIndexHash, hamming_distance
+
+
+def flip_bits(value, count, rng):
+    """임의의 비트 count개 반전 (재인코딩된 유사 이미지 흉내)"""
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def linear_nearest(hashes, key, max_distance):
+    """비교용 선형 탐색"""
+    best = None
+    for h in hashes:
+        d = hamming_distance(key, h)
+        if d <= max_distance and (best is None or d < best):
+            best = d
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--distance', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hashes = [rng.getrandbits(64) for _ in range(args.size)]
+
+    start = time.perf_counter()
+    index = MultiIndexHash()
+    for i, h in enumerate(hashes):
+        index.add(h, i)
+    build_time = time.perf_counter() - start
+
+    # 절반은 저장된 해시의 변형(적중), 절반은 무작위(미적중)
+    queries = []
+    for i in range(args.queries):
+        if i % 2 == 0:
+            queries.append(flip_bits(rng.choice(hashes), rng.randint(0, args.distance), rng))
+        else:
+            queries.append(rng.getrandbits(64))
+
+    timings = []
+    found = 0
+    for q in queries:
+        start = time.perf_counter()
+        result = index.nearest(q, args.distance)
+        timings.append(time.perf_counter() - start)
+        if result is not None:
+            found += 1
+
+    linear_timings = []
+    for q in queries[:min(50, len(queries))]:
+        start = time.perf_counter()
+        linear_nearest(hashes, q, args.distance)
+        linear_timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print("=" * 60)
+    print(f"지각 해시 인덱스 벤치마크 (저장 {len(index):,}개, 최대 거리 {args.distance})")
+    print("=" * 60)
+    print(f"   인덱스 구축: {build_time:.2f}초")
+    print(f"   조회 {len(queries)}회, 적중 {found}회")
+    print(f"   인덱스 p50: {statistics.median(timings) * 1000:.3f}ms")
+    print(f"   인덱스 p95: {timings[int(len(timings) * 0.95) - 1] * 1000:.3f}ms")
+    print(f"   인덱스 평균: {statistics.mean(timings) * 1000:.3f}ms")
+    print(f"   선형 탐색 평균: {statistics.mean(linear_timings) * 1000:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
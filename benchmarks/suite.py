@@ -0,0 +1,369 @@
+"""
+마이크로 벤치마크 모음 + 성능 회귀 검사
+응답 파싱(extract_ingredients, extract_recipe_json, parse_recipe_text)과 hash_password,
+저장 레시피 목록/분석 히스토리/통계 API의 SQL(migrations.HOT_QUERIES)을 합성 DB 크기별로 측정
+
+합성 DB는 실제 마이그레이션으로 스키마를 만든 뒤 트리거 없이 대량 적재하고 통계를 한 번에 재계산함
+(만든 DB는 --data-dir에 스키마 버전별로 보관해 다음 실행에서 재사용)
+각 벤치마크는 timeit 자동 반복 횟수로 --repeat회 측정한 1회당 시간의 중앙값/최솟값을 기록
+
+사용법:
+  python benchmarks/suite.py run [--sizes 10000,100000,1000000] [--filter sql.] [--output results.json]
+  python benchmarks/suite.py baseline [--baseline benchmarks/baseline.json]
+  python benchmarks/suite.py compare [--baseline benchmarks/baseline.json] [--threshold 0.25] [--noise-floor 1.0] [results.json]
+
+compare는 결과 파일을 주지 않으면 기준선과 같은 크기로 새로 측정하고,
+최솟값(--repeat회 중 가장 빠른 측정)이 기준선보다 threshold 비율 이상, noise-floor µs 이상 느려진
+벤치마크가 있으면 종료 코드 1 (중앙값은 스케줄링/클럭 변동에 흔들려 1µs 미만 항목은 25%도 잡음 범위)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ConnectionPool
+from migrations import HOT_QUERIES, MIGRATIONS, migrate
+import user_stats
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCH_DIR, 'llm_responses.jsonl')
+SYNONYMS_PATH = os.path.join(ROOT, 'data', 'ingredient_synonyms.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'smart_recipe_bench')
+DEFAULT_SIZES = '10000,100000,1000000'
+
+USERS = 100  # 합성 DB 사용자 수 (행은 1/순위 비율로 배분해 1번 사용자가 가장 많음)
+ITEMS_PER_ANALYSIS = 3
+
+# 텍스트 형식 레시피 응답 (JSON이 없을 때의 대체 파서 입력)
+RECIPE_TEXT = '''요리 이름: 김치찌개
+설명: 잘 익은 김치와 돼지고기로 끓이는 얼큰한 찌개
+재료:
+1. 김치 300g
+2. 돼지고기 200g
+3. 두부 반 모
+4. 대파 1대
+5. 고춧가루 1큰술
+조리 순서:
+1. 돼지고기를 한입 크기로 썰어 냄비에 볶는다
+2. 김치를 넣고 5분간 함께 볶는다
+3. 물 500ml를 붓고 센 불에서 끓인다
+4. 두부와 대파를 넣고 10분 더 끓인다
+팁: 김치 국물을 조금 넣으면 더 깊은 맛이 난다
+'''
+
+
+def import_app(workdir):
+    """app 모듈을 작업 폴더에서 불러옴 (시작 시 만드는 DB가 저장소에 생기지 않도록)"""
+    os.environ.setdefault('OPENROUTER_POOL_WARMUP', '0')
+    os.environ.setdefault('RECIPE_CORPUS_ENABLED', '0')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+def load_responses(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return {
+        kind: [e['text'] for e in entries if e['kind'] == kind]
+        for kind in ('recipe', 'ingredients')
+    }
+
+
+def parse_benchmarks(app):
+    """(이름, 1회 실행 함수, 1회당 호출 수)"""
+    responses = load_responses()
+
+    def each(func, inputs):
+        def run():
+            for text in inputs:
+                func(text)
+        return run
+
+    return [
+        ('parse.extract_ingredients', each(app.extract_ingredients, responses['ingredients']),
+         len(responses['ingredients'])),
+        ('parse.extract_recipe_json', each(app.extract_recipe_json, responses['recipe']),
+         len(responses['recipe'])),
+        ('parse.parse_recipe_text', lambda: app.parse_recipe_text(RECIPE_TEXT), 1),
+        ('auth.hash_password', lambda: app.hash_password('correct-horse-battery'), 1),
+    ]
+
+
+def ingredient_names(path=SYNONYMS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return list(json.load(f))
+
+
+def build_database(path, rows, seed=42):
+    """rows개의 저장 레시피/분석 히스토리를 가진 합성 DB 생성"""
+    rng = random.Random(seed)
+    db = sqlite3.connect(path)
+    migrate(db)
+    db.execute('PRAGMA journal_mode = OFF')
+    db.execute('PRAGMA synchronous = OFF')
+    # 행 단위 트리거 대신 마지막에 통계를 한 번에 계산 (전문 검색 색인은 측정 쿼리와 무관해 비워 둠)
+    for (name,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        db.execute(f'DROP TRIGGER {name}')
+
+    db.executemany(
+        'INSERT INTO users (id, email, password_hash, nickname) VALUES (?, ?, ?, ?)',
+        [(u, f'user{u}@example.com', '0' * 64, f'사용자{u}') for u in range(1, USERS + 1)]
+    )
+    names = ingredient_names()
+    db.executemany('INSERT INTO ingredients (id, name) VALUES (?, ?)', enumerate(names, 1))
+
+    users = list(range(1, USERS + 1))
+    weights = [1 / u for u in users]
+    start = datetime(2024, 1, 1)
+    # 초 단위 시각이 겹치도록 행 수보다 좁은 구간에 배치 (키셋 커서의 id 비교까지 사용)
+    span = max(rows // 2, 1)
+
+    def timestamps():
+        for offset in sorted(rng.randrange(span) for _ in range(rows)):
+            yield (start + timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def recipes():
+        for created_at, user_id in zip(timestamps(), rng.choices(users, weights, k=rows)):
+            picked = rng.sample(names, 4)
+            recipe = {
+                "name": f'{picked[0]} 요리',
+                "ingredients": [{"name": n, "amount": "적당량"} for n in picked],
+                "steps": ["재료를 손질한다", "볶는다", "간을 맞춘다"],
+            }
+            yield (user_id, recipe['name'], json.dumps(recipe, ensure_ascii=False),
+                   json.dumps(picked, ensure_ascii=False), '한식', '초급', '20분',
+                   rng.randint(1, 5), created_at)
+
+    db.executemany(
+        'INSERT INTO saved_recipes (user_id, recipe_name, recipe_data, ingredients, cuisine_type, '
+        'difficulty, cook_time, rating, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        recipes()
+    )
+
+    def analyses():
+        for created_at, user_id in zip(timestamps(), rng.choices(users, weights, k=rows)):
+            picked = rng.sample(names, ITEMS_PER_ANALYSIS)
+            yield (user_id, json.dumps(picked, ensure_ascii=False), created_at)
+
+    db.executemany(
+        'INSERT INTO analysis_history (user_id, detected_ingredients, created_at) VALUES (?, ?, ?)',
+        analyses()
+    )
+    db.execute('''
+        INSERT INTO analysis_history_items (history_id, user_id, ingredient_id)
+        SELECT h.id, h.user_id, i.id
+        FROM analysis_history h, json_each(h.detected_ingredients) j
+        JOIN ingredients i ON i.name = j.value
+    ''')
+    user_stats.rebuild(db)
+    db.commit()
+    db.close()
+
+
+def synthetic_database(data_dir, rows):
+    """스키마 버전/행 수별 합성 DB 경로 (없으면 생성)"""
+    path = os.path.join(data_dir, f'synthetic_v{MIGRATIONS[-1][0]}_{rows}.db')
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"   합성 DB 생성 중 ({rows:,}행)...", flush=True)
+        started = time.perf_counter()
+        partial = path + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        build_database(partial, rows)
+        os.replace(partial, path)
+        print(f"   완료 ({time.perf_counter() - started:.1f}초)", flush=True)
+    return path
+
+
+SQL_BENCHMARKS = ('recipes.page', 'recipes.next_page', 'history.recent', 'stats.by_user', 'stats.top_ingredients')
+
+
+def sql_benchmarks(path, rows):
+    """저장 레시피 목록/분석 히스토리/통계 API의 쿼리를 가장 행이 많은 사용자 기준으로 실행"""
+    db = ConnectionPool(path).connect()
+    user_id = db.execute(
+        'SELECT user_id FROM user_stats ORDER BY recipe_count DESC LIMIT 1'
+    ).fetchone()[0]
+    # 다음 페이지 커서는 사용자 레시피 목록의 중간 지점
+    middle = db.execute(
+        'SELECT created_at, id FROM saved_recipes WHERE user_id = ? '
+        'ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET '
+        '(SELECT recipe_count / 2 FROM user_stats WHERE user_id = ?)',
+        (user_id, user_id)
+    ).fetchone()
+    params = {
+        'recipes.page': (user_id, 21),
+        'recipes.next_page': (user_id, middle[0], middle[1], 21),
+        'history.recent': (user_id,),
+        'stats.by_user': (user_id,),
+        'stats.top_ingredients': (user_id,),
+    }
+    queries = {name: sql for name, sql, _ in HOT_QUERIES}
+
+    def query(sql, args):
+        return lambda: db.execute(sql, args).fetchall()
+
+    return [(f'sql.{name}[{rows}]', query(queries[name], params[name]), 1) for name in SQL_BENCHMARKS]
+
+
+def measure(func, calls, repeat):
+    """1회당 시간(마이크로초)의 중앙값/최솟값"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number / calls * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": round(statistics.median(times), 3),
+        "min_us": round(min(times), 3),
+        "loops": number * calls,
+    }
+
+
+def run_suite(sizes, name_filter=None, repeat=5, data_dir=DEFAULT_DATA_DIR):
+    workdir = tempfile.mkdtemp(prefix='bench_suite_')
+    app = import_app(workdir)
+
+    groups = [('응답 파싱 / 인증', lambda: parse_benchmarks(app))]
+    for rows in sizes:
+        groups.append((f'SQL ({rows:,}행)', lambda rows=rows: sql_benchmarks(synthetic_database(data_dir, rows), rows)))
+
+    results = {}
+    for title, make in groups:
+        print(f"\n[{title}]", flush=True)
+        for name, func, calls in make():
+            if name_filter and not re.search(name_filter, name):
+                continue
+            results[name] = measure(func, calls, repeat)
+            print(f"   {name:<42} {results[name]['median_us']:>12,.2f}µs", flush=True)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.platform(),
+        "sizes": sizes,
+        "results": results,
+    }
+
+
+def best_time(result):
+    """비교에 쓸 1회당 시간 (최솟값이 없는 예전 결과 파일은 중앙값)"""
+    return result.get('min_us', result['median_us'])
+
+
+def compare(baseline, current, threshold, noise_floor=1.0):
+    """기준선 대비 변화율 표 출력. 회귀한 벤치마크 이름 목록 반환
+
+    최솟값끼리 비교하고, 느려진 시간이 noise_floor(µs) 이하면 비율과 관계없이 잡음으로 봄
+    """
+    regressions = []
+    print(f"\n{'벤치마크':<38} {'기준선':>9} {'현재':>10} {'변화':>6}")  # 한글은 두 칸 너비
+    for name, base in baseline['results'].items():
+        result = current['results'].get(name)
+        if result is None:
+            print(f"{name:<42} {best_time(base):>10,.2f}µs {'-':>12} {'측정 안 함':>8}")
+            continue
+        before, after = best_time(base), best_time(result)
+        change = after / before - 1 if before else 0
+        mark = ''
+        if change > threshold and after - before > noise_floor:
+            regressions.append(name)
+            mark = ' ❌'
+        elif change > threshold:
+            mark = ' (잡음)'
+        print(f"{name:<42} {before:>10,.2f}µs {after:>10,.2f}µs {change:>+8.1%}{mark}")
+    for name in current['results'].keys() - baseline['results'].keys():
+        print(f"{name:<42} {'-':>12} {best_time(current['results'][name]):>10,.2f}µs {'새 항목':>8}")
+    return regressions
+
+
+def parse_sizes(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def save(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='벤치마크당 측정 횟수 (비교는 최솟값 사용)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 DB 보관 폴더')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='측정 후 결과 출력 (--output으로 저장)')
+    run.add_argument('--sizes', type=parse_sizes, default=parse_sizes(DEFAULT_SIZES), help='합성 DB 행 수 목록')
+    run.add_argument('--filter', help='이름이 일치하는 벤치마크만 (정규식)')
+    run.add_argument('--output')
+
+    baseline = commands.add_parser('baseline', help='측정 후 기준선으로 저장')
+    baseline.add_argument('--sizes', type=parse_sizes, default=parse_sizes(DEFAULT_SIZES))
+    baseline.add_argument('--baseline', default=DEFAULT_BASELINE)
+
+    check = commands.add_parser('compare', help='기준선과 비교해 회귀가 있으면 실패')
+    check.add_argument('results', nargs='?', help='비교할 결과 파일 (없으면 새로 측정)')
+    check.add_argument('--baseline', default=DEFAULT_BASELINE)
+    check.add_argument('--threshold', type=float, default=0.25, help='허용 감속 비율 (0.25 = 25%%)')
+    check.add_argument('--noise-floor', type=float, default=1.0,
+                       help='이보다 적게(µs) 느려진 항목은 비율과 관계없이 회귀로 보지 않음')
+    check.add_argument('--output', help='새로 측정한 결과 저장 경로')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"마이크로 벤치마크 ({args.command})")
+    print("=" * 60)
+
+    if args.command == 'run':
+        results = run_suite(args.sizes, args.filter, args.repeat, args.data_dir)
+        if args.output:
+            save(args.output, results)
+            print(f"\n💾 결과 저장: {args.output}")
+        return
+
+    if args.command == 'baseline':
+        save(args.baseline, run_suite(args.sizes, repeat=args.repeat, data_dir=args.data_dir))
+        print(f"\n💾 기준선 저장: {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            reference = json.load(f)
+    except OSError:
+        sys.exit(f"❌ 기준선 파일이 없습니다: {args.baseline} (먼저 baseline 명령으로 생성)")
+    if args.results:
+        with open(args.results, encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run_suite(reference.get('sizes', []), repeat=args.repeat, data_dir=args.data_dir)
+        if args.output:
+            save(args.output, current)
+
+    regressions = compare(reference, current, args.threshold, args.noise_floor)
+    if regressions:
+        print(f"\n❌ {len(regressions)}개 벤치마크가 기준선보다 {args.threshold:.0%} 넘게 느려짐: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ 회귀 없음 (허용 {args.threshold:.0%}, {args.noise_floor:g}µs 이하 변화는 잡음)")
+
+
+if __name__ == '__main__':
+    main()
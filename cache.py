@@ -0,0 +1,200 @@
+"""
+캐시 유틸리티 - 인메모리 LRU + SQLite 영구 캐시
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """TTL과 최대 크기를 가진 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size=256, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """값 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """값 저장 (가장 오래 사용되지 않은 항목부터 제거)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """항목 삭제"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def keys(self):
+        """만료되지 않은 키 집합"""
+        now = time.time()
+        with self._lock:
+            return {key for key, (expires_at, _) in self._data.items() if expires_at >= now}
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """SQLite 테이블 기반 영구 캐시 (JSON 직렬화, 테이블은 migrations.py에서 생성)
+
+    조회는 읽기만 하고, 최근 사용 시각(accessed_at)은 touch_interval초 이상 지났을 때만 갱신해
+    캐시 적중마다 쓰기 잠금을 잡지 않음 (행 수 제한 시 제거 순서는 그만큼 덜 정확함)
+    """
+
+    def __init__(self, pool, table, max_rows=10000, ttl=3600, touch_interval=300):
+        self.pool = pool  # database.ConnectionPool
+        self.table = table
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+
+    def get_entry(self, key):
+        """(값, 만료 시각) 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        with self.pool.connection() as db:
+            row = db.execute(
+                f'SELECT value, expires_at, accessed_at FROM {self.table} WHERE cache_key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at < now:
+                db.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+                db.commit()
+                return None
+            if now - accessed_at >= self.touch_interval:
+                db.execute(
+                    f'UPDATE {self.table} SET accessed_at = ? WHERE cache_key = ?',
+                    (now, key)
+                )
+                db.commit()
+            return json.loads(value), expires_at
+
+    def get(self, key):
+        """값 조회 (없거나 만료되면 None)"""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        """값 저장 후 최대 행 수를 넘으면 오래된 항목 제거"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self.pool.connection() as db:
+            db.execute(
+                f'INSERT OR REPLACE INTO {self.table} '
+                f'(cache_key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+            )
+            db.execute(f'''
+                DELETE FROM {self.table} WHERE cache_key IN (
+                    SELECT cache_key FROM {self.table}
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_rows,))
+            db.commit()
+
+    def delete(self, key):
+        """항목 삭제"""
+        with self.pool.connection() as db:
+            db.execute(f'DELETE FROM {self.table} WHERE cache_key = ?', (key,))
+            db.commit()
+
+    def keys(self):
+        """만료되지 않은 키 집합"""
+        with self.pool.connection() as db:
+            rows = db.execute(f'SELECT cache_key FROM {self.table} WHERE expires_at >= ?', (time.time(),))
+            return {row[0] for row in rows}
+
+
+class TieredCache:
+    """1차 인메모리 LRU, 2차 SQLite 캐시"""
+
+    def __init__(self, memory, persistent=None):
+        self.memory = memory
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """메모리 → SQLite 순서로 조회, SQLite 적중 시 남은 유효 시간만큼 메모리로 승격"""
+        value = self.memory.get(key)
+        if value is None and self.persistent is not None:
+            try:
+                entry = self.persistent.get_entry(key)
+            except sqlite3.Error:
+                entry = None
+            if entry is not None:
+                value, expires_at = entry
+                self.memory.set(key, value, ttl=expires_at - time.time())
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        """양쪽 계층에 저장 (ttl이 없으면 계층별 기본값)"""
+        self.memory.set(key, value, ttl)
+        if self.persistent is not None:
+            try:
+                self.persistent.set(key, value, ttl)
+            except sqlite3.Error:
+                pass
+
+    def delete(self, key):
+        """양쪽 계층에서 삭제"""
+        self.memory.delete(key)
+        if self.persistent is not None:
+            self.persistent.delete(key)
+
+    def keys(self):
+        """어느 계층에든 남아 있는 만료되지 않은 키 집합"""
+        keys = self.memory.keys()
+        if self.persistent is not None:
+            keys |= self.persistent.keys()
+        return keys
+
+    def stats(self):
+        """적중/실패 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_size": len(self.memory)
+        }
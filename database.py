@@ -0,0 +1,151 @@
+"""
+SQLite 데이터 계층 - 크기가 제한된 연결 풀 및 WAL 모드 설정
+요청마다 연결을 새로 여는 대신 풀에서 연결을 빌려 쓰고 반납해 PRAGMA 설정/준비된 문장을 재사용함
+(개발 서버처럼 요청마다 새 스레드를 만드는 환경에서도 재사용되도록 스레드가 아닌 요청 단위로 빌림)
+재료 사전/히스토리 재료 테이블 기록 함수 포함
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',  # 쓰기 중에도 읽기가 막히지 않음
+    'synchronous': 'NORMAL',  # WAL에서는 NORMAL로도 손상 없이 안전 (전원 장애 시 마지막 커밋만 유실 가능)
+    'busy_timeout': 5000,  # 밀리초
+    'cache_size': -16000,  # 음수는 KiB 단위 (약 16MB)
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+class ConnectionPool:
+    """최대 max_size개의 SQLite 연결을 보관하는 스레드 안전 풀
+
+    connect()로 빌린 연결은 release()로 반납할 때까지 한 스레드만 사용함 (check_same_thread 해제).
+    모두 사용 중이면 busy_timeout 동안 반납을 기다리고, 그래도 없으면 sqlite3.OperationalError
+    """
+
+    def __init__(self, path, pragmas=None, max_size=8, cached_statements=256, row_factory=sqlite3.Row):
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.max_size = max_size
+        self.cached_statements = cached_statements  # 연결별 준비된 문장 캐시 크기
+        self.row_factory = row_factory
+        self._idle = queue.LifoQueue()  # 최근 반납된 연결부터 (페이지 캐시가 따뜻함)
+        self._lock = threading.Lock()
+        self._open = 0
+        self.created = 0
+        self.reused = 0
+        self.waited = 0
+
+    def _new_connection(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.pragmas['busy_timeout'] / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        conn.row_factory = self.row_factory
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def connect(self):
+        """풀에서 연결을 빌림 (유휴 연결이 없고 한도 미만이면 새로 생성)"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._open < self.max_size
+                if can_open:
+                    self._open += 1
+                    self.created += 1
+            if can_open:
+                try:
+                    return self._new_connection()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                        self.created -= 1
+                    raise
+            with self._lock:
+                self.waited += 1
+            try:
+                conn = self._idle.get(timeout=self.pragmas['busy_timeout'] / 1000)
+            except queue.Empty:
+                raise sqlite3.OperationalError('database connection pool exhausted') from None
+        with self._lock:
+            self.reused += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """with 블록 동안 연결을 빌리고 끝나면 반납 (커밋은 호출자가, 커밋하지 않은 변경은 반납 시 롤백)"""
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def release(self, conn):
+        """요청 종료 시 호출 - 커밋되지 않은 트랜잭션은 롤백하고 연결을 풀에 반납"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # 사용할 수 없게 된 연결은 버리고 다음 요청에서 새로 생성
+            conn.close()
+            with self._lock:
+                self._open -= 1
+            return
+        self._idle.put(conn)
+
+    def close(self):
+        """유휴 연결 모두 닫기 (빌려 간 연결은 반납 후 다시 쓰임)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._open -= 1
+
+    def stats(self):
+        """연결 생성/재사용/대기 통계"""
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "waited": self.waited,
+                "open": self._open,
+                "idle": self._idle.qsize(),
+                "max_size": self.max_size,
+                "journal_mode": self.pragmas['journal_mode'].lower()
+            }
+
+
+def ingredient_ids(db, names):
+    """재료 사전에 없는 이름은 추가하고 {이름: id} 반환
+
+    이름은 호출자가 정규화해서 넘김 (여기서 다시 정규화하면 조회 키가 호출자의 이름과 달라질 수 있음)
+    """
+    names = {name.strip() for name in names if isinstance(name, str) and name.strip()}
+    if not names:
+        return {}
+    db.executemany('INSERT OR IGNORE INTO ingredients (name) VALUES (?)', [(n,) for n in names])
+    placeholders = ', '.join('?' * len(names))
+    rows = db.execute(f'SELECT name, id FROM ingredients WHERE name IN ({placeholders})', tuple(names))
+    return {row[0]: row[1] for row in rows}
+
+
+def insert_history_items(db, history_id, user_id, ingredients):
+    """분석 히스토리 한 건의 재료(정규화된 이름)를 analysis_history_items에 기록 (같은 재료는 한 번만)"""
+    ids = ingredient_ids(db, ingredients)
+    db.executemany(
+        'INSERT OR IGNORE INTO analysis_history_items (history_id, user_id, ingredient_id) VALUES (?, ?, ?)',
+        [(history_id, user_id, ingredient_id) for ingredient_id in ids.values()]
+    )
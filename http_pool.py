@@ -0,0 +1,303 @@
+"""
+HTTP/1.1 keep-alive 커넥션 풀
+호스트별로 TCP+TLS 연결을 재사용하여 업스트림 호출마다 핸드셰이크 비용을 없앰
+
+HTTPS_PROXY/HTTP_PROXY/NO_PROXY 환경 변수를 따름 (HTTPS는 CONNECT 터널, HTTP는 절대 URL 요청)
+재사용 연결이 끊겨 있으면 요청을 다 보내기 전에 실패한 경우만 새 연결로 재시도하고,
+요청을 보낸 뒤 응답 전에 끊기면 멱등 메서드만 재시도 (POST는 서버가 처리했을 수 있으므로 중복 과금 방지)
+"""
+
+import base64
+import http.client
+import select
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass_environment
+
+# 재사용한 연결이 서버 측에서 이미 끊긴 경우 발생하는 예외
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+# 응답을 받기 전에 연결이 끊겨도 다시 보내도 되는 메서드
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+
+
+def is_connection_dropped(conn):
+    """유휴 연결이 서버 측에서 닫혔는지 (요청 없이 읽을 것이 있으면 EOF 또는 예상치 못한 데이터)"""
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class PooledResponse:
+    """응답 본문과 연결/요청 소요 시간"""
+
+    def __init__(self, status, headers, body, connect_time, request_time, reused):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.connect_time = connect_time
+        self.request_time = request_time
+        self.reused = reused
+
+    def timing(self):
+        """밀리초 단위 소요 시간"""
+        return {
+            "connect_ms": round(self.connect_time * 1000, 1),
+            "request_ms": round(self.request_time * 1000, 1),
+            "reused": self.reused
+        }
+
+
+class PooledStream:
+    """줄 단위로 읽는 스트리밍 응답"""
+
+    def __init__(self, pool, key, conn, response, connect_time, start, reused):
+        self.status = response.status
+        self.headers = dict(response.getheaders())
+        self.connect_time = connect_time
+        self.reused = reused
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+        self._start = start
+        self._finished = False
+        self.first_byte_time = None
+
+    def iter_lines(self):
+        """응답 본문을 줄 단위로 반환 (줄바꿈 제거)"""
+        while True:
+            line = self._response.readline()
+            if not line:
+                break
+            if self.first_byte_time is None:
+                self.first_byte_time = time.perf_counter() - self._start
+            yield line.decode('utf-8').rstrip('\r\n')
+        # readline()은 Content-Length만큼 읽어도 응답을 닫지 않으므로 read()로 마무리해야 연결 재사용 가능
+        self._response.read()
+        self._finished = True
+
+    def read(self):
+        """남은 본문 전체 읽기"""
+        data = self._response.read()
+        self._finished = True
+        return data
+
+    def timing(self):
+        """밀리초 단위 소요 시간 (request_ms는 첫 바이트까지)"""
+        elapsed = self.first_byte_time if self.first_byte_time is not None else time.perf_counter() - self._start
+        return {
+            "connect_ms": round(self.connect_time * 1000, 1),
+            "request_ms": round(elapsed * 1000, 1),
+            "reused": self.reused
+        }
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._finished:
+            self._pool._finish(self._key, self._conn, self._response)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPConnectionPool:
+    """호스트별 유휴 연결을 보관하는 스레드 안전 커넥션 풀"""
+
+    def __init__(self, max_size=8, idle_timeout=60, connect_timeout=10, proxies=None):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        # {"https": 프록시 URL, "http": ..., "no": "제외 호스트,..."} (없으면 *_PROXY 환경 변수)
+        self.proxies = getproxies() if proxies is None else proxies
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _host_key(url):
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        return scheme, parts.hostname, port
+
+    def _proxy(self, key):
+        """호스트에 사용할 프록시 (호스트, 포트, 프록시 인증 헤더). 프록시가 없거나 NO_PROXY 대상이면 None"""
+        scheme, host, port = key
+        proxy_url = self.proxies.get(scheme)
+        if not proxy_url or proxy_bypass_environment(f'{host}:{port}', self.proxies):
+            return None
+        parts = urlsplit(proxy_url if '://' in proxy_url else f'http://{proxy_url}')
+        headers = {}
+        if parts.username:
+            credentials = f'{unquote(parts.username)}:{unquote(parts.password or "")}'
+            headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+        return parts.hostname, parts.port or 80, headers
+
+    def _new_connection(self, key):
+        scheme, host, port = key
+        proxy = self._proxy(key)
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        if proxy is None:
+            conn = cls(host, port, timeout=self.connect_timeout)
+        else:
+            proxy_host, proxy_port, proxy_headers = proxy
+            conn = cls(proxy_host, proxy_port, timeout=self.connect_timeout)
+            if scheme == 'https':
+                # CONNECT 터널 후 대상 호스트와 TLS (SNI/인증서 확인은 대상 호스트 기준)
+                conn.set_tunnel(host, port, headers=proxy_headers)
+        start = time.perf_counter()
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.created += 1
+        return conn, time.perf_counter() - start
+
+    def _acquire(self, key):
+        """유휴 연결 꺼내기 (없으면 None)"""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self.idle_timeout and not is_connection_dropped(conn):
+                    self.reused += 1
+                    return conn
+                conn.close()
+        return None
+
+    def _release(self, key, conn):
+        """연결 반납 (풀이 가득 차면 닫음)"""
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _send(self, method, url, body, headers, timeout):
+        """요청 전송 후 응답 헤더까지 수신
+
+        재사용 연결이 끊겨 있으면 1회 재시도: 요청을 다 보내지 못했으면(서버가 처리할 수 없음) 항상,
+        보낸 뒤 응답 전에 끊겼으면 멱등 메서드만
+        """
+        key = self._host_key(url)
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = dict(headers or {})
+        proxy = self._proxy(key)
+        if proxy is not None and key[0] == 'http':
+            path = url  # HTTP 프록시에는 절대 URL로 요청
+            headers.update(proxy[2])
+
+        conn = self._acquire(key)
+        reused = conn is not None
+        for attempt in range(2):
+            connect_time = 0.0
+            if conn is None:
+                conn, connect_time = self._new_connection(key)
+            conn.sock.settimeout(timeout)
+            start = time.perf_counter()
+            retry = reused and attempt == 0
+            try:
+                conn.request(method, path, body=body, headers=headers)
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                conn = None
+                if retry:
+                    reused = False
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            try:
+                response = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                conn = None
+                if retry and method.upper() in IDEMPOTENT_METHODS:
+                    reused = False
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            return key, conn, response, connect_time, start, reused
+
+    def _finish(self, key, conn, response):
+        """본문을 모두 읽은 연결은 풀에 반납"""
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    def request(self, method, url, body=None, headers=None, timeout=60):
+        """요청 전송 후 본문을 모두 읽고 연결을 풀에 반납"""
+        key, conn, response, connect_time, start, reused = self._send(method, url, body, headers, timeout)
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        request_time = time.perf_counter() - start
+        self._finish(key, conn, response)
+        return PooledResponse(
+            response.status, dict(response.getheaders()), data,
+            connect_time, request_time, reused
+        )
+
+    def stream(self, method, url, body=None, headers=None, timeout=60):
+        """스트리밍 응답 열기 (with 문으로 사용, 끝까지 읽으면 연결 재사용)"""
+        key, conn, response, connect_time, start, reused = self._send(method, url, body, headers, timeout)
+        return PooledStream(self, key, conn, response, connect_time, start, reused)
+
+    def warmup(self, url, count=1):
+        """지정 호스트로 미리 연결을 열어 풀에 보관"""
+        key = self._host_key(url)
+        for _ in range(min(count, self.max_size)):
+            try:
+                conn, _ = self._new_connection(key)
+            except OSError:
+                return
+            self._release(key, conn)
+
+    def close(self):
+        """모든 유휴 연결 닫기"""
+        with self._lock:
+            for idle in self._idle.values():
+                while idle:
+                    idle.pop()[0].close()
+            self._idle.clear()
+
+    def stats(self):
+        """연결 생성/재사용 통계"""
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": sum(len(idle) for idle in self._idle.values())
+            }
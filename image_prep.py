@@ -0,0 +1,124 @@
+"""
+이미지 전처리 - 비전 모델 업로드 전 축소 및 재인코딩
+EXIF 제거, 긴 변 길이 제한, JPEG/WebP 품질 조정으로 업로드 크기와 모델 지연을 줄임
+
+작업 프로세스는 spawn으로 시작하므로(스레드가 있는 프로세스의 fork는 교착 위험) 메인 모듈을 다시 불러옴.
+메인 모듈은 in_worker_process()로 확인해 DB 마이그레이션/색인 로드/백그라운드 작업 등 시작 작업을 건너뛰어야 함
+"""
+
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 미설치 시 전처리 생략
+    Image = None
+
+FORMAT_MIME_TYPES = {
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp',
+}
+
+# 원본을 그대로 돌려보내면 안 되는 메타데이터 (촬영 기기, GPS 위치 등)
+METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def in_worker_process():
+    """전처리 작업 프로세스 안인지 (spawn은 메인 모듈을 불러오기 전에 프로세스 이름을 설정함)"""
+    return multiprocessing.current_process().name != 'MainProcess'
+
+
+def has_metadata(img):
+    return any(img.info.get(key) for key in METADATA_KEYS) or len(img.getexif()) > 0
+
+
+def preprocess_image(image_bytes, max_edge=1280, image_format='JPEG', quality=85):
+    """이미지 축소 및 재인코딩. (이미지 바이트, MIME 타입) 반환
+
+    축소가 필요 없고 재인코딩해도 작아지지 않으면 원본 유지를 뜻하는 (None, 원본 MIME 타입) 반환
+    (EXIF 등 메타데이터가 없는 경우만, 작업 프로세스에서 원본을 다시 보내지 않음)
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        original_format = img.format
+        keep_original = not has_metadata(img)
+        img.draft('RGB', (max_edge, max_edge))  # JPEG는 디코딩 단계에서 축소
+        img = ImageOps.exif_transpose(img)  # 회전 정보 반영 후 EXIF 제거
+        resized = max(img.size) > max_edge
+        if resized:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        output = io.BytesIO()
+        if image_format == 'WEBP':
+            img.save(output, 'WEBP', quality=quality, method=4)
+        else:
+            img.save(output, 'JPEG', quality=quality, optimize=True)
+
+    data = output.getvalue()
+    if keep_original and not resized and len(data) >= len(image_bytes) and original_format in FORMAT_MIME_TYPES:
+        return None, FORMAT_MIME_TYPES[original_format]
+    return data, FORMAT_MIME_TYPES[image_format]
+
+
+class ImagePreprocessor:
+    """프로세스 풀에서 이미지 전처리 실행 (요청 스레드 CPU 점유 방지)"""
+
+    def __init__(self, max_edge=1280, image_format='JPEG', quality=85, workers=2, timeout=30):
+        self.max_edge = max_edge
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = None
+
+    @property
+    def available(self):
+        return Image is not None and self.image_format in FORMAT_MIME_TYPES
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def process(self, image_bytes, mime_type):
+        """전처리 실행. (이미지 바이트, MIME 타입, 통계) 반환
+
+        원본을 유지하면(재인코딩 이득 없음/실패) 전달받은 이미지 바이트를 그대로 돌려주고 통계의 reencoded는 False
+        """
+        start = time.perf_counter()
+        args = (image_bytes, self.max_edge, self.image_format, self.quality)
+        try:
+            if self.workers > 0:
+                data, new_mime = self._get_executor().submit(preprocess_image, *args).result(self.timeout)
+            else:
+                data, new_mime = preprocess_image(*args)
+        except BrokenProcessPool:
+            self._executor = None
+            data, new_mime = None, mime_type
+        except Exception:
+            data, new_mime = None, mime_type
+        reencoded = data is not None
+        if not reencoded:
+            data = image_bytes
+
+        stats = {
+            "reencoded": reencoded,
+            "original_bytes": len(image_bytes),
+            "processed_bytes": len(data),
+            "bytes_saved": len(image_bytes) - len(data),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        return data, new_mime, stats
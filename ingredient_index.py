@@ -0,0 +1,203 @@
+"""
+재료 역색인 - 감지된 재료로 만들 수 있는 저장 레시피 찾기
+재료 이름 → 레시피 id 역색인과 레시피별 재료 비트셋으로 보유율/부족 재료 수를 계산
+
+인덱스는 프로세스 메모리에 사용자 단위로 지연 로드되며 저장/삭제 시 증분 갱신됨
+다른 워커 프로세스의 변경은 ttl 경과 후 다시 로드할 때 반영, 최근 조회한 max_users명만 메모리에 유지
+"""
+
+import heapq
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from ingredient_names import canonical_key
+
+
+def canonical_ingredient(name):
+    """재료 비교 키 (표준 이름 기준, 공백 제거, 소문자)"""
+    return canonical_key(name)
+
+
+def recipe_ingredient_names(recipe_data):
+    """레시피 JSON의 ingredients 항목(문자열 또는 {"name"} 객체)에서 정규화된 재료 이름 목록"""
+    try:
+        recipe = json.loads(recipe_data) if isinstance(recipe_data, str) else recipe_data
+    except ValueError:
+        return []
+    items = recipe.get('ingredients') if isinstance(recipe, dict) else None
+    names = []
+    for item in items if isinstance(items, list) else []:
+        name = canonical_ingredient(item.get('name') if isinstance(item, dict) else item)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def popcount(value):
+    return bin(value).count('1')
+
+
+class _UserIndex:
+    """사용자 한 명의 레시피 역색인"""
+
+    __slots__ = ('postings', 'recipes', 'loaded_at')
+
+    def __init__(self):
+        self.postings = {}  # 재료 비트 위치 -> 레시피 id 집합
+        self.recipes = {}  # 레시피 id -> (이름, 재료 비트셋, 재료 수)
+        self.loaded_at = time.monotonic()
+
+
+class IngredientIndex:
+    """사용자(또는 임의 범위)별 재료 역색인 + 레시피별 재료 비트셋"""
+
+    def __init__(self, ttl=300, max_users=1000):
+        self.ttl = ttl  # 사용자 인덱스를 DB에서 다시 로드하는 주기 (초)
+        self.max_users = max_users  # 유지할 최대 사용자(범위) 수, 가장 오래 쓰지 않은 사용자부터 제거 (None이면 무제한)
+        self._bits = {}  # 재료 이름 -> 비트 위치 (전체 사용자 공용)
+        self._names = []  # 비트 위치 -> 재료 이름
+        self._users = OrderedDict()  # 최근 사용 순
+        self._lock = threading.Lock()
+
+    def _bit(self, name):
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = len(self._names)
+            self._bits[name] = bit
+            self._names.append(name)
+        return bit
+
+    def _mask(self, names, create):
+        mask = 0
+        for name in names:
+            bit = self._bit(name) if create else self._bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    @staticmethod
+    def _bits_of(mask):
+        """설정된 비트 위치 (최하위 비트부터)"""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _user(self, scope):
+        """사용자 인덱스 조회 후 최근 사용으로 표시 (잠금 안에서 호출)"""
+        user = self._users.get(scope)
+        if user is not None:
+            self._users.move_to_end(scope)
+        return user
+
+    def _store(self, scope, user):
+        """사용자 인덱스 저장 후 max_users를 넘으면 가장 오래 쓰지 않은 사용자 제거 (잠금 안에서 호출)"""
+        self._users[scope] = user
+        self._users.move_to_end(scope)
+        if self.max_users is not None:
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def _add(self, user, recipe_id, name, ingredients):
+        mask = self._mask(ingredients, create=True)
+        user.recipes[recipe_id] = (name, mask, popcount(mask))
+        for bit in self._bits_of(mask):
+            user.postings.setdefault(bit, set()).add(recipe_id)
+
+    def load_user(self, db, user_id):
+        """사용자의 저장 레시피로 인덱스 구성 (ttl 이내에 이미 로드했으면 생략)
+
+        조회부터 교체까지 잠금을 유지해, 그 사이의 add()/remove()가 교체될 이전 인덱스에만 반영되어 사라지지 않게 함
+        (대기한 add()/remove()는 교체 후 새 인덱스에 적용되며 같은 레시피를 다시 추가/제거해도 결과는 같음)
+        """
+        with self._lock:
+            user = self._user(user_id)
+            if user is not None and time.monotonic() - user.loaded_at < self.ttl:
+                return
+            rows = db.execute(
+                'SELECT id, recipe_name, recipe_data FROM saved_recipes WHERE user_id = ?', (user_id,)
+            ).fetchall()
+            self._load(user_id, rows)
+
+    def load(self, scope, rows):
+        """(id, 이름, 레시피 JSON) 목록으로 scope(사용자 id 등)의 인덱스를 교체"""
+        with self._lock:
+            self._load(scope, rows)
+
+    def _load(self, scope, rows):
+        user = _UserIndex()
+        for recipe_id, name, recipe_data in rows:
+            self._add(user, recipe_id, name, recipe_ingredient_names(recipe_data))
+        self._store(scope, user)
+
+    def add(self, user_id, recipe_id, name, recipe_data, create=False):
+        """레시피 저장 시 증분 추가 (아직 로드하지 않은 사용자는 첫 조회 때 로드, create=True면 새로 생성)"""
+        ingredients = recipe_ingredient_names(recipe_data)
+        with self._lock:
+            user = self._user(user_id)
+            if user is None and create:
+                user = _UserIndex()
+                self._store(user_id, user)
+            if user is not None:
+                self._add(user, recipe_id, name, ingredients)
+
+    def remove(self, user_id, recipe_id):
+        """레시피 삭제 시 증분 제거"""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None or recipe_id not in user.recipes:
+                return
+            _, mask, _ = user.recipes.pop(recipe_id)
+            for bit in self._bits_of(mask):
+                posting = user.postings.get(bit)
+                if posting is not None:
+                    posting.discard(recipe_id)
+                    if not posting:
+                        del user.postings[bit]
+
+    def match(self, user_id, ingredients, limit=10, max_missing=None):
+        """보유 재료로 만들 수 있는 레시피 목록 (부족 재료 적은 순, 보유율 높은 순)"""
+        query = [canonical_ingredient(name) for name in ingredients]
+        with self._lock:
+            user = self._user(user_id)
+            if user is None:
+                return []
+            query_mask = self._mask(query, create=False)
+
+            # 역색인 목록을 합쳐 레시피별 보유 재료 수 계산 (Counter.update는 C 루프)
+            have = Counter()
+            for bit in self._bits_of(query_mask):
+                have.update(user.postings.get(bit, ()))
+
+            recipes = user.recipes
+
+            def missing(recipe_id):
+                return recipes[recipe_id][2] - have[recipe_id]
+
+            def rank(recipe_id):
+                total = recipes[recipe_id][2]
+                return total - have[recipe_id], -have[recipe_id] / total, -recipe_id
+
+            candidates = have if max_missing is None else [r for r in have if missing(r) <= max_missing]
+            results = []
+            for recipe_id in heapq.nsmallest(limit, candidates, key=rank):
+                name, mask, total = recipes[recipe_id]
+                results.append({
+                    "id": recipe_id,
+                    "name": name,
+                    "coverage": round(have[recipe_id] / total, 3),
+                    "missing_count": missing(recipe_id),
+                    "matched": [self._names[b] for b in self._bits_of(mask & query_mask)],
+                    "missing": [self._names[b] for b in self._bits_of(mask & ~query_mask)]
+                })
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "recipes": sum(len(u.recipes) for u in self._users.values()),
+                "ingredients": len(self._names)
+            }
@@ -0,0 +1,148 @@
+"""
+재료 이름 정규화 - 모델 출력/사용자 입력의 재료 이름을 하나의 표준 이름으로 통일
+"계란", "달걀", "계란 (10개)", "Eggs"가 모두 "계란"이 되도록 NFKC 정규화, 괄호/분량 제거 후
+동의어 사전(data/ingredient_synonyms.json)에서 표준 이름을 찾음
+
+재료 추출, 레시피 캐시 키, 재료 통계, 재료 역색인이 모두 같은 정규화를 사용
+"""
+
+import json
+import os
+import re
+import unicodedata
+
+DEFAULT_SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ingredient_synonyms.json')
+
+# "돼지고기 200g", "간장 (2큰술)", "2 eggs", "- 양파" 등에서 목록 기호/괄호/분량 제거
+_BULLET = re.compile(r'^[\-\*•·]+\s*')
+_PARENTHESES = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_AMOUNT = r'[\d./⁄½¼¾~\-]+[a-zA-Z가-힣]{0,3}'  # 단위는 숫자에 붙어 있어야 함 ("½ 팽이"의 재료명 보호)
+_QUANTITY_SUFFIX = re.compile(rf'(\s*{_AMOUNT}|\s+(약간|적당량|조금|한줌|소량))$')
+_QUANTITY_PREFIX = re.compile(rf'^{_AMOUNT}\s+')
+_SPACES = re.compile(r'\s+')
+
+
+def _clean_once(name):
+    name = _PARENTHESES.sub(' ', _BULLET.sub('', name.strip())).split(':')[0].strip()
+    name = _QUANTITY_PREFIX.sub('', _QUANTITY_SUFFIX.sub('', name))
+    return _SPACES.sub(' ', name).strip(' ,."\'')
+
+
+def clean_ingredient(name):
+    """표시용 정리 (NFKC, 괄호/분량 제거, 공백 하나로). 동의어는 적용하지 않음
+
+    분량이 여러 개 붙은 이름("소금 1 2")도 한 번에 정리되도록 더 바뀌지 않을 때까지 반복
+    (정리 결과를 다시 정리해도 같아야 표준 이름이 DB 키로 안정적)
+    """
+    if not isinstance(name, str):
+        return ''
+    name = unicodedata.normalize('NFKC', name)
+    while True:
+        cleaned = _clean_once(name)
+        if cleaned == name:
+            return cleaned
+        name = cleaned
+
+
+def compact(name):
+    """비교 키 (공백 제거, 소문자)"""
+    return _SPACES.sub('', name).lower()
+
+
+class IngredientCanonicalizer:
+    """동의어 사전(비교 키 → 표준 이름 해시맵) 기반 정규화기. 결과는 입력 문자열 단위로 메모이제이션"""
+
+    def __init__(self, synonyms=None, memo_size=50000):
+        self.memo_size = memo_size
+        self._canonical = {}  # 비교 키 -> 표준 이름
+        self._memo = {}  # 원본 문자열 -> 표준 이름
+        for canonical, aliases in (synonyms or {}).items():
+            self.add(canonical, aliases)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """{"표준 이름": ["동의어", ...]} 형식의 JSON 파일에서 생성 (파일이 없으면 빈 사전)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                synonyms = json.load(f)
+        except (OSError, ValueError):
+            synonyms = {}
+        return cls(synonyms, **kwargs)
+
+    def add(self, canonical, aliases=()):
+        """표준 이름과 동의어 등록"""
+        canonical = clean_ingredient(canonical)
+        if not canonical:
+            return
+        for alias in (canonical, *aliases):
+            key = compact(clean_ingredient(alias))
+            if key:
+                self._canonical[key] = canonical
+        self._memo.clear()
+
+    def _lookup(self, key):
+        canonical = self._canonical.get(key)
+        # 영어 복수형 (eggs, tomatoes)
+        if canonical is None and key.isascii() and key.endswith('s'):
+            canonical = self._canonical.get(key[:-1])
+            if canonical is None and key.endswith('es'):
+                canonical = self._canonical.get(key[:-2])
+        return canonical
+
+    def canonicalize(self, name):
+        """표준 이름 (사전에 없으면 정리된 이름, 빈 문자열이면 재료 아님)"""
+        if not isinstance(name, str):
+            return ''
+        result = self._memo.get(name)
+        if result is None:
+            cleaned = clean_ingredient(name)
+            result = self._lookup(compact(cleaned)) or cleaned
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[name] = result
+        return result
+
+    def key(self, name):
+        """표준 이름의 비교 키 (캐시 키/역색인용)"""
+        return compact(self.canonicalize(name))
+
+    def canonicalize_all(self, names):
+        """표준 이름 목록 (순서 유지, 중복/빈 이름 제거)"""
+        seen = set()
+        result = []
+        for name in names:
+            canonical = self.canonicalize(name)
+            key = compact(canonical)
+            if key and key not in seen:
+                seen.add(key)
+                result.append(canonical)
+        return result
+
+    def stats(self):
+        return {"synonyms": len(self._canonical), "memo": len(self._memo)}
+
+
+_default = None
+
+
+def configure(path=DEFAULT_SYNONYMS_PATH, **kwargs):
+    """모듈 함수가 사용할 기본 정규화기 교체"""
+    global _default
+    _default = IngredientCanonicalizer.from_file(path, **kwargs)
+    return _default
+
+
+def default_canonicalizer():
+    return _default if _default is not None else configure()
+
+
+def canonical_name(name):
+    return default_canonicalizer().canonicalize(name)
+
+
+def canonical_key(name):
+    return default_canonicalizer().key(name)
+
+
+def canonical_names(names):
+    return default_canonicalizer().canonicalize_all(names)
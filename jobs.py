@@ -0,0 +1,202 @@
+"""
+비동기 작업 큐 - 오래 걸리는 분석/레시피 생성을 워커 스레드에서 실행
+작업은 SQLite에 저장되어 서버 재시작 후에도 이어서 처리됨
+
+여러 프로세스가 같은 DB를 쓸 수 있도록 작업은 queued → running 조건부 UPDATE로 한 워커만 가져가고,
+실행 중인 작업은 lease초마다 updated_at을 갱신함. 갱신이 끊긴(프로세스가 죽은) running 작업만 다시 대기열로
+"""
+
+import json
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+
+class JobQueue:
+    """SQLite 영구 저장 + 제한된 워커 풀 작업 큐 (jobs 테이블은 migrations.py에서 생성)"""
+
+    def __init__(self, pool, workers=4, max_pending=100, retention=86400, lease=120):
+        self.pool = pool  # database.ConnectionPool (행을 이름으로 읽으므로 sqlite3.Row 사용)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention  # 완료 작업 보관 기간 (초)
+        self.lease = lease  # 실행 중 작업의 updated_at이 이보다 오래되면 실행 프로세스가 죽은 것으로 봄 (초)
+        self._handlers = {}
+        self._queue = queue.Queue()
+        self._changed = threading.Condition()
+        self._running = set()  # 이 프로세스가 실행 중인 작업 ID
+        self._running_lock = threading.Lock()
+        self._started = False
+
+    def register(self, kind, handler):
+        """작업 종류별 처리 함수 등록: handler(payload, user_id) -> 결과 dict"""
+        self._handlers[kind] = handler
+
+    def start(self):
+        """대기 중이거나 임대가 만료된 작업을 대기열에 넣고 워커/임대 갱신 스레드 시작"""
+        if self._started:
+            return
+        self._started = True
+        with self.pool.connection() as db:
+            db.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?',
+                (STATUS_DONE, STATUS_FAILED, time.time() - self.retention)
+            )
+            db.commit()
+        self._requeue_expired()
+        with self.pool.connection() as db:
+            rows = db.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (STATUS_QUEUED,)
+            ).fetchall()
+        for row in rows:
+            self._queue.put(row['id'])
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True).start()
+        threading.Thread(target=self._heartbeat, name='job-lease', daemon=True).start()
+
+    def _requeue_expired(self):
+        """임대가 만료된 running 작업을 queued로 되돌리고 이 프로세스 대기열에 추가"""
+        now = time.time()
+        with self.pool.connection() as db:
+            rows = db.execute(
+                'SELECT id FROM jobs WHERE status = ? AND updated_at < ?',
+                (STATUS_RUNNING, now - self.lease)
+            ).fetchall()
+            requeued = []
+            for row in rows:
+                cursor = db.execute(
+                    'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ? AND updated_at < ?',
+                    (STATUS_QUEUED, now, row['id'], STATUS_RUNNING, now - self.lease)
+                )
+                if cursor.rowcount == 1:
+                    requeued.append(row['id'])
+            db.commit()
+        for job_id in requeued:
+            self._queue.put(job_id)
+
+    def _heartbeat(self):
+        """실행 중인 작업의 임대를 갱신하고 다른 프로세스가 놓친 작업을 회수"""
+        while True:
+            time.sleep(self.lease / 3)
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                if running:
+                    with self.pool.connection() as db:
+                        db.executemany(
+                            'UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ?',
+                            [(time.time(), job_id, STATUS_RUNNING) for job_id in running]
+                        )
+                        db.commit()
+                self._requeue_expired()
+            except sqlite3.Error:
+                pass
+
+    def submit(self, kind, payload, user_id=None):
+        """작업 등록 후 작업 ID 반환 (대기열이 가득 차면 None)"""
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류: {kind}")
+        if self._queue.qsize() >= self.max_pending:
+            return None
+
+        job_id = secrets.token_hex(16)
+        now = time.time()
+        with self.pool.connection() as db:
+            db.execute(
+                'INSERT INTO jobs (id, kind, user_id, status, payload, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, user_id, STATUS_QUEUED, json.dumps(payload, ensure_ascii=False), now, now)
+            )
+            db.commit()
+        self._queue.put(job_id)
+        return job_id
+
+    def get(self, job_id):
+        """작업 상태 조회 (없으면 None)"""
+        with self.pool.connection() as db:
+            row = db.execute(
+                'SELECT id, kind, user_id, status, result, error, created_at, updated_at '
+                'FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def wait(self, timeout):
+        """작업 상태 변경 알림 대기"""
+        with self._changed:
+            self._changed.wait(timeout)
+
+    def pending(self):
+        """대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def _update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f'{name} = ?' for name in fields)
+        with self.pool.connection() as db:
+            db.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+            db.commit()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except sqlite3.Error:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _claim(self, job_id):
+        """queued 작업을 running으로 바꿔 가져옴. 다른 워커/프로세스가 먼저 가져갔으면 None"""
+        with self.pool.connection() as db:
+            cursor = db.execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?',
+                (STATUS_RUNNING, time.time(), job_id, STATUS_QUEUED)
+            )
+            db.commit()
+            if cursor.rowcount != 1:
+                return None
+            return db.execute(
+                'SELECT kind, user_id, payload FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+
+    def _run(self, job_id):
+        row = self._claim(job_id)
+        if row is None:
+            return
+        with self._changed:
+            self._changed.notify_all()
+
+        with self._running_lock:
+            self._running.add(job_id)
+        try:
+            handler = self._handlers.get(row['kind'])
+            try:
+                if handler is None:
+                    raise ValueError(f"등록되지 않은 작업 종류: {row['kind']}")
+                result = handler(json.loads(row['payload']), row['user_id'])
+            except Exception as e:
+                self._update(job_id, status=STATUS_FAILED, error=str(e), payload=None)
+                return
+            self._update(
+                job_id, status=STATUS_DONE,
+                result=json.dumps(result, ensure_ascii=False), payload=None
+            )
+        finally:
+            with self._running_lock:
+                self._running.discard(job_id)
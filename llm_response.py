@@ -0,0 +1,197 @@
+"""
+LLM 응답 파서 - 모델 응답 텍스트에서 첫 번째 완전한 최상위 JSON 값을 앞에서부터 한 번 훑어 찾음
+여는 괄호 위치에서 바로 JSON 디코딩(raw_decode, 값이 끝나는 위치에서 멈춤)을 시도하고,
+실패한 후보는 괄호 균형/문자열 이스케이프를 추적해 닫히는 위치까지 건너뜀
+정규식 탐색(탐욕적 \\{[\\s\\S]*\\}, 비탐욕적 \\[.*?\\])과 달리 중첩 배열, 문자열 안의 괄호,
+앞뒤 설명문의 괄호에도 정확하며 긴 응답에서 되돌아가기(backtracking)가 없음
+
+<think>...</think> 추론 블록(deepseek-r1 등)은 건너뛰고, 마크다운 코드 펜스(```json)는 괄호가 아니므로
+스캔에 영향을 주지 않음
+
+출력 토큰 한도 등으로 중간에 잘린 JSON은 salvage_json으로 열린 문자열/배열/객체를 닫아 복구
+"""
+
+import json
+import re
+import threading
+
+# 후보 시작 위치 탐색: 추론 블록 또는 여는 괄호
+_START = re.compile(r'<think>|[{\[]', re.IGNORECASE)
+_THINK_END = re.compile(r'</think>', re.IGNORECASE)
+# 후보 안에서 구조에 영향을 주는 문자
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRUCTURE_OR_COMMA = re.compile(r'[{}\[\]",]')
+# 여는 따옴표 다음부터 닫는 따옴표까지 (이스케이프 처리, unrolled loop로 선형)
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_THINK_BLOCK = re.compile(r'<think>.*?(?:</think>|$)', re.IGNORECASE | re.DOTALL)
+
+_CLOSERS = {'{': '}', '[': ']'}
+_DECODER = json.JSONDecoder(strict=False)  # 문자열 안의 줄바꿈 허용
+
+MAX_CANDIDATES = 16  # 파싱에 실패한 후보가 이만큼 쌓이면 중단 (최악의 경우 선형 유지)
+MAX_REPAIR_CUTS = 8  # 잘린 JSON 복구 시 마지막 원소부터 잘라 보는 최대 횟수
+
+
+def scan_value(text, start):
+    """text[start]의 여는 괄호부터 균형이 맞는 끝 위치를 찾음
+
+    (끝 위치, 열린 괄호 스택, 문자열 안 여부) 반환. 닫히기 전에 텍스트가 끝나면 끝 위치는 None,
+    괄호 짝이 맞지 않으면 (-1, ...)
+    """
+    stack = [text[start]]
+    pos = start + 1
+    while True:
+        match = _STRUCTURE.search(text, pos)
+        if match is None:
+            return None, stack, False
+        c = match.group()
+        pos = match.end()
+        if c == '"':
+            body = _STRING_BODY.match(text, pos)
+            if body is None:
+                return None, stack, True
+            pos = body.end()
+        elif c in _CLOSERS:
+            stack.append(c)
+        elif _CLOSERS[stack[-1]] != c:
+            return -1, stack, False
+        else:
+            stack.pop()
+            if not stack:
+                return pos, stack, False
+
+
+def next_opener(text, pos, openers='{['):
+    """pos 이후 추론 블록 밖의 첫 여는 괄호 위치 (없으면 -1)
+
+    닫히지 않은 추론 블록은 응답이 잘린 경우이므로 그 안에서 계속 찾음
+    """
+    while True:
+        match = _START.search(text, pos)
+        if match is None:
+            return -1
+        token = match.group()
+        if token in _CLOSERS:
+            if token in openers:
+                return match.start()
+            pos = match.end()
+            continue
+        end = _THINK_END.search(text, match.end())
+        pos = end.end() if end is not None else match.end()
+
+
+def first_json(text, openers='{[', accept=None):
+    """첫 번째로 파싱되는(그리고 accept(value)를 만족하는) 최상위 JSON 값. 없으면 None"""
+    if not isinstance(text, str):
+        return None
+    pos = 0
+    for _ in range(MAX_CANDIDATES):
+        start = next_opener(text, pos, openers)
+        if start < 0:
+            return None
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except (ValueError, RecursionError):
+            # JSON이 아닌 괄호 구간("{파전}")이나 디코더 재귀 한도를 넘는 깊은 중첩은 통째로,
+            # 짝이 안 맞거나 잘렸으면 한 글자만 건너뜀 (scan_value는 반복문이라 깊이 제한 없음)
+            end, _, _ = scan_value(text, start)
+        else:
+            if accept is None or accept(value):
+                return value
+        pos = end if end is not None and end > 0 else start + 1
+    return None
+
+
+def _closing(stack):
+    return ''.join(_CLOSERS[c] for c in reversed(stack))
+
+
+def repair_candidates(text, start):
+    """text[start]에서 시작해 끝까지 닫히지 않은 JSON을 닫은 후보 문자열들 (그대로 닫기 → 뒤 원소부터 제거)
+
+    이미 균형이 맞거나 괄호 짝이 틀리면 빈 목록
+    """
+    stack = [text[start]]
+    commas = []  # (쉼표 위치, 그 시점의 열린 괄호)
+    pos = start + 1
+    in_string = False
+    while True:
+        match = _STRUCTURE_OR_COMMA.search(text, pos)
+        if match is None:
+            break
+        c = match.group()
+        pos = match.end()
+        if c == '"':
+            body = _STRING_BODY.match(text, pos)
+            if body is None:
+                in_string = True
+                break
+            pos = body.end()
+        elif c == ',':
+            commas.append((match.start(), tuple(stack)))
+        elif c in _CLOSERS:
+            stack.append(c)
+        elif _CLOSERS[stack[-1]] != c:
+            return []
+        else:
+            stack.pop()
+            if not stack:
+                return []
+
+    body = text[start:].rstrip()
+    if in_string:
+        # 잘린 이스케이프(\, \u12)는 버리고 문자열 닫기
+        body = re.sub(r'\\(u[0-9a-fA-F]{0,3})?$', '', body) + '"'
+    candidates = [body.rstrip(',: \t\r\n') + _closing(stack)]
+    for comma, comma_stack in reversed(commas[-MAX_REPAIR_CUTS:]):
+        candidates.append(text[start:comma] + _closing(comma_stack))
+    return candidates
+
+
+def salvage_json(text, openers='{[', accept=None):
+    """끝까지 닫히지 않은(잘린) 첫 JSON 값을 닫아서 복구. 복구할 후보가 없으면 None"""
+    if not isinstance(text, str):
+        return None
+    pos = 0
+    for _ in range(MAX_CANDIDATES):
+        start = next_opener(text, pos, openers)
+        if start < 0:
+            return None
+        for candidate in repair_candidates(text, start):
+            try:
+                value = _DECODER.decode(candidate)
+            except (ValueError, RecursionError):
+                continue
+            if accept is None or accept(value):
+                return value
+        # 앞쪽 설명문의 닫히지 않은 괄호("{괄호")면 다음 여는 괄호에서 다시 시도
+        pos = start + 1
+    return None
+
+
+class SalvageStats:
+    """잘린 응답 복구 통계 (repaired: 다음 모델 호출 없이 복구해서 사용, escalated: 다음 모델로 넘김)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.truncated = 0
+        self.repaired = 0
+
+    def record(self, repaired):
+        with self._lock:
+            self.truncated += 1
+            self.repaired += bool(repaired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "truncated": self.truncated,
+                "repaired": self.repaired,
+                "escalated": self.truncated - self.repaired,
+                "repair_rate": round(self.repaired / self.truncated, 3) if self.truncated else None
+            }
+
+
+def strip_think(text):
+    """추론 블록을 제거한 본문 (텍스트 기반 대체 파서용)"""
+    return _THINK_BLOCK.sub('', text) if '<' in text else text
@@ -0,0 +1,322 @@
+"""
+Smart Recipe 부하 테스트 - 가상 사용자 N명이 각자 세션으로 혼합 워크로드를 동시에 실행
+health_check.py의 API 호출 방식을 가상 사용자별 쿠키 세션으로 확장하고, 램프업 일정과 로컬 이미지를 사용해
+엔드포인트별 p50/p95/p99 지연, 처리량, 오류 분류를 JSON 보고서로 저장
+
+사용법: python load_test.py [--users 20] [--duration 60] [--ramp-up 10] [--ramp 0:2,20:10,40:20]
+                           [--mix analyze=1,recipe=2,save=1,list=3,stats=2,login=0.5]
+                           [--images 이미지 폴더] [--output load_report.json] [--compare 이전 보고서.json]
+오프라인 실행: mock_openrouter.py를 띄우고 앱을 OPENROUTER_BASE_URL로 연결한 뒤 실행
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import random
+import struct
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import zlib
+from collections import Counter, defaultdict
+from http.cookiejar import CookieJar
+
+DEFAULT_MIX = {"analyze": 1, "recipe": 2, "save": 1, "list": 3, "stats": 2, "login": 0.5}
+TIMEOUTS = {"analyze": 120, "recipe": 120}
+INGREDIENTS = ['계란', '양파', '대파', '당근', '감자', '두부', '김치', '돼지고기', '애호박', '우유', '치즈', '토마토']
+PASSWORD = 'loadtest1234'
+
+
+def synthetic_png(seed, size=64, block=8):
+    """무작위 색 블록으로 채운 PNG (이미지 캐시가 적중하지 않도록 시드마다 다름)"""
+    rng = random.Random(seed)
+    colors = [[tuple(rng.randrange(256) for _ in range(3)) for _ in range(size // block)] for _ in range(size // block)]
+    rows = b''.join(
+        b'\x00' + b''.join(bytes(colors[y // block][x // block]) for x in range(size))
+        for y in range(size)
+    )
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+def load_images(directory, count):
+    """폴더의 이미지 파일을 data URL로 (폴더가 없으면 합성 PNG count개)"""
+    mime_types = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.webp': 'image/webp'}
+    images = []
+    if directory and os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            mime = mime_types.get(os.path.splitext(name)[1].lower())
+            if mime:
+                with open(os.path.join(directory, name), 'rb') as f:
+                    images.append(f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}")
+    if not images:
+        images = [
+            f"data:image/png;base64,{base64.b64encode(synthetic_png(seed)).decode('ascii')}"
+            for seed in range(count)
+        ]
+    return images
+
+
+def parse_weights(text):
+    """"analyze=1,recipe=2" → {"analyze": 1.0, "recipe": 2.0}"""
+    weights = {}
+    for part in text.split(','):
+        if part.strip():
+            name, _, weight = part.partition('=')
+            if name.strip() not in DEFAULT_MIX:
+                raise ValueError(f"알 수 없는 작업: {name}")
+            weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def start_times(users, ramp_up, ramp=None):
+    """가상 사용자별 시작 시각 (초). ramp "0:2,20:10"은 0초에 2명, 20초까지 10명이 되도록 단계적으로 추가"""
+    if not ramp:
+        return [ramp_up * i / users if users > 1 else 0 for i in range(users)]
+    steps = sorted((float(t), int(n)) for t, n in (part.split(':') for part in ramp.split(',') if part.strip()))
+    times = []
+    previous_time, previous_count = 0.0, 0
+    for at, count in steps:
+        # 이전 단계 시각부터 이 단계 시각까지 균등하게 추가
+        added = max(0, count - previous_count)
+        for i in range(added):
+            times.append(previous_time + (at - previous_time) * (i + 1) / added if previous_count else at)
+        previous_time, previous_count = at, max(previous_count, count)
+    return times
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))  # nearest-rank
+    return sorted_values[index]
+
+
+class Recorder:
+    """작업별 지연/오류 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, operation, elapsed, error=None):
+        with self._lock:
+            self.latencies[operation].append(elapsed)
+            if error:
+                self.errors[operation][error] += 1
+
+    def report(self, duration):
+        operations = {}
+        with self._lock:
+            for operation, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                errors = sum(self.errors[operation].values())
+                operations[operation] = {
+                    "count": len(values),
+                    "errors": errors,
+                    "error_rate": round(errors / len(values), 4),
+                    "throughput_rps": round(len(values) / duration, 3),
+                    "mean_ms": round(sum(values) / len(values) * 1000, 1),
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1),
+                    "max_ms": round(values[-1] * 1000, 1),
+                }
+            errors = {op: dict(counter) for op, counter in self.errors.items() if counter}
+        total = sum(o['count'] for o in operations.values())
+        failed = sum(o['errors'] for o in operations.values())
+        return {
+            "duration_s": round(duration, 2),
+            "requests": total,
+            "errors": failed,
+            "error_rate": round(failed / total, 4) if total else None,
+            "throughput_rps": round(total / duration, 3) if duration else None,
+            "operations": operations,
+            "error_breakdown": errors,
+        }
+
+
+class VirtualUser:
+    """자기 쿠키 세션을 가진 가상 사용자"""
+
+    def __init__(self, index, base_url, recorder, images, rng):
+        self.index = index
+        self.base_url = base_url
+        self.recorder = recorder
+        self.images = images
+        self.rng = rng
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        self.email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        self.ingredients = None
+        self.recipe = None
+
+    def api_call(self, operation, method, endpoint, data=None):
+        """API 호출 후 (응답 JSON 또는 None) 반환, 지연/오류 기록"""
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+        request = urllib.request.Request(
+            f"{self.base_url}{endpoint}", body, {"Content-Type": "application/json"}, method=method
+        )
+        start = time.monotonic()
+        error = None
+        result = None
+        try:
+            with self.opener.open(request, timeout=TIMEOUTS.get(operation, 30)) as response:
+                result = json.loads(response.read().decode('utf-8'))
+            if isinstance(result, dict) and result.get('success') is False:
+                error = 'app_error'
+        except urllib.error.HTTPError as e:
+            e.read()
+            error = f"http_{e.code}"
+        except (TimeoutError, OSError) as e:
+            reason = getattr(e, 'reason', e)
+            error = 'timeout' if isinstance(reason, TimeoutError) or 'timed out' in str(reason) else 'connection'
+        except ValueError:
+            error = 'invalid_json'
+        self.recorder.record(operation, time.monotonic() - start, error)
+        return result if error is None else None
+
+    def register(self):
+        self.api_call('register', 'POST', '/api/auth/register', {
+            "email": self.email, "password": PASSWORD, "nickname": f"부하{self.index}"
+        })
+
+    def login(self):
+        self.api_call('login', 'POST', '/api/auth/login', {"email": self.email, "password": PASSWORD})
+
+    def analyze(self):
+        result = self.api_call('analyze', 'POST', '/api/analyze', {"image": self.rng.choice(self.images)})
+        if result and result.get('ingredients'):
+            self.ingredients = result['ingredients']
+
+    def recipe_request(self):
+        ingredients = self.ingredients or self.rng.sample(INGREDIENTS, self.rng.randint(2, 5))
+        result = self.api_call('recipe', 'POST', '/api/recipe', {
+            "ingredients": ingredients,
+            "cuisine": self.rng.choice(['한식', '양식', '상관없음']),
+            "difficulty": '초급',
+            "cookTime": '30분 이내',
+            "servings": 2
+        })
+        if result and result.get('recipe'):
+            self.recipe = result['recipe']
+
+    def save(self):
+        recipe = self.recipe or {
+            "name": "부하 테스트 레시피",
+            "ingredients": [{"name": name, "amount": "1개"} for name in self.rng.sample(INGREDIENTS, 3)],
+            "steps": ["재료를 손질합니다.", "볶습니다."],
+        }
+        self.api_call('save', 'POST', '/api/recipes/save', {"recipe": recipe, "tags": ["부하테스트"]})
+
+    def list_recipes(self):
+        self.api_call('list', 'GET', '/api/recipes')
+
+    def stats(self):
+        self.api_call('stats', 'GET', '/api/history/stats')
+
+    def run(self, mix, deadline, think_time):
+        self.register()
+        self.login()
+        actions = {
+            "analyze": self.analyze, "recipe": self.recipe_request, "save": self.save,
+            "list": self.list_recipes, "stats": self.stats, "login": self.login,
+        }
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        while time.monotonic() < deadline:
+            actions[self.rng.choices(names, weights)[0]]()
+            if think_time > 0:
+                time.sleep(min(self.rng.expovariate(1 / think_time), max(0, deadline - time.monotonic())))
+
+
+def compare(report, baseline):
+    """이전 보고서 대비 작업별 p95/처리량 변화 출력"""
+    print("\n📊 이전 보고서 대비")
+    for operation, current in report['operations'].items():
+        previous = baseline.get('operations', {}).get(operation)
+        if not previous:
+            continue
+        p95_change = (current['p95_ms'] / previous['p95_ms'] - 1) * 100 if previous['p95_ms'] else 0
+        rps_change = (current['throughput_rps'] / previous['throughput_rps'] - 1) * 100 if previous['throughput_rps'] else 0
+        print(f"   {operation:<8} p95 {previous['p95_ms']:>9.1f} → {current['p95_ms']:>9.1f}ms ({p95_change:+.1f}%)"
+              f"   처리량 {previous['throughput_rps']:.2f} → {current['throughput_rps']:.2f}/s ({rps_change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=60, help='전체 실행 시간 (초, 램프업 포함)')
+    parser.add_argument('--ramp-up', type=float, default=10, help='--users명을 균등하게 투입하는 시간 (초)')
+    parser.add_argument('--ramp', help='단계별 램프업 "시각:누적 사용자,..." (지정하면 --users/--ramp-up 대신 사용)')
+    parser.add_argument('--mix', default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()))
+    parser.add_argument('--think-time', type=float, default=1.0, help='작업 사이 평균 대기 (초, 지수 분포)')
+    parser.add_argument('--images', help='분석 요청에 사용할 이미지 폴더 (없으면 합성 PNG)')
+    parser.add_argument('--synthetic-images', type=int, default=50)
+    parser.add_argument('--output', default='load_report.json')
+    parser.add_argument('--compare', help='비교할 이전 보고서 JSON')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    mix = parse_weights(args.mix)
+    images = load_images(args.images, args.synthetic_images)
+    offsets = start_times(args.users, args.ramp_up, args.ramp)
+    recorder = Recorder()
+
+    print("=" * 70)
+    print(f"🚀 Smart Recipe 부하 테스트: {args.url}")
+    print(f"   가상 사용자 {len(offsets)}명, {args.duration:.0f}초, 이미지 {len(images)}개, 작업 비율 {mix}")
+    print("=" * 70)
+
+    start = time.monotonic()
+    deadline = start + args.duration
+    threads = []
+    for index, offset in enumerate(offsets):
+        user = VirtualUser(index, args.url, recorder, images, random.Random(args.seed + index))
+
+        def run(user=user, offset=offset):
+            time.sleep(max(0, start + offset - time.monotonic()))
+            if time.monotonic() < deadline:
+                user.run(mix, deadline, args.think_time)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    report = recorder.report(time.monotonic() - start)
+    report['config'] = {
+        "url": args.url, "users": len(offsets), "duration": args.duration, "ramp_up": args.ramp_up,
+        "ramp": args.ramp, "mix": mix, "think_time": args.think_time, "images": len(images),
+    }
+
+    print(f"\n총 {report['requests']}건, 처리량 {report['throughput_rps']}/s, 오류율 {report['error_rate']}")
+    print(f"{'작업':<10}{'건수':>7}{'오류':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>8}")
+    for operation, stats in report['operations'].items():
+        print(f"{operation:<10}{stats['count']:>7}{stats['errors']:>6}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['throughput_rps']:>8.2f}")
+    for operation, errors in report['error_breakdown'].items():
+        print(f"   ❌ {operation}: {errors}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 보고서 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,520 @@
+"""
+스키마 마이그레이션 - PRAGMA user_version에 스키마 버전을 기록하고 시작 시 순서대로 적용
+각 마이그레이션은 버전 갱신과 함께 하나의 트랜잭션으로 실행됨
+
+쿼리 계획 확인: python migrations.py [DB 경로]
+"""
+
+import json
+import sqlite3
+import sys
+
+from ingredient_names import canonical_name
+
+# 마이그레이션은 적용 당시의 스키마/데이터 변환을 그대로 재현해야 하므로
+# 다른 모듈의 SCHEMA/헬퍼를 가져오지 않고 적용 시점의 SQL을 여기에 고정해 둠
+
+
+def normalize_history_ingredients(db):
+    """재료 사전/히스토리 재료 테이블 생성 후 기존 JSON 컬럼에서 채움"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS ingredients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    ''')
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_history_items (
+            history_id INTEGER NOT NULL REFERENCES analysis_history(id) ON DELETE CASCADE,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            ingredient_id INTEGER NOT NULL REFERENCES ingredients(id),
+            PRIMARY KEY (history_id, ingredient_id)
+        ) WITHOUT ROWID
+    ''')
+    db.execute('''
+        CREATE INDEX IF NOT EXISTS idx_history_items_user_ingredient
+            ON analysis_history_items (user_id, ingredient_id)
+    ''')
+
+    rows = db.execute('SELECT id, user_id, detected_ingredients FROM analysis_history')
+    for history_id, user_id, detected in rows.fetchall():
+        try:
+            ingredients = json.loads(detected or '[]')
+        except ValueError:
+            continue
+        if not isinstance(ingredients, list):
+            continue
+        ids = _ingredient_ids(db, ingredients)
+        db.executemany(
+            'INSERT OR IGNORE INTO analysis_history_items (history_id, user_id, ingredient_id) VALUES (?, ?, ?)',
+            [(history_id, user_id, ingredient_id) for ingredient_id in ids.values()]
+        )
+
+
+def _ingredient_ids(db, names):
+    """재료 사전에 없는 이름은 추가하고 {이름: id} 반환 (버전 4 시점의 동작: 앞뒤 공백만 제거)"""
+    names = {name.strip() for name in names if isinstance(name, str) and name.strip()}
+    if not names:
+        return {}
+    db.executemany('INSERT OR IGNORE INTO ingredients (name) VALUES (?)', [(n,) for n in names])
+    placeholders = ', '.join('?' * len(names))
+    rows = db.execute(f'SELECT name, id FROM ingredients WHERE name IN ({placeholders})', tuple(names))
+    return {row[0]: row[1] for row in rows}
+
+
+def merge_ingredient_synonyms(db):
+    """재료 사전의 이름을 표준 이름으로 합치고 히스토리 재료/통계를 다시 연결"""
+    renamed = False
+    for ingredient_id, name in db.execute('SELECT id, name FROM ingredients').fetchall():
+        canonical = canonical_name(name)
+        if not canonical or canonical == name:
+            continue
+        target = _ingredient_ids(db, [canonical])[canonical]
+        db.execute(
+            'INSERT OR IGNORE INTO analysis_history_items (history_id, user_id, ingredient_id) '
+            'SELECT history_id, user_id, ? FROM analysis_history_items WHERE ingredient_id = ?',
+            (target, ingredient_id)
+        )
+        db.execute('DELETE FROM analysis_history_items WHERE ingredient_id = ?', (ingredient_id,))
+        db.execute('DELETE FROM ingredients WHERE id = ?', (ingredient_id,))
+        renamed = True
+    if renamed:
+        for statement in USER_STATS_REBUILD_V5:
+            db.execute(statement)
+
+
+USER_STATS_SCHEMA_V5 = '''
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        recipe_count INTEGER NOT NULL DEFAULT 0,
+        analysis_count INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS user_ingredient_stats (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        ingredient_id INTEGER NOT NULL REFERENCES ingredients(id),
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, ingredient_id)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_user_ingredient_stats_top
+        ON user_ingredient_stats (user_id, count DESC, ingredient_id);
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_stats_insert
+    AFTER INSERT ON saved_recipes BEGIN
+        INSERT INTO user_stats (user_id, recipe_count) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET recipe_count = recipe_count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_stats_delete
+    AFTER DELETE ON saved_recipes BEGIN
+        UPDATE user_stats SET recipe_count = recipe_count - 1 WHERE user_id = OLD.user_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_analysis_history_stats_insert
+    AFTER INSERT ON analysis_history BEGIN
+        INSERT INTO user_stats (user_id, analysis_count) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET analysis_count = analysis_count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_analysis_history_stats_delete
+    AFTER DELETE ON analysis_history BEGIN
+        UPDATE user_stats SET analysis_count = analysis_count - 1 WHERE user_id = OLD.user_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_history_items_stats_insert
+    AFTER INSERT ON analysis_history_items BEGIN
+        INSERT INTO user_ingredient_stats (user_id, ingredient_id, count)
+        VALUES (NEW.user_id, NEW.ingredient_id, 1)
+        ON CONFLICT (user_id, ingredient_id) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_history_items_stats_delete
+    AFTER DELETE ON analysis_history_items BEGIN
+        UPDATE user_ingredient_stats SET count = count - 1
+        WHERE user_id = OLD.user_id AND ingredient_id = OLD.ingredient_id;
+    END;
+'''
+
+USER_STATS_REBUILD_V5 = [
+    'DELETE FROM user_stats',
+    '''INSERT INTO user_stats (user_id, recipe_count, analysis_count)
+        SELECT user_id, SUM(recipe_count), SUM(analysis_count)
+        FROM (
+            SELECT user_id, COUNT(*) AS recipe_count, 0 AS analysis_count
+            FROM saved_recipes WHERE user_id IS NOT NULL GROUP BY user_id
+            UNION ALL
+            SELECT user_id, 0, COUNT(*)
+            FROM analysis_history WHERE user_id IS NOT NULL GROUP BY user_id
+        )
+        GROUP BY user_id''',
+    'DELETE FROM user_ingredient_stats',
+    '''INSERT INTO user_ingredient_stats (user_id, ingredient_id, count)
+        SELECT user_id, ingredient_id, COUNT(*)
+        FROM analysis_history_items
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, ingredient_id''',
+]
+
+RECIPE_SEARCH_SCHEMA_V6 = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS saved_recipes_fts USING fts5(
+        recipe_name, ingredients, steps, tips, tags, notes,
+        tokenize = 'trigram'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_fts_insert
+    AFTER INSERT ON saved_recipes BEGIN
+        INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        VALUES (
+            NEW.id,
+            NEW.recipe_name,
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.ingredients') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.steps') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.tips') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.tags, '$') WHERE atom IS NOT NULL),
+            NEW.notes
+        );
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_fts_update
+    AFTER UPDATE OF recipe_name, recipe_data, tags, notes ON saved_recipes BEGIN
+        DELETE FROM saved_recipes_fts WHERE rowid = OLD.id;
+        INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        VALUES (
+            NEW.id,
+            NEW.recipe_name,
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.ingredients') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.steps') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.tips') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.tags, '$') WHERE atom IS NOT NULL),
+            NEW.notes
+        );
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_fts_delete
+    AFTER DELETE ON saved_recipes BEGIN
+        DELETE FROM saved_recipes_fts WHERE rowid = OLD.id;
+    END;
+'''
+
+RECIPE_SEARCH_REBUILD_V6 = [
+    'DELETE FROM saved_recipes_fts',
+    '''INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        SELECT
+            id,
+            saved_recipes.recipe_name,
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.recipe_data, '$.ingredients') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.recipe_data, '$.steps') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.recipe_data, '$.tips') WHERE atom IS NOT NULL),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.tags, '$') WHERE atom IS NOT NULL),
+            saved_recipes.notes
+        FROM saved_recipes''',
+]
+
+
+# 재료는 이름만 (분량/단위/보유 여부 제외), 단계/팁/태그는 문자열 값만 색인
+RECIPE_SEARCH_SCHEMA_V13 = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS saved_recipes_fts USING fts5(
+        recipe_name, ingredients, steps, tips, tags, notes,
+        tokenize = 'trigram'
+    );
+
+    DROP TRIGGER IF EXISTS trg_saved_recipes_fts_insert;
+    DROP TRIGGER IF EXISTS trg_saved_recipes_fts_update;
+
+    CREATE TRIGGER trg_saved_recipes_fts_insert
+    AFTER INSERT ON saved_recipes BEGIN
+        INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        VALUES (
+            NEW.id,
+            NEW.recipe_name,
+            (SELECT group_concat(CASE type WHEN 'object' THEN json_extract(value, '$.name') WHEN 'text' THEN value END, ' ')
+             FROM json_each(NEW.recipe_data, '$.ingredients')),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.steps') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.tips') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.tags, '$') WHERE type = 'text'),
+            NEW.notes
+        );
+    END;
+
+    CREATE TRIGGER trg_saved_recipes_fts_update
+    AFTER UPDATE OF recipe_name, recipe_data, tags, notes ON saved_recipes BEGIN
+        DELETE FROM saved_recipes_fts WHERE rowid = OLD.id;
+        INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        VALUES (
+            NEW.id,
+            NEW.recipe_name,
+            (SELECT group_concat(CASE type WHEN 'object' THEN json_extract(value, '$.name') WHEN 'text' THEN value END, ' ')
+             FROM json_each(NEW.recipe_data, '$.ingredients')),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.steps') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.recipe_data, '$.tips') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(NEW.tags, '$') WHERE type = 'text'),
+            NEW.notes
+        );
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_saved_recipes_fts_delete
+    AFTER DELETE ON saved_recipes BEGIN
+        DELETE FROM saved_recipes_fts WHERE rowid = OLD.id;
+    END;
+'''
+
+RECIPE_SEARCH_REBUILD_V13 = [
+    'DELETE FROM saved_recipes_fts',
+    '''INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        SELECT
+            id,
+            saved_recipes.recipe_name,
+            (SELECT group_concat(CASE type WHEN 'object' THEN json_extract(value, '$.name') WHEN 'text' THEN value END, ' ')
+             FROM json_each(saved_recipes.recipe_data, '$.ingredients')),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.recipe_data, '$.steps') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.recipe_data, '$.tips') WHERE type = 'text'),
+            (SELECT group_concat(value, ' ') FROM json_tree(saved_recipes.tags, '$') WHERE type = 'text'),
+            saved_recipes.notes
+        FROM saved_recipes''',
+]
+
+
+def fts_trigram_supported(db):
+    """FTS5 trigram 토크나이저(SQLite 3.34+)와 JSON 함수를 쓸 수 있는 SQLite 빌드인지"""
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp.fts_trigram_probe USING fts5(x, tokenize = 'trigram')")
+        db.execute('DROP TABLE temp.fts_trigram_probe')
+        db.execute("SELECT count(*) FROM json_each('[1]')").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def run_script(db, script):
+    """여러 문장(트리거 본문 포함)을 현재 트랜잭션 안에서 실행 (executescript는 먼저 커밋하므로 쓰지 않음)"""
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            db.execute(statement)
+            statement = ''
+
+
+def create_recipe_search_index(db):
+    """저장 레시피 전문 검색 인덱스 생성 (지원하지 않는 SQLite 빌드면 건너뛰고 검색은 인덱스 없이 비교)"""
+    if not fts_trigram_supported(db):
+        return
+    run_script(db, RECIPE_SEARCH_SCHEMA_V6)
+    for statement in RECIPE_SEARCH_REBUILD_V6:
+        db.execute(statement)
+
+
+def index_ingredient_names(db):
+    """검색 인덱스 트리거를 재료 이름/문자열 값만 색인하도록 교체 후 다시 채움
+
+    버전 6을 건너뛴 DB도 그 뒤 SQLite가 trigram을 지원하게 되면 여기서 인덱스가 만들어짐
+    """
+    if not fts_trigram_supported(db):
+        return
+    run_script(db, RECIPE_SEARCH_SCHEMA_V13)
+    for statement in RECIPE_SEARCH_REBUILD_V13:
+        db.execute(statement)
+
+
+# (버전, 설명, SQL 스크립트 또는 callable(db))
+MIGRATIONS = [
+    (1, '기본 테이블', '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            nickname TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER UNIQUE REFERENCES users(id) ON DELETE CASCADE,
+            allergies TEXT DEFAULT '[]',
+            dietary_restrictions TEXT DEFAULT '[]',
+            preferred_cuisines TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS saved_recipes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            recipe_name TEXT NOT NULL,
+            recipe_data TEXT NOT NULL,
+            ingredients TEXT DEFAULT '[]',
+            cuisine_type TEXT,
+            difficulty TEXT,
+            cook_time TEXT,
+            rating INTEGER CHECK (rating >= 1 AND rating <= 5),
+            notes TEXT,
+            tags TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS analysis_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            detected_ingredients TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    '''),
+    (2, '사용자별 최신순 조회 인덱스', '''
+        CREATE INDEX IF NOT EXISTS idx_saved_recipes_user_created
+            ON saved_recipes (user_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_user_created
+            ON analysis_history (user_id, created_at DESC);
+    '''),
+    (3, '저장 레시피 키셋 페이지네이션 인덱스', '''
+        DROP INDEX IF EXISTS idx_saved_recipes_user_created;
+        CREATE INDEX IF NOT EXISTS idx_saved_recipes_user_created_id
+            ON saved_recipes (user_id, created_at DESC, id DESC);
+    '''),
+    (4, '재료 정규화 테이블 및 기존 히스토리 이관', normalize_history_ingredients),
+    (5, '사용자 통계 집계 테이블/트리거 및 초기 계산',
+     USER_STATS_SCHEMA_V5 + ';\n'.join(USER_STATS_REBUILD_V5)),
+    (6, '저장 레시피 전문 검색 인덱스 (FTS5 trigram)', create_recipe_search_index),
+    (7, '재료 동의어를 표준 이름으로 병합', merge_ingredient_synonyms),
+    # 8~12: 이전에는 각 모듈이 시작 시 직접 만들던 테이블 (이미 있는 DB에서는 그대로 유지)
+    (8, '이미지 분석/레시피 생성 결과 캐시', '''
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            cache_key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache (accessed_at);
+
+        CREATE TABLE IF NOT EXISTS recipe_cache (
+            cache_key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_recipe_cache_accessed ON recipe_cache (accessed_at);
+    '''),
+    (9, '유사 이미지 지각 해시', '''
+        CREATE TABLE IF NOT EXISTS image_phashes (
+            digest TEXT PRIMARY KEY,
+            phash TEXT NOT NULL
+        );
+    '''),
+    (10, '비동기 작업 큐', '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            user_id INTEGER,
+            status TEXT NOT NULL,
+            payload TEXT,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, updated_at);
+    '''),
+    (11, '로컬 레시피 코퍼스', '''
+        CREATE TABLE IF NOT EXISTS recipe_corpus (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signature TEXT UNIQUE NOT NULL,
+            cuisine TEXT,
+            source TEXT NOT NULL,
+            recipe TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+    '''),
+    (12, '프로세스 간 호출 병합 임대', '''
+        CREATE TABLE IF NOT EXISTS singleflight_leases (
+            lease_key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    '''),
+    (13, '전문 검색 인덱스를 재료 이름과 문자열 값만으로 재구성', index_ingredient_names),
+]
+
+# 인덱스를 타야 하는 주요 쿼리 (이름, SQL, 예시 파라미터)
+HOT_QUERIES = [
+    ('users.by_id', 'SELECT * FROM users WHERE id = ?', (1,)),
+    ('users.by_email', 'SELECT * FROM users WHERE email = ?', ('a@example.com',)),
+    ('preferences.by_user', 'SELECT * FROM user_preferences WHERE user_id = ?', (1,)),
+    ('recipes.page',
+     'SELECT * FROM saved_recipes WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?', (1, 21)),
+    ('recipes.next_page',
+     'SELECT * FROM saved_recipes WHERE user_id = ? AND (created_at, id) < (?, ?) '
+     'ORDER BY created_at DESC, id DESC LIMIT ?', (1, '2024-01-01 00:00:00', 1, 21)),
+    ('recipes.by_id',
+     'SELECT * FROM saved_recipes WHERE id = ? AND user_id = ?', (1, 1)),
+    ('history.recent',
+     'SELECT * FROM analysis_history WHERE user_id = ? ORDER BY created_at DESC LIMIT 20', (1,)),
+    ('stats.by_user', 'SELECT * FROM user_stats WHERE user_id = ?', (1,)),
+    ('stats.top_ingredients',
+     'SELECT i.name, s.count FROM user_ingredient_stats s '
+     'JOIN ingredients i ON i.id = s.ingredient_id WHERE s.user_id = ? AND s.count > 0 '
+     'ORDER BY s.count DESC, s.ingredient_id LIMIT 10', (1,)),
+]
+
+
+def current_version(db):
+    return db.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db, migrations=MIGRATIONS):
+    """적용되지 않은 마이그레이션을 순서대로 실행. 적용한 버전 목록 반환"""
+    version = current_version(db)
+    applied = []
+    for target, _description, step in migrations:
+        if target <= version:
+            continue
+        try:
+            if callable(step):
+                db.execute('BEGIN IMMEDIATE')
+                step(db)
+                db.execute(f'PRAGMA user_version = {int(target)}')
+                db.execute('COMMIT')
+            else:
+                db.executescript(f'BEGIN IMMEDIATE; {step}; PRAGMA user_version = {int(target)}; COMMIT;')
+        except Exception:
+            if db.in_transaction:
+                db.rollback()
+            raise
+        version = target
+        applied.append(target)
+    return applied
+
+
+def unindexed_queries(db, queries=HOT_QUERIES):
+    """전체 테이블 스캔이나 임시 정렬이 필요한 쿼리 목록 반환: [(이름, 계획 상세)]
+
+    GROUP BY 결과를 집계값으로 정렬하는 경우는 그룹 수만큼만 정렬하므로 허용
+    """
+    problems = []
+    for name, sql, params in queries:
+        for row in db.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall():
+            detail = row[-1]
+            full_scan = detail.startswith('SCAN') and ' USING ' not in detail
+            temp_sort = 'TEMP B-TREE' in detail and not (
+                'GROUP BY' in sql and detail.endswith('FOR ORDER BY')
+            )
+            if full_scan or temp_sort:
+                problems.append((name, detail))
+    return problems
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else ':memory:'
+    db = sqlite3.connect(path)
+    applied = migrate(db)
+    print(f"스키마 버전: {current_version(db)} (이번에 적용: {applied or '없음'})")
+
+    problems = unindexed_queries(db)
+    for name, detail in problems:
+        print(f"❌ {name}: {detail}")
+    if problems:
+        sys.exit(1)
+    print(f"✅ 주요 쿼리 {len(HOT_QUERIES)}개 모두 인덱스 사용")
+
+
+if __name__ == '__main__':
+    main()
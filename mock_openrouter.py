@@ -0,0 +1,343 @@
+"""
+OpenRouter 대체 서버 - 오프라인 부하/통합 테스트용 /chat/completions 모의 구현
+모델별 지연 분포, 429/5xx 오류 주입, 잘린 응답, 기록된 응답(fixture) 재생, SSE 스트리밍 지원
+
+사용법: python mock_openrouter.py [--port 8090] [--profile data/mock_openrouter.json]
+                                 [--fixtures benchmarks/llm_responses.jsonl] [--latency-scale 1.0]
+앱 연결: OPENROUTER_BASE_URL=http://127.0.0.1:8090/api/v1 OPENROUTER_API_KEY=mock python app.py
+통계:    GET http://127.0.0.1:8090/stats
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROFILE_PATH = os.path.join(ROOT, 'data', 'mock_openrouter.json')
+DEFAULT_FIXTURES_PATH = os.path.join(ROOT, 'benchmarks', 'llm_responses.jsonl')
+
+# 모델별 설정이 없을 때 사용하는 기본 프로필
+DEFAULT_PROFILE = {
+    "latency": {"dist": "lognormal", "median": 1.5, "sigma": 0.4},  # 초
+    "first_token_ratio": 0.3,  # 스트리밍 시 첫 조각까지 걸리는 시간 비율
+    "stream_chunk_chars": 24,
+    "rate_limit_rate": 0.0,  # 429 응답 비율
+    "error_rate": 0.0,  # 5xx 응답 비율
+    "error_statuses": [500, 502, 503],
+    "truncate_rate": 0.0,  # 응답을 중간에 자르는 비율 (finish_reason: length)
+    "truncate_range": [0.4, 0.9],
+}
+
+
+def sample_latency(rng, spec):
+    """지연 분포 설정에서 초 단위 지연 하나를 뽑음
+
+    {"dist": "fixed", "value"}, {"dist": "uniform", "min", "max"},
+    {"dist": "normal", "mean", "std"}, {"dist": "lognormal", "median", "sigma"}
+    """
+    dist = spec.get('dist', 'fixed')
+    if dist == 'uniform':
+        value = rng.uniform(spec['min'], spec['max'])
+    elif dist == 'normal':
+        value = rng.gauss(spec['mean'], spec['std'])
+    elif dist == 'lognormal':
+        value = spec['median'] * rng.lognormvariate(0, spec['sigma'])
+    else:
+        value = spec.get('value', 0)
+    return max(0.0, min(value, spec.get('max_value', float('inf'))))
+
+
+def request_kind(messages):
+    """이미지가 포함된 요청은 재료 인식, 나머지는 레시피 생성으로 간주"""
+    for message in messages or []:
+        content = message.get('content') if isinstance(message, dict) else None
+        if isinstance(content, list) and any(
+            isinstance(part, dict) and part.get('type') == 'image_url' for part in content
+        ):
+            return 'ingredients'
+    return 'recipe'
+
+
+def prompt_ingredients(messages):
+    """레시피 프롬프트의 "사용 가능한 재료:" 줄에서 재료 목록"""
+    for message in messages or []:
+        content = message.get('content') if isinstance(message, dict) else None
+        if isinstance(content, str):
+            match = re.search(r'사용 가능한 재료:\s*(.+)', content)
+            if match:
+                return [name.strip() for name in match.group(1).split(',') if name.strip()]
+    return []
+
+
+def synthetic_content(kind, messages, rng):
+    """fixture가 없을 때 요청 형식에 맞춰 만든 응답"""
+    if kind == 'ingredients':
+        pool = ['계란', '양파', '대파', '당근', '감자', '두부', '우유', '김치', '돼지고기', '애호박']
+        return json.dumps(rng.sample(pool, rng.randint(3, 6)), ensure_ascii=False)
+    ingredients = prompt_ingredients(messages) or ['계란', '양파']
+    return json.dumps({
+        "name": f"{ingredients[0]} 볶음",
+        "description": "모의 서버가 만든 레시피입니다.",
+        "difficulty": "초급",
+        "cookTime": "20분 이내",
+        "servings": 2,
+        "ingredients": [{"name": n, "amount": "적당량", "available": True} for n in ingredients],
+        "steps": [f"{n}을(를) 손질합니다." for n in ingredients] + ["팬에 볶아 간을 맞춥니다."],
+        "tips": "센 불에서 빠르게 볶으세요."
+    }, ensure_ascii=False, indent=2)
+
+
+class FixtureLibrary:
+    """기록된 응답 ({"kind", "model", "text"} JSONL). 같은 모델의 기록을 우선 사용"""
+
+    def __init__(self, path=None):
+        self.by_kind = defaultdict(list)
+        self.by_model = defaultdict(list)
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.by_kind[entry['kind']].append(entry['text'])
+                        self.by_model[(entry['kind'], entry.get('model'))].append(entry['text'])
+
+    def __len__(self):
+        return sum(len(texts) for texts in self.by_kind.values())
+
+    def pick(self, rng, kind, model):
+        texts = self.by_model.get((kind, model)) or self.by_kind.get(kind)
+        return rng.choice(texts) if texts else None
+
+
+class MockOpenRouter:
+    """요청별 응답 계획(지연, 오류, 본문) 결정 및 통계 (HTTP 처리와 분리)"""
+
+    def __init__(self, profiles=None, fixtures=None, latency_scale=1.0, seed=None):
+        profiles = profiles or {}
+        self.default = dict(DEFAULT_PROFILE, **profiles.get('default', {}))
+        self.models = profiles.get('models', {})
+        self.fixtures = fixtures or FixtureLibrary()
+        self.latency_scale = latency_scale
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = defaultdict(Counter)
+        self._sequence = 0
+
+    def profile(self, model):
+        return dict(self.default, **self.models.get(model, {}))
+
+    def plan(self, body):
+        """요청 본문 → {"status", "error", "content", "finish_reason", "latency", ...}"""
+        model = body.get('model', 'unknown')
+        messages = body.get('messages') or []
+        profile = self.profile(model)
+        with self._lock:
+            rng = random.Random(self._rng.random())
+            self._sequence += 1
+            sequence = self._sequence
+
+        plan = {
+            "id": f"gen-mock-{sequence}",
+            "model": model,
+            "stream": bool(body.get('stream')),
+            "latency": sample_latency(rng, profile['latency']) * self.latency_scale,
+            "first_token_ratio": profile['first_token_ratio'],
+            "chunk_chars": max(1, int(profile['stream_chunk_chars'])),
+            "status": 200,
+            "finish_reason": "stop",
+        }
+        roll = rng.random()
+        if roll < profile['rate_limit_rate']:
+            plan.update(status=429, outcome='rate_limited', error={
+                "code": 429, "message": "Rate limit exceeded: free-models-per-min"
+            })
+            plan['latency'] *= 0.1
+        elif roll < profile['rate_limit_rate'] + profile['error_rate']:
+            status = rng.choice(profile['error_statuses'])
+            plan.update(status=status, outcome='error', error={"code": status, "message": "Provider returned error"})
+            plan['latency'] *= 0.5
+        else:
+            kind = request_kind(messages)
+            content = self.fixtures.pick(rng, kind, model) or synthetic_content(kind, messages, rng)
+            plan.update(outcome='ok', kind=kind)
+            if rng.random() < profile['truncate_rate']:
+                low, high = profile['truncate_range']
+                content = content[:max(1, int(len(content) * rng.uniform(low, high)))]
+                plan.update(finish_reason='length', outcome='truncated')
+            plan['content'] = content
+
+        with self._lock:
+            self._counts[model][plan['outcome']] += 1
+        return plan
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self._sequence,
+                "models": {model: dict(counts) for model, counts in self._counts.items()},
+                "fixtures": len(self.fixtures)
+            }
+
+
+def completion_body(plan):
+    content = plan['content']
+    return {
+        "id": plan['id'],
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": plan['model'],
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": plan['finish_reason']
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content), "total_tokens": len(content)}
+    }
+
+
+def stream_chunk(plan, delta, finish_reason=None):
+    return {
+        "id": plan['id'],
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": plan['model'],
+        "choices": [{"index": 0, "delta": {"content": delta} if delta else {}, "finish_reason": finish_reason}]
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive 핸들러 (스트리밍은 chunked 전송)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockOpenRouter/1.0'
+    mock = None  # MockOpenRouter (서버 생성 시 설정)
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            self._send_json(200, self.mock.stats())
+        elif self.path.rstrip('/').endswith('/health'):
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON body"}})
+            return
+
+        plan = self.mock.plan(body)
+        if plan['status'] != 200:
+            time.sleep(plan['latency'])
+            self._send_json(plan['status'], {"error": plan['error']})
+        elif plan['stream']:
+            self._stream(plan)
+        else:
+            time.sleep(plan['latency'])
+            self._send_json(200, completion_body(plan))
+
+    def _stream(self, plan):
+        content = plan['content']
+        size = plan['chunk_chars']
+        pieces = [content[i:i + size] for i in range(0, len(content), size)] or ['']
+        first_delay = plan['latency'] * plan['first_token_ratio']
+        chunk_delay = (plan['latency'] - first_delay) / len(pieces)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            self._write_chunk(': OPENROUTER PROCESSING\n\n')
+            time.sleep(first_delay)
+            for index, piece in enumerate(pieces):
+                if index:
+                    time.sleep(chunk_delay)
+                self._write_chunk(f'data: {json.dumps(stream_chunk(plan, piece), ensure_ascii=False)}\n\n')
+            final = stream_chunk(plan, None, plan['finish_reason'])
+            self._write_chunk(f'data: {json.dumps(final)}\n\n')
+            self._write_chunk('data: [DONE]\n\n')
+            self.wfile.write(b'0\r\n\r\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+def make_server(host, port, mock, verbose=False):
+    """모의 서버 생성 (serve_forever는 호출자가 실행)"""
+    handler = type('Handler', (MockHandler,), {"mock": mock, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def load_profiles(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--profile', default=DEFAULT_PROFILE_PATH, help='모델별 지연/오류 설정 JSON')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_PATH, help='기록된 응답 JSONL (없으면 합성 응답)')
+    parser.add_argument('--no-fixtures', action='store_true', help='항상 요청 재료로 합성한 응답 사용')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='모든 지연에 곱할 배율 (0이면 지연 없음)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    fixtures = FixtureLibrary(None if args.no_fixtures else args.fixtures)
+    mock = MockOpenRouter(load_profiles(args.profile), fixtures, args.latency_scale, args.seed)
+    server = make_server(args.host, args.port, mock, args.verbose)
+
+    print("=" * 60)
+    print(f"🧪 OpenRouter 모의 서버: http://{args.host}:{args.port}/api/v1")
+    print("=" * 60)
+    print(f"   기록된 응답: {len(fixtures)}개, 지연 배율: {args.latency_scale}")
+    print(f"   앱 연결: OPENROUTER_BASE_URL=http://{args.host}:{args.port}/api/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
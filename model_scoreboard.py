@@ -0,0 +1,194 @@
+"""
+모델별 성능 점수판 및 서킷 브레이커
+최근 호출의 지연 시간(p50/p95), 429 비율, 파싱 실패율로 모델 우선순위를 동적으로 결정
+"""
+
+import threading
+import time
+from collections import deque
+
+OUTCOME_OK = 'ok'
+OUTCOME_RATE_LIMITED = 'rate_limited'
+OUTCOME_PARSE_ERROR = 'parse_error'
+OUTCOME_ERROR = 'error'
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+def percentile(sorted_values, ratio):
+    """정렬된 값의 백분위수 (최근접 순위)"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(ratio * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class CircuitBreaker:
+    """연속 실패 시 열리고, 대기 후 반열림 상태에서 한 번 시험 호출"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def available(self):
+        """호출 가능 여부 (상태 변경 없음)"""
+        if self.state == STATE_OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        if self.state == STATE_HALF_OPEN:
+            return not self._probing
+        return True
+
+    def acquire(self):
+        """호출 허용 여부 (열림 → 반열림 전환 및 시험 호출 예약)"""
+        if self.state == STATE_OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = STATE_HALF_OPEN
+            self._probing = False
+        if self.state == STATE_HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def release(self):
+        """결과 없이 끝난 호출(클라이언트 연결 종료 등)의 시험 호출 예약 해제"""
+        self._probing = False
+
+    def record_success(self):
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class ModelStats:
+    """모델 1개의 최근 호출 기록 (개수 window, 기간 max_age 초 이내)"""
+
+    def __init__(self, window, max_age):
+        self.max_age = max_age
+        self.latencies = deque(maxlen=window)  # (시각, 성공 호출 지연 시간)
+        self.outcomes = deque(maxlen=window)  # (시각, 결과)
+        self.total_calls = 0
+
+    def prune(self, now):
+        """오래된 기록 제거 (일시 장애 후 점수가 회복되도록)"""
+        cutoff = now - self.max_age
+        for records in (self.latencies, self.outcomes):
+            while records and records[0][0] < cutoff:
+                records.popleft()
+
+    def sorted_latencies(self):
+        return sorted(latency for _, latency in self.latencies)
+
+    def rate(self, outcome):
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for _, o in self.outcomes if o == outcome) / len(self.outcomes)
+
+    def summary(self):
+        latencies = self.sorted_latencies()
+        return {
+            "calls": self.total_calls,
+            "window": len(self.outcomes),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000) if latencies else None,
+            "p95_ms": round(percentile(latencies, 0.95) * 1000) if latencies else None,
+            "success_rate": round(self.rate(OUTCOME_OK), 3),
+            "rate_limited_rate": round(self.rate(OUTCOME_RATE_LIMITED), 3),
+            "parse_error_rate": round(self.rate(OUTCOME_PARSE_ERROR), 3),
+            "error_rate": round(self.rate(OUTCOME_ERROR), 3)
+        }
+
+
+class ModelScoreboard:
+    """모델별 통계와 서킷 브레이커를 관리하고 점수순 호출 순서 제공"""
+
+    def __init__(self, window=100, max_age=300, failure_threshold=5, reset_timeout=60,
+                 prior_latency=10.0, failure_penalty=30.0):
+        self.window = window
+        self.max_age = max_age
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.prior_latency = prior_latency  # 기록 없는 모델의 예상 지연 (초)
+        self.failure_penalty = failure_penalty  # 실패 1회당 예상 손실 (초)
+        self._stats = {}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model):
+        if model not in self._stats:
+            self._stats[model] = ModelStats(self.window, self.max_age)
+            self._breakers[model] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self._stats[model], self._breakers[model]
+
+    def record(self, model, outcome, latency):
+        """호출 결과 기록"""
+        now = time.monotonic()
+        with self._lock:
+            stats, breaker = self._get(model)
+            stats.total_calls += 1
+            stats.prune(now)
+            stats.outcomes.append((now, outcome))
+            if outcome == OUTCOME_OK:
+                stats.latencies.append((now, latency))
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def acquire(self, model):
+        """서킷 브레이커가 호출을 허용하는지 확인 (허용되면 record 또는 release 중 하나를 반드시 호출)"""
+        with self._lock:
+            return self._get(model)[1].acquire()
+
+    def release(self, model):
+        """acquire 후 결과를 기록하지 못하고 끝난 호출 정리 (점수/실패 횟수는 그대로)"""
+        with self._lock:
+            self._get(model)[1].release()
+
+    def _score(self, stats):
+        """예상 비용 (초): 지연 중앙값 + 실패율 × 페널티"""
+        stats.prune(time.monotonic())
+        latencies = stats.sorted_latencies()
+        expected = percentile(latencies, 0.5) if latencies else self.prior_latency
+        failure_rate = 1.0 - stats.rate(OUTCOME_OK) if stats.outcomes else 0.0
+        return expected + failure_rate * self.failure_penalty
+
+    def ranked(self, models):
+        """점수순 모델 목록 (열린 브레이커 제외, 모두 열려 있으면 원래 순서)"""
+        with self._lock:
+            available = []
+            for index, model in enumerate(models):
+                stats, breaker = self._get(model)
+                if breaker.available():
+                    available.append((self._score(stats), index, model))
+        if not available:
+            return list(models)
+        return [model for _, _, model in sorted(available)]
+
+    def snapshot(self, models):
+        """점검용 상태 (점수순 목록 + 모델별 통계/브레이커)"""
+        ranked = self.ranked(models)
+        with self._lock:
+            details = {}
+            for model in models:
+                stats, breaker = self._get(model)
+                stats.prune(time.monotonic())
+                details[model] = dict(
+                    stats.summary(),
+                    score=round(self._score(stats), 2),
+                    breaker=breaker.state,
+                    consecutive_failures=breaker.failures
+                )
+        return {"order": ranked, "models": details}
@@ -0,0 +1,224 @@
+"""
+지각 해시(dHash) 기반 유사 이미지 인덱스
+재인코딩/리사이즈된 같은 사진을 해밍 거리로 찾아 분석 결과를 재사용
+"""
+
+import io
+import sqlite3
+import threading
+import time
+from itertools import combinations
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 미설치 시 유사 이미지 매칭 비활성화
+    Image = None
+
+HASH_SIZE = 8  # 8x8 = 64비트 해시
+
+if hasattr(int, 'bit_count'):
+    def bit_count(value):
+        return value.bit_count()
+else:
+    def bit_count(value):
+        return bin(value).count('1')
+
+
+def hamming_distance(a, b):
+    """두 해시의 해밍 거리"""
+    return bit_count(a ^ b)
+
+
+def is_informative(phash, min_bits=8, bits=HASH_SIZE * HASH_SIZE):
+    """밝기 변화가 충분한 해시인지 (단색/단순 그라데이션은 0 또는 1 비트만 남아 서로 다른 이미지끼리 일치함)"""
+    ones = bit_count(phash)
+    return min_bits <= ones <= bits - min_bits
+
+
+def dhash(image_bytes, hash_size=HASH_SIZE):
+    """이미지 바이트의 difference hash (Pillow 없거나 디코딩 실패 시 None)"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.draft('L', (hash_size * 8, hash_size * 8))
+            gray = img.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+            pixels = list(gray.getdata())
+    except Exception:
+        return None
+
+    value = 0
+    width = hash_size + 1
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+class MultiIndexHash:
+    """해밍 거리 조회용 멀티 인덱스 해싱
+
+    64비트 해시를 chunks개 조각으로 나눠 조각별 해시 테이블에 저장한다.
+    거리 D 이내의 해시는 비둘기집 원리에 따라 적어도 한 조각이
+    D // chunks 비트 이내로 일치하므로, 그 범위의 변형만 탐색하면 된다.
+    """
+
+    def __init__(self, bits=HASH_SIZE * HASH_SIZE, chunks=4):
+        self.chunks = chunks
+        self.chunk_bits = bits // chunks
+        self._chunk_mask = (1 << self.chunk_bits) - 1
+        self._tables = [{} for _ in range(chunks)]
+        self._values = {}
+        self._flip_masks = {}
+
+    def _split(self, key):
+        return [(key >> (i * self.chunk_bits)) & self._chunk_mask for i in range(self.chunks)]
+
+    def _masks(self, radius):
+        """조각 내 radius 비트 이하를 반전하는 마스크 목록"""
+        masks = self._flip_masks.get(radius)
+        if masks is None:
+            masks = [0]
+            for r in range(1, radius + 1):
+                for bits in combinations(range(self.chunk_bits), r):
+                    mask = 0
+                    for bit in bits:
+                        mask |= 1 << bit
+                    masks.append(mask)
+            self._flip_masks[radius] = masks
+        return masks
+
+    def add(self, key, value):
+        """해시 추가 (동일 해시는 값 교체)"""
+        if key not in self._values:
+            for table, part in zip(self._tables, self._split(key)):
+                table.setdefault(part, []).append(key)
+        self._values[key] = value
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def remove(self, key):
+        """해시 삭제"""
+        if self._values.pop(key, None) is None:
+            return
+        for table, part in zip(self._tables, self._split(key)):
+            keys = table.get(part)
+            if keys is not None:
+                keys.remove(key)
+                if not keys:
+                    del table[part]
+
+    def within(self, key, max_distance, limit=None):
+        """max_distance 이내 (거리, 값) 목록 (가까운 순)"""
+        masks = self._masks(max_distance // self.chunks)
+        found = []
+        seen = set()
+        for table, part in zip(self._tables, self._split(key)):
+            for mask in masks:
+                for candidate in table.get(part ^ mask, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = hamming_distance(key, candidate)
+                    if distance <= max_distance:
+                        found.append((distance, candidate))
+        found.sort()
+        return [(distance, self._values[candidate]) for distance, candidate in found[:limit]]
+
+    def nearest(self, key, max_distance):
+        """max_distance 이내 가장 가까운 (거리, 값) 또는 None"""
+        value = self._values.get(key)
+        if value is not None:
+            return 0, value
+        found = self.within(key, max_distance, limit=1)
+        return found[0] if found else None
+
+    def __len__(self):
+        return len(self._values)
+
+
+class PerceptualHashIndex:
+    """인메모리 멀티 인덱스 해시 + SQLite 영구 저장 (해시 → 이미지 다이제스트, 테이블은 migrations.py에서 생성)
+
+    live_digests(현재 캐시에 남아 있는 다이제스트 집합을 돌려주는 함수)를 주면 load() 시와
+    prune_interval초마다 캐시에서 만료/제거된 다이제스트의 해시를 정리함
+    """
+
+    def __init__(self, pool=None, table='image_phashes', live_digests=None, prune_interval=600):
+        self.pool = pool  # database.ConnectionPool (없으면 메모리에만 보관)
+        self.table = table
+        self.live_digests = live_digests
+        self.prune_interval = prune_interval
+        self._index = MultiIndexHash()
+        self._digests = {}  # 다이제스트 -> 해시 (삭제용)
+        self._lock = threading.Lock()
+        self._pruned_at = time.monotonic()
+
+    def load(self):
+        """저장된 해시 불러오기 후 만료된 해시 정리 (서비스 시작 시 한 번 호출)"""
+        if self.pool is not None:
+            with self.pool.connection() as db:
+                rows = db.execute(f'SELECT digest, phash FROM {self.table}').fetchall()
+            with self._lock:
+                for digest, phash in rows:
+                    self._index.add(int(phash, 16), digest)
+                    self._digests[digest] = int(phash, 16)
+        if self.live_digests is not None:
+            self.prune()
+
+    def add(self, phash, digest):
+        """해시 등록 (정리 주기가 지났으면 만료된 해시 정리)"""
+        with self._lock:
+            self._index.add(phash, digest)
+            self._digests[digest] = phash
+        if self.pool is not None:
+            try:
+                with self.pool.connection() as db:
+                    db.execute(
+                        f'INSERT OR REPLACE INTO {self.table} (digest, phash) VALUES (?, ?)',
+                        (digest, format(phash, '016x'))
+                    )
+                    db.commit()
+            except sqlite3.Error:
+                pass
+
+        if self.live_digests is not None and time.monotonic() - self._pruned_at >= self.prune_interval:
+            self.prune()
+
+    def find(self, phash, max_distance, limit=5):
+        """max_distance 이내 (거리, 다이제스트) 목록 (가까운 순, 최대 limit개)"""
+        with self._lock:
+            return self._index.within(phash, max_distance, limit)
+
+    def remove(self, digests):
+        """다이제스트들의 해시 삭제"""
+        with self._lock:
+            for digest in digests:
+                phash = self._digests.pop(digest, None)
+                # 같은 해시가 다른 다이제스트로 교체됐으면 인덱스는 그대로 둠
+                if phash is not None and self._index.get(phash) == digest:
+                    self._index.remove(phash)
+        if self.pool is not None and digests:
+            try:
+                with self.pool.connection() as db:
+                    db.executemany(f'DELETE FROM {self.table} WHERE digest = ?', [(d,) for d in digests])
+                    db.commit()
+            except sqlite3.Error:
+                pass
+
+    def prune(self):
+        """캐시에 없는 다이제스트의 해시 삭제. 삭제한 수 반환"""
+        self._pruned_at = time.monotonic()
+        try:
+            live = self.live_digests()
+        except sqlite3.Error:
+            return 0
+        with self._lock:
+            stale = [digest for digest in self._digests if digest not in live]
+        self.remove(stale)
+        return len(stale)
+
+    def __len__(self):
+        return len(self._index)
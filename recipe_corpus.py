@@ -0,0 +1,185 @@
+"""
+로컬 레시피 코퍼스 - LLM 호출 전에 재료 구성이 맞는 레시피를 즉시 반환하는 검색 계층
+JSON 번들과 SQLite 테이블에서 레시피를 읽어 재료 역색인으로 조회하며,
+LLM이 생성한 레시피도 코퍼스에 추가해 다음 요청부터 재사용
+"""
+
+import copy
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from ingredient_index import IngredientIndex, canonical_ingredient, recipe_ingredient_names
+
+ALL_CUISINES = '*'
+ANY_CUISINE_VALUES = ('', '상관없음', None)
+
+# 보유 여부와 관계없이 있다고 가정하는 기본 양념 (LLM 프롬프트의 "기본 재료"와 동일)
+PANTRY_STAPLES = ('소금', '후추', '설탕', '식용유', '물', '간장', '참기름', '다진마늘')
+
+SOURCE_BUNDLE = 'bundle'
+SOURCE_LLM = 'llm'
+
+ANY_OPTION_VALUES = ('', '상관없음', None)
+MATCH_LIMIT = 20  # 재료로 먼저 고른 뒤 난이도/시간/인분으로 거르므로 넉넉히 조회
+
+_DURATION = re.compile(r'(\d+)\s*(시간|분)')
+
+
+def cook_minutes(value):
+    """조리 시간 문자열의 분 단위 값 ("1시간 이내" → 60, "1시간 30분" → 90, 알 수 없으면 None)"""
+    parts = _DURATION.findall(str(value or ''))
+    if not parts:
+        return None
+    return sum(int(n) * (60 if unit == '시간' else 1) for n, unit in parts)
+
+
+def fits_options(recipe, difficulty=None, cook_time=None, servings=None):
+    """레시피가 요청 옵션을 만족하는지 (상관없음/빈 값은 조건 없음)
+
+    난이도와 인분은 같아야 하고(분량은 비율로 바꿀 수 없음), 조리 시간은 요청 시간 이내여야 함
+    """
+    if difficulty not in ANY_OPTION_VALUES and recipe.get('difficulty') != str(difficulty).strip():
+        return False
+    limit = None if cook_time in ANY_OPTION_VALUES else cook_minutes(cook_time)
+    if limit is not None:
+        minutes = cook_minutes(recipe.get('cookTime'))
+        if minutes is None or minutes > limit:
+            return False
+    if servings not in ANY_OPTION_VALUES:
+        try:
+            if int(recipe.get('servings')) != int(servings):
+                return False
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def recipe_signature(recipe):
+    """레시피 이름 + 재료 구성 기준 중복 판별 키"""
+    payload = json.dumps(
+        [canonical_ingredient(recipe.get('name', '')), sorted(recipe_ingredient_names(recipe))],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RecipeCorpus:
+    """요리 종류별 재료 역색인을 가진 로컬 레시피 모음"""
+
+    def __init__(self, pool, bundle_path=None, table='recipe_corpus', pantry=PANTRY_STAPLES):
+        self.pool = pool  # database.ConnectionPool (테이블은 migrations.py에서 생성)
+        self.table = table
+        self.pantry = [canonical_ingredient(name) for name in pantry]
+        self._index = IngredientIndex(ttl=float('inf'), max_users=None)  # 요리 종류별 범위는 다시 로드하지 않으므로 제거하지 않음
+        self._recipes = {}  # id -> (레시피 dict, 요리 종류)
+        self.bundle_path = bundle_path
+        self._lock = threading.Lock()
+
+    def load(self):
+        """번들 가져오기 후 저장된 레시피로 색인 구성 (서비스 시작 시 한 번 호출)"""
+        if self.bundle_path:
+            self.import_bundle(self.bundle_path)
+        self._load()
+
+    def _load(self):
+        with self.pool.connection() as db:
+            rows = db.execute(f'SELECT id, cuisine, recipe FROM {self.table}').fetchall()
+        scopes = {ALL_CUISINES: []}
+        with self._lock:
+            for recipe_id, cuisine, recipe_json in rows:
+                recipe = json.loads(recipe_json)
+                self._recipes[recipe_id] = (recipe, cuisine)
+                row = (recipe_id, recipe.get('name'), recipe)
+                scopes[ALL_CUISINES].append(row)
+                if cuisine:
+                    scopes.setdefault(cuisine, []).append(row)
+        for scope, scope_rows in scopes.items():
+            self._index.load(scope, scope_rows)
+
+    def import_bundle(self, bundle_path):
+        """JSON 번들([{"cuisine": ..., "recipe": {...}}, ...]) 가져오기. 새로 추가된 수 반환"""
+        try:
+            with open(bundle_path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        added = 0
+        with self.pool.connection() as db:
+            for entry in entries:
+                recipe = entry.get('recipe')
+                if isinstance(recipe, dict) and recipe.get('ingredients'):
+                    added += self._insert(db, recipe, entry.get('cuisine'), SOURCE_BUNDLE) is not None
+            db.commit()
+        return added
+
+    def _insert(self, db, recipe, cuisine, source):
+        cursor = db.execute(
+            f'INSERT OR IGNORE INTO {self.table} (signature, cuisine, source, recipe, created_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (recipe_signature(recipe), cuisine, source, json.dumps(recipe, ensure_ascii=False), time.time())
+        )
+        return cursor.lastrowid if cursor.rowcount == 1 else None
+
+    def add(self, recipe, cuisine=None, source=SOURCE_LLM):
+        """레시피 추가 (같은 이름/재료 구성이 이미 있으면 무시). 추가 여부 반환"""
+        if not isinstance(recipe, dict) or not recipe_ingredient_names(recipe):
+            return False
+        cuisine = None if cuisine in ANY_CUISINE_VALUES else cuisine
+        recipe = {k: v for k, v in recipe.items() if not k.startswith('_')}
+        try:
+            with self.pool.connection() as db:
+                recipe_id = self._insert(db, recipe, cuisine, source)
+                db.commit()
+        except sqlite3.Error:
+            return False
+        if recipe_id is None:
+            return False
+
+        with self._lock:
+            self._recipes[recipe_id] = (recipe, cuisine)
+        for scope in (ALL_CUISINES, cuisine):
+            if scope:
+                self._index.add(scope, recipe_id, recipe.get('name'), recipe, create=True)
+        return True
+
+    def find(self, ingredients, cuisine=None, min_coverage=0.8, max_missing=2,
+             difficulty=None, cook_time=None, servings=None):
+        """보유 재료와 요청 옵션(난이도/조리 시간/인분)에 맞는 가장 적합한 레시피. (레시피, 일치 정보) 또는 None
+
+        기본 양념은 보유한 것으로 간주하며, 반환 레시피의 재료별 available은 실제 보유 재료 기준
+        """
+        scope = ALL_CUISINES if cuisine in ANY_CUISINE_VALUES else cuisine
+        owned = {canonical_ingredient(name) for name in ingredients} - {''}
+        matches = self._index.match(scope, list(owned) + self.pantry, limit=MATCH_LIMIT, max_missing=max_missing)
+        # 기본 양념만 겹치는 레시피는 제외, 부족 재료 수가 같으면 보유 재료를 더 많이 쓰는 레시피 우선
+        with self._lock:
+            candidates = [
+                m for m in matches
+                if m['coverage'] >= min_coverage and owned.intersection(m['matched'])
+                and fits_options(self._recipes[m['id']][0], difficulty, cook_time, servings)
+            ]
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda m: (m['missing_count'], -len(owned.intersection(m['matched']))))
+
+        with self._lock:
+            recipe = copy.deepcopy(self._recipes[best['id']][0])
+        for item in recipe.get('ingredients', []):
+            if isinstance(item, dict):
+                item['available'] = canonical_ingredient(item.get('name')) in owned
+        return recipe, {
+            "corpus_id": best['id'],
+            "coverage": best['coverage'],
+            "missing": best['missing']
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "recipes": len(self._recipes),
+                "cuisines": sorted({c for _, c in self._recipes.values() if c})
+            }
@@ -0,0 +1,235 @@
+"""
+저장 레시피 전문 검색 - FTS5 trigram 인덱스
+레시피 이름, 재료 이름, 조리 단계, 팁, 태그, 메모를 색인하며 saved_recipes 트리거로 동기화
+(가상 테이블/트리거는 migrations.py 버전 6에서 생성, 버전 13에서 재료 이름/문자열 값만 색인하도록 교체)
+
+trigram 토크나이저는 띄어쓰기/형태소와 무관하게 3글자 단위로 색인하므로 한국어 부분 일치에 적합
+2글자 이하 검색어(계란, 파 등)는 trigram이 없으므로 사용자 레시피 범위에서 부분 문자열로 비교
+FTS5 trigram을 지원하지 않는 SQLite(3.34 미만 등)는 인덱스가 없으므로 모든 검색어를 같은 방식으로 비교
+"""
+
+import html
+import json
+import re
+
+# JSON 배열/객체 안의 문자열 값을 공백으로 이어 붙임 (분량 숫자, 보유 여부 등 제외)
+_JSON_TEXT = "(SELECT group_concat(value, ' ') FROM json_tree({source}, '{path}') WHERE type = 'text')"
+
+# 재료 목록(문자열 또는 {"name", "amount", "available"} 객체)에서 이름만
+_INGREDIENT_NAMES = (
+    "(SELECT group_concat(CASE type WHEN 'object' THEN json_extract(value, '$.name') WHEN 'text' THEN value END, ' ')"
+    " FROM json_each({source}, '$.ingredients'))"
+)
+
+
+def _document(row):
+    """saved_recipes 행(NEW/OLD)에서 색인할 컬럼 값 목록"""
+    return ', '.join([
+        f'{row}.recipe_name',
+        _INGREDIENT_NAMES.format(source=f'{row}.recipe_data'),
+        _JSON_TEXT.format(source=f'{row}.recipe_data', path='$.steps'),
+        _JSON_TEXT.format(source=f'{row}.recipe_data', path='$.tips'),
+        _JSON_TEXT.format(source=f'{row}.tags', path='$'),
+        f'{row}.notes',
+    ])
+
+
+REBUILD_STATEMENTS = [
+    'DELETE FROM saved_recipes_fts',
+    f'''INSERT INTO saved_recipes_fts (rowid, recipe_name, ingredients, steps, tips, tags, notes)
+        SELECT id, {_document('saved_recipes')} FROM saved_recipes''',
+]
+
+
+def has_index(db):
+    """검색 인덱스가 있는지 (FTS5 trigram을 지원하지 않는 SQLite에서는 마이그레이션이 만들지 않음)"""
+    row = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'saved_recipes_fts'").fetchone()
+    return row is not None
+
+
+def rebuild(db):
+    """saved_recipes에서 검색 인덱스를 다시 만듦 (호출자가 커밋)"""
+    if not has_index(db):
+        return
+    for statement in REBUILD_STATEMENTS:
+        db.execute(statement)
+
+# bm25 컬럼 가중치: 이름 > 재료 > 태그 > 팁 > 단계/메모
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 2.0, 3.0, 1.0)
+TRIGRAM = 3
+
+_ALL_TEXT = " || ' ' || ".join(
+    f"coalesce(f.{column}, '')"
+    for column in ('recipe_name', 'ingredients', 'steps', 'tips', 'tags', 'notes')
+)
+
+_COLUMNS = 'r.id, r.recipe_name, r.cuisine_type, r.difficulty, r.cook_time, r.created_at'
+
+# 강조 구간 표시용 사용자 영역 문자 (원문을 HTML 이스케이프한 뒤 start/end 태그로 바꿈)
+_MARK_START = '\ue000'
+_MARK_END = '\ue001'
+
+
+def split_terms(query, max_terms=8):
+    """검색어를 공백 기준으로 나누어 (trigram 검색어, 짧은 검색어) 반환"""
+    terms = []
+    for term in query.split():
+        term = term.strip('"')
+        if term and term not in terms:
+            terms.append(term)
+    terms = terms[:max_terms]
+    return [t for t in terms if len(t) >= TRIGRAM], [t for t in terms if len(t) < TRIGRAM]
+
+
+def match_expression(terms):
+    """FTS5 MATCH 식 (모든 검색어를 구문으로 AND 결합)"""
+    return ' AND '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def mark_terms(text, terms, start='<mark>', end='</mark>'):
+    """text 안의 검색어를 강조 표시"""
+    if not text or not terms:
+        return text
+    pattern = '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.sub(pattern, lambda m: start + m.group(0) + end, text)
+
+
+def excerpt(text, terms, width=40):
+    """첫 번째 검색어 주변 발췌"""
+    text = ' '.join((text or '').split())
+    if not text:
+        return ''
+    positions = [text.find(t) for t in terms if t in text]
+    center = min(positions) if positions else 0
+    begin = max(0, center - width // 2)
+    snippet = text[begin:begin + width]
+    return ('…' if begin > 0 else '') + snippet + ('…' if begin + width < len(text) else '')
+
+
+def _text_values(value):
+    """JSON 값 안의 문자열 값 (인덱스의 json_tree ... WHERE type = 'text'와 같은 범위)"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _text_values(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _text_values(item)
+
+
+def document_text(row):
+    """인덱스 없이 비교할 저장 레시피 본문 (인덱스와 같은 컬럼: 이름, 재료 이름, 단계, 팁, 태그, 메모)"""
+    try:
+        recipe = json.loads(row['recipe_data'] or '{}')
+    except ValueError:
+        recipe = {}
+    try:
+        tags = json.loads(row['tags'] or '[]')
+    except ValueError:
+        tags = []
+    recipe = recipe if isinstance(recipe, dict) else {}
+    ingredients = recipe.get('ingredients')
+    names = [
+        item.get('name') if isinstance(item, dict) else item
+        for item in (ingredients if isinstance(ingredients, list) else [])
+    ]
+    parts = [row['recipe_name'], *_text_values(names), *_text_values(recipe.get('steps')),
+             *_text_values(recipe.get('tips')), *_text_values(tags), row['notes']]
+    return ' '.join(part for part in parts if part)
+
+
+def _scan_without_index(db, user_id, terms, limit, offset):
+    """사용자 레시피를 최신순으로 읽으며 모든 검색어를 포함하는 행을 offset + limit + 1개까지 모음"""
+    rows = db.execute(f'''
+        SELECT {_COLUMNS}, r.recipe_data, r.tags, r.notes
+        FROM saved_recipes r
+        WHERE r.user_id = ?
+        ORDER BY r.created_at DESC, r.id DESC
+    ''', (user_id,))
+    matched = []
+    for row in rows:
+        body = document_text(row)
+        if all(term in body for term in terms):
+            matched.append(dict(row, body=body))
+            if len(matched) > offset + limit:
+                break
+    return matched[offset:]
+
+
+def render_marks(text, start='<mark>', end='</mark>'):
+    """표시 문자로 강조한 원문을 HTML로 (원문은 이스케이프하고 강조 구간만 start/end 태그)"""
+    if text is None:
+        return None
+    return html.escape(text).replace(_MARK_START, start).replace(_MARK_END, end)
+
+
+def _query_index(db, user_id, long_terms, short_terms, limit, offset):
+    """검색 인덱스 조회 (trigram 검색어는 MATCH, 짧은 검색어는 색인된 본문의 부분 문자열)"""
+    params = []
+    if long_terms:
+        sql = f'''
+            SELECT {_COLUMNS},
+                   highlight(saved_recipes_fts, 0, ?, ?) AS highlight,
+                   snippet(saved_recipes_fts, -1, ?, ?, '…', 16) AS snippet,
+                   bm25(saved_recipes_fts, {', '.join(map(str, BM25_WEIGHTS))}) AS score
+            FROM saved_recipes_fts f
+            JOIN saved_recipes r ON r.id = f.rowid
+            WHERE saved_recipes_fts MATCH ? AND r.user_id = ?
+        '''
+        params += [_MARK_START, _MARK_END, _MARK_START, _MARK_END, match_expression(long_terms), user_id]
+        order = 'score, r.id DESC'
+    else:
+        sql = f'''
+            SELECT {_COLUMNS}, {_ALL_TEXT} AS body
+            FROM saved_recipes r
+            JOIN saved_recipes_fts f ON f.rowid = r.id
+            WHERE r.user_id = ?
+        '''
+        params.append(user_id)
+        order = 'r.created_at DESC, r.id DESC'
+
+    for term in short_terms:
+        sql += f' AND instr({_ALL_TEXT}, ?) > 0'
+        params.append(term)
+    sql += f' ORDER BY {order} LIMIT ? OFFSET ?'
+    params += [limit + 1, offset]
+    return db.execute(sql, params).fetchall()
+
+
+def search(db, user_id, query, limit=20, offset=0, start='<mark>', end='</mark>'):
+    """사용자의 저장 레시피 검색. (결과 목록, 다음 페이지 존재 여부) 반환
+
+    trigram 검색어가 있으면 bm25 순, 짧은 검색어만 있거나 검색 인덱스가 없으면 최신순.
+    highlight/snippet은 HTML 이스케이프된 문자열이며 강조 구간만 start/end 태그로 감쌈
+    """
+    long_terms, short_terms = split_terms(query)
+    if has_index(db):
+        rows = _query_index(db, user_id, long_terms, short_terms, limit, offset)
+    else:
+        long_terms, short_terms = [], long_terms + short_terms
+        rows = _scan_without_index(db, user_id, short_terms, limit, offset)
+    has_more = len(rows) > limit
+    results = []
+    for row in rows[:limit]:
+        item = {
+            "id": row['id'],
+            "name": row['recipe_name'],
+            "cuisine_type": row['cuisine_type'],
+            "difficulty": row['difficulty'],
+            "cook_time": row['cook_time'],
+            "created_at": row['created_at'],
+        }
+        if long_terms:
+            highlight, snippet, score = row['highlight'], row['snippet'], round(-row['score'], 4)
+        else:
+            highlight = mark_terms(row['recipe_name'], short_terms, _MARK_START, _MARK_END)
+            snippet = mark_terms(excerpt(row['body'], short_terms), short_terms, _MARK_START, _MARK_END)
+            score = None
+        item.update(
+            highlight=render_marks(highlight, start, end),
+            snippet=render_marks(snippet, start, end),
+            score=score
+        )
+        results.append(item)
+    return results, has_more
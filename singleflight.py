@@ -0,0 +1,93 @@
+"""
+싱글 플라이트 - 동일한 업스트림 호출이 동시에 여러 번 실행되지 않도록 병합
+같은 키로 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 기다림
+"""
+
+import secrets
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """스레드 간 호출 병합 (pool 지정 시 SQLite 임대 테이블로 프로세스 간 병합, 테이블은 migrations.py에서 생성)"""
+
+    def __init__(self, pool=None, table='singleflight_leases', lease_ttl=120, poll_interval=0.2):
+        self.pool = pool  # database.ConnectionPool
+        self.table = table
+        self.lease_ttl = lease_ttl  # 임대 만료 시간 (초) - 보유 프로세스가 죽어도 넘겨받을 수 있도록
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, lookup=None):
+        """key 기준으로 fn 실행을 병합. (결과, 다른 호출 결과 공유 여부) 반환
+
+        lookup: 프로세스 간 모드에서 다른 프로세스가 저장한 결과를 찾는 함수 (없으면 None 반환)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result(), True
+
+        try:
+            if self.pool is not None and lookup is not None:
+                result, shared = self._run_with_lease(key, fn, lookup)
+            else:
+                result, shared = fn(), False
+            future.set_result(result)
+            return result, shared
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _run_with_lease(self, key, fn, lookup):
+        """임대를 얻은 프로세스만 fn 실행, 나머지는 임대 해제 후 lookup으로 결과 확인"""
+        owner = secrets.token_hex(8)
+        while not self._acquire(key, owner):
+            time.sleep(self.poll_interval)
+            result = lookup()
+            if result is not None:
+                return result, True
+        try:
+            result = lookup()  # 임대를 얻기 직전에 다른 프로세스가 끝냈을 수 있음
+            if result is not None:
+                return result, True
+            return fn(), False
+        finally:
+            self._release(key, owner)
+
+    def _acquire(self, key, owner):
+        now = time.time()
+        try:
+            with self.pool.connection() as db:
+                cursor = db.execute(f'''
+                    INSERT INTO {self.table} (lease_key, owner, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT(lease_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                    WHERE {self.table}.expires_at < ?
+                ''', (key, owner, now + self.lease_ttl, now))
+                db.commit()
+                return cursor.rowcount == 1
+        except sqlite3.Error:
+            return True  # 임대 테이블을 쓸 수 없으면 병합 없이 실행
+
+    def _release(self, key, owner):
+        try:
+            with self.pool.connection() as db:
+                db.execute(f'DELETE FROM {self.table} WHERE lease_key = ? AND owner = ?', (key, owner))
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    def in_flight(self):
+        """현재 진행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
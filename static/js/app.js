@@ -7,6 +7,7 @@
 
 // ===== State =====
 let currentImage = null;
+let currentFile = null;
 let ingredients = [];
 let currentRecipe = null;
 let currentUser = null;
@@ -76,8 +77,8 @@ function initEventListeners() {
     // Step 2
     $('nextStepBtn').addEventListener('click', goToStep2);
     $('backToStep1Btn').addEventListener('click', goToStep1);
-    $('generateRecipeBtn').addEventListener('click', generateRecipe);
-    $('regenerateBtn').addEventListener('click', generateRecipe);
+    $('generateRecipeBtn').addEventListener('click', () => generateRecipe());
+    $('regenerateBtn').addEventListener('click', () => generateRecipe(true));
     $('saveRecipeBtn').addEventListener('click', saveRecipe);
     $('newSearchBtn').addEventListener('click', resetAll);
 
@@ -104,6 +105,10 @@ function initEventListeners() {
     // My Recipes
     $('showMyRecipesBtn').addEventListener('click', showMyRecipes);
     $('backToMainBtn').addEventListener('click', showMainView);
+    $('recipeSearchBtn').addEventListener('click', searchRecipes);
+    $('recipeSearchInput').addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') searchRecipes();
+    });
 
     // Profile
     $('showProfileBtn').addEventListener('click', showProfile);
@@ -146,6 +151,7 @@ function handleFile(file) {
         return;
     }
 
+    currentFile = file;
     const reader = new FileReader();
     reader.onload = (e) => {
         currentImage = e.target.result;
@@ -160,6 +166,7 @@ function handleFile(file) {
 
 function removeImage() {
     currentImage = null;
+    currentFile = null;
     $('previewContainer').style.display = 'none';
     $('uploadArea').style.display = 'block';
     $('analyzeBtn').disabled = true;
@@ -169,16 +176,18 @@ function removeImage() {
 }
 
 async function analyzeImage() {
-    if (!currentImage) return;
+    if (!currentFile) return;
 
     setLoading($('analyzeBtn'), true);
     hideError();
 
     try {
+        // 원본 파일을 multipart로 전송 (Base64 JSON 대비 약 33% 작음)
+        const formData = new FormData();
+        formData.append('image', currentFile);
         const res = await fetch('/api/analyze', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ image: currentImage }),
+            body: formData,
         });
         const data = await res.json();
 
@@ -268,7 +277,7 @@ function renderIngredientsPreview() {
 }
 
 // ===== Step 2: Recipe Generation =====
-async function generateRecipe() {
+async function generateRecipe(fresh = false) {
     if (ingredients.length === 0) {
         showError('재료가 없습니다.');
         return;
@@ -279,7 +288,8 @@ async function generateRecipe() {
         cuisine: $('cuisineSelect').value,
         difficulty: $('difficultySelect').value,
         cookTime: $('cookTimeSelect').value,
-        servings: parseInt($('servingsSelect').value)
+        servings: parseInt($('servingsSelect').value),
+        fresh  // 다시 생성 시 서버 캐시를 건너뜀
     };
 
     setLoading($('generateRecipeBtn'), true);
@@ -287,24 +297,13 @@ async function generateRecipe() {
     hideError();
 
     try {
-        const res = await fetch('/api/recipe', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(options),
-        });
-        const data = await res.json();
-
-        if (data.success && data.recipe) {
-            currentRecipe = data.recipe;
+        const recipe = await streamRecipe(options);
+        if (recipe) {
+            currentRecipe = recipe;
             currentRecipe._ingredients = ingredients;
             currentRecipe._cuisineType = options.cuisine;
-            displayRecipe(data.recipe);
-            $('recipeOptionsSection').style.display = 'none';
-            $('recipeResultSection').style.display = 'block';
-            setActiveStep(3);
-            $('recipeResultSection').scrollIntoView({ behavior: 'smooth' });
-        } else {
-            showError(data.error || '레시피 생성에 실패했습니다.');
+            displayRecipe(recipe);
+            showRecipeResult();
         }
     } catch (e) {
         showError('서버 연결에 실패했습니다.');
@@ -314,40 +313,128 @@ async function generateRecipe() {
     }
 }
 
-function displayRecipe(recipe) {
-    $('recipeName').textContent = recipe.name || '추천 레시피';
-    $('recipeDescription').textContent = recipe.description || '';
-    $('recipeCookTime').textContent = recipe.cookTime || '30분';
-    $('recipeDifficulty').textContent = recipe.difficulty || '중급';
-    $('recipeServings').textContent = (recipe.servings || 2) + '인분';
-
-    const ingList = $('recipeIngredients');
-    ingList.innerHTML = '';
-    (recipe.ingredients || []).forEach(ing => {
-        const li = document.createElement('li');
-        const name = typeof ing === 'string' ? ing : ing.name;
-        const amount = typeof ing === 'object' ? ing.amount : '';
-        const available = typeof ing === 'object' ? ing.available !== false : true;
-        li.innerHTML = `<span>${name}</span><span>${amount ? `<span class="amount">${amount}</span>` : ''}${!available ? '<span class="unavailable">(추가 필요)</span>' : ''}</span>`;
-        ingList.appendChild(li);
+// 레시피 스트리밍 (SSE): 완성된 필드/재료/단계부터 화면에 표시
+async function streamRecipe(options) {
+    const res = await fetch('/api/recipe/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(options),
     });
 
-    const stepsList = $('recipeSteps');
-    stepsList.innerHTML = '';
-    (recipe.steps || []).forEach(step => {
-        const li = document.createElement('li');
-        li.textContent = step.replace(/^\d+\.\s*/, '');
-        stepsList.appendChild(li);
+    if (!res.ok || !res.body) {
+        const data = await res.json().catch(() => ({}));
+        showError(data.error || '레시피 생성에 실패했습니다.');
+        return null;
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = parseSSEMessage(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            if (!message) continue;
+
+            const { event, data } = message;
+            if (event === 'model' || event === 'reset') {
+                clearRecipeDisplay();
+            } else if (event === 'field') {
+                renderRecipeField(data.key, data.value);
+                showRecipeResult();
+            } else if (event === 'ingredient') {
+                appendRecipeIngredient(data);
+                showRecipeResult();
+            } else if (event === 'step') {
+                appendRecipeStep(data);
+                showRecipeResult();
+            } else if (event === 'done') {
+                reader.cancel();
+                return data.recipe;
+            } else if (event === 'error') {
+                reader.cancel();
+                showError(data.error || '레시피 생성에 실패했습니다.');
+                return null;
+            }
+        }
+    }
+
+    showError('레시피 생성에 실패했습니다.');
+    return null;
+}
+
+function parseSSEMessage(block) {
+    let event = 'message';
+    const dataLines = [];
+    block.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
     });
+    if (dataLines.length === 0) return null;
+    return { event, data: JSON.parse(dataLines.join('\n')) };
+}
 
-    if (recipe.tips && recipe.tips.trim()) {
-        $('recipeTips').textContent = recipe.tips;
-        $('tipsSectionContainer').style.display = 'block';
-    } else {
-        $('tipsSectionContainer').style.display = 'none';
+function showRecipeResult() {
+    if ($('recipeResultSection').style.display === 'block') return;
+    $('recipeOptionsSection').style.display = 'none';
+    $('recipeResultSection').style.display = 'block';
+    setActiveStep(3);
+    $('recipeResultSection').scrollIntoView({ behavior: 'smooth' });
+}
+
+function clearRecipeDisplay() {
+    $('recipeName').textContent = '';
+    $('recipeDescription').textContent = '';
+    $('recipeIngredients').innerHTML = '';
+    $('recipeSteps').innerHTML = '';
+    $('tipsSectionContainer').style.display = 'none';
+}
+
+function renderRecipeField(key, value) {
+    if (key === 'name') $('recipeName').textContent = value || '추천 레시피';
+    else if (key === 'description') $('recipeDescription').textContent = value || '';
+    else if (key === 'cookTime') $('recipeCookTime').textContent = value || '30분';
+    else if (key === 'difficulty') $('recipeDifficulty').textContent = value || '중급';
+    else if (key === 'servings') $('recipeServings').textContent = (value || 2) + '인분';
+    else if (key === 'tips') {
+        if (value && String(value).trim()) {
+            $('recipeTips').textContent = value;
+            $('tipsSectionContainer').style.display = 'block';
+        } else {
+            $('tipsSectionContainer').style.display = 'none';
+        }
     }
 }
 
+function appendRecipeIngredient(ing) {
+    const li = document.createElement('li');
+    const name = typeof ing === 'string' ? ing : ing.name;
+    const amount = typeof ing === 'object' ? ing.amount : '';
+    const available = typeof ing === 'object' ? ing.available !== false : true;
+    li.innerHTML = `<span>${name}</span><span>${amount ? `<span class="amount">${amount}</span>` : ''}${!available ? '<span class="unavailable">(추가 필요)</span>' : ''}</span>`;
+    $('recipeIngredients').appendChild(li);
+}
+
+function appendRecipeStep(step) {
+    const li = document.createElement('li');
+    li.textContent = String(step).replace(/^\d+\.\s*/, '');
+    $('recipeSteps').appendChild(li);
+}
+
+function displayRecipe(recipe) {
+    clearRecipeDisplay();
+    ['name', 'description', 'cookTime', 'difficulty', 'servings', 'tips']
+        .forEach(key => renderRecipeField(key, recipe[key]));
+    (recipe.ingredients || []).forEach(appendRecipeIngredient);
+    (recipe.steps || []).forEach(appendRecipeStep);
+}
+
 // ===== Step 3: Save Recipe =====
 async function saveRecipe() {
     if (!currentRecipe) {
@@ -387,6 +474,7 @@ async function saveRecipe() {
 
 function resetAll() {
     currentImage = null;
+    currentFile = null;
     ingredients = [];
     currentRecipe = null;
 
@@ -477,6 +565,9 @@ async function handleLogout() {
 }
 
 // ===== My Recipes =====
+const RECIPE_LIST_FIELDS = 'id,name,difficulty,cook_time,cuisine_type,created_at';
+const RECIPE_PAGE_SIZE = 20;
+
 async function showMyRecipes() {
     if (!currentUser) {
         showModal('loginModal');
@@ -485,10 +576,11 @@ async function showMyRecipes() {
 
     hideAllSections();
     $('myRecipesSection').style.display = 'block';
+    $('recipeSearchInput').value = '';
 
     try {
         const [recipesRes, statsRes] = await Promise.all([
-            fetch('/api/recipes'),
+            fetch(`/api/recipes?fields=${RECIPE_LIST_FIELDS}&limit=${RECIPE_PAGE_SIZE}`),
             fetch('/api/history/stats')
         ]);
 
@@ -500,33 +592,97 @@ async function showMyRecipes() {
             $('statAnalysisCount').textContent = statsData.stats.analysis_count;
         }
 
-        const grid = $('recipesGrid');
-        if (recipesData.success && recipesData.recipes.length > 0) {
-            grid.innerHTML = '';
-            recipesData.recipes.forEach(r => {
-                const item = document.createElement('div');
-                item.className = 'recipe-item';
-                item.dataset.id = r.id;
-                item.innerHTML = `
-                    <div class="recipe-item-header">
-                        <span class="recipe-item-name">${r.name}</span>
-                        <span class="recipe-item-date">${formatDate(r.created_at)}</span>
-                    </div>
-                    <div class="recipe-item-meta">
-                        ${r.difficulty || ''} · ${r.cook_time || ''} · ${r.cuisine_type || ''}
-                    </div>
-                `;
-                item.addEventListener('click', () => showRecipeDetail(r.id));
-                grid.appendChild(item);
-            });
+        showRecipeList(recipesData, '저장된 레시피가 없습니다.', nextRecipesPage);
+    } catch (e) {
+        showError('레시피를 불러올 수 없습니다.');
+    }
+}
+
+async function searchRecipes() {
+    const query = $('recipeSearchInput').value.trim();
+    if (!query) {
+        showMyRecipes();
+        return;
+    }
+
+    try {
+        const res = await fetch(`/api/recipes/search?q=${encodeURIComponent(query)}`);
+        const data = await res.json();
+        showRecipeList(data, '검색 결과가 없습니다.', nextSearchPage(query));
+    } catch (e) {
+        showError('검색에 실패했습니다.');
+    }
+}
+
+function nextRecipesPage(data) {
+    if (!data.next_cursor) return null;
+    return `/api/recipes?fields=${RECIPE_LIST_FIELDS}&limit=${RECIPE_PAGE_SIZE}&cursor=${encodeURIComponent(data.next_cursor)}`;
+}
+
+function nextSearchPage(query) {
+    return (data) => data.next_offset == null ? null
+        : `/api/recipes/search?q=${encodeURIComponent(query)}&offset=${data.next_offset}`;
+}
+
+function showRecipeList(data, emptyMessage, nextPage) {
+    const grid = $('recipesGrid');
+    if (data.success && data.recipes.length > 0) {
+        grid.innerHTML = '';
+        appendRecipeItems(data, nextPage);
+    } else if (data.success) {
+        grid.innerHTML = `<p class="empty-message">${emptyMessage}</p>`;
+    } else {
+        showError(data.error);
+    }
+}
+
+async function loadMoreRecipes(url, nextPage) {
+    try {
+        const res = await fetch(url);
+        const data = await res.json();
+        if (data.success) {
+            appendRecipeItems(data, nextPage);
         } else {
-            grid.innerHTML = '<p class="empty-message">저장된 레시피가 없습니다.</p>';
+            showError(data.error);
         }
     } catch (e) {
         showError('레시피를 불러올 수 없습니다.');
     }
 }
 
+function appendRecipeItems(data, nextPage) {
+    const grid = $('recipesGrid');
+    $('loadMoreRecipesBtn')?.remove();
+
+    data.recipes.forEach(r => {
+        const item = document.createElement('div');
+        item.className = 'recipe-item';
+        item.dataset.id = r.id;
+        item.innerHTML = `
+            <div class="recipe-item-header">
+                <span class="recipe-item-name">${r.highlight || escapeHtml(r.name)}</span>
+                <span class="recipe-item-date">${formatDate(r.created_at)}</span>
+            </div>
+            <div class="recipe-item-meta">
+                ${escapeHtml(r.difficulty)} · ${escapeHtml(r.cook_time)} · ${escapeHtml(r.cuisine_type)}
+            </div>
+            ${r.snippet ? `<div class="recipe-item-snippet">${r.snippet}</div>` : ''}
+        `;
+        item.addEventListener('click', () => showRecipeDetail(r.id));
+        grid.appendChild(item);
+    });
+
+    const url = nextPage(data);
+    if (url) {
+        const more = document.createElement('button');
+        more.className = 'btn btn-secondary';
+        more.id = 'loadMoreRecipesBtn';
+        more.textContent = '더 보기';
+        more.addEventListener('click', () => loadMoreRecipes(url, nextPage));
+        grid.appendChild(more);
+    }
+}
+
 let currentDetailRecipeId = null;
 
 async function showRecipeDetail(id) {
@@ -716,6 +872,13 @@ function showSuccess(msg) {
     setTimeout(() => $('successMessage').style.display = 'none', 3000);
 }
 
+// highlight/snippet은 서버에서 이스케이프 후 <mark>만 추가해 보내므로 그대로 사용
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text ?? '';
+    return div.innerHTML;
+}
+
 function formatDate(dateStr) {
     if (!dateStr) return '';
     const d = new Date(dateStr);
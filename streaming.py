@@ -0,0 +1,204 @@
+"""
+스트리밍 유틸리티 - SSE 포맷 및 레시피 JSON 점진 파서
+"""
+
+import json
+import re
+
+# 최상위에서 찾는 후보: 추론 블록 시작 또는 여는 중괄호 (llm_response.next_opener와 같은 규칙)
+_START = re.compile(r'<think>|\{', re.IGNORECASE)
+_THINK_OPEN = '<think>'
+_THINK_CLOSE = '</think>'
+_THINK_END = re.compile(_THINK_CLOSE, re.IGNORECASE)
+_NEXT_TOKEN = re.compile(r'\s*(\S)')
+
+
+def format_sse(event, data):
+    """Server-Sent Events 메시지 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def iter_sse_data(lines):
+    """업스트림 SSE 줄에서 data 페이로드만 추출 ([DONE]에서 종료)"""
+    for line in lines:
+        if not line.startswith('data:'):
+            continue  # 빈 줄, 주석(: OPENROUTER PROCESSING) 등
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return
+        if data:
+            yield data
+
+
+class _Frame:
+    """JSON 컨테이너(객체/배열) 파싱 상태"""
+
+    __slots__ = ('kind', 'path', 'start', 'index', 'key', 'expect_key')
+
+    def __init__(self, kind, path, start):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.index = 0
+        self.key = None
+        self.expect_key = kind == 'object'
+
+
+class IncrementalRecipeParser:
+    """스트리밍되는 레시피 JSON을 조각 단위로 받아 완성된 부분부터 이벤트로 반환
+
+    이벤트: ('field', {"key", "value"}) - 최상위 스칼라 필드 (name, description 등)
+            ('ingredient', 항목) - ingredients 배열 원소
+            ('step', 항목) - steps 배열 원소
+
+    <think> 추론 블록과 JSON이 아닌 중괄호("{파전}", "{계란: 2}")는 건너뜀.
+    최상위 객체에 ingredients/steps 키가 나오기 전의 필드 이벤트는 보류했다가 레시피로 확인되면 내보내고,
+    레시피가 아닌 객체가 닫히면 버린 뒤 다음 객체를 찾음 (app.is_recipe_object와 같은 기준)
+    """
+
+    ARRAY_EVENTS = {('ingredients',): 'ingredient', ('steps',): 'step'}
+    RECIPE_KEYS = ('ingredients', 'steps')
+    SCALAR_END = ',}] \t\r\n'
+
+    def __init__(self):
+        self.text = ''
+        self.pos = 0
+        self.done = False
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._scalar_start = None
+        self._in_think = False
+        self._confirmed = False
+        self._pending = []
+
+    def feed(self, chunk):
+        """텍스트 조각 추가 후 새로 완성된 이벤트 목록 반환"""
+        self.text += chunk
+        events = []
+        text = self.text
+        stack = self._stack
+        i = self.pos
+        end = len(text)
+
+        while i < end and not self.done:
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._on_string(self._string_start, i + 1, events)
+                i += 1
+                continue
+
+            if self._scalar_start is not None:
+                if c not in self.SCALAR_END:
+                    i += 1
+                    continue
+                self._on_value(self._scalar_start, i, events)
+                self._scalar_start = None
+
+            if not stack:
+                start, i = self._seek_object(i)
+                if start is None:
+                    break  # 다음 조각이 와야 판단 가능
+                stack.append(_Frame('object', (), start))
+                i = start + 1
+                continue
+
+            top = stack[-1]
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == '{' or c == '[':
+                child_path = top.path + ((top.key,) if top.kind == 'object' else (top.index,))
+                stack.append(_Frame('object' if c == '{' else 'array', child_path, i))
+            elif c == '}' or c == ']':
+                frame = stack.pop()
+                if stack:
+                    self._on_value(frame.start, i + 1, events)
+                elif self._confirmed:
+                    self.done = True
+                else:
+                    self._pending = []  # 레시피가 아닌 객체 ("{"name": "오믈렛"} 같은 예시)
+            elif c == ':':
+                top.expect_key = False
+            elif c == ',':
+                if top.kind == 'object':
+                    top.expect_key = True
+                else:
+                    top.index += 1
+            elif c not in ' \t\r\n':
+                self._scalar_start = i
+            i += 1
+
+        self.pos = i
+        return events
+
+    def _seek_object(self, pos):
+        """pos 이후 최상위 JSON 객체가 시작되는 위치 찾기. (시작 위치 또는 None, 다음에 다시 볼 위치) 반환
+
+        추론 블록 태그나 여는 괄호 다음 글자가 아직 도착하지 않았으면 시작 위치 None
+        """
+        text = self.text
+        while True:
+            if self._in_think:
+                close = _THINK_END.search(text, pos)
+                if close is None:
+                    # 닫는 태그가 조각 경계에 걸쳤을 수 있으므로 그만큼 남겨 둠
+                    return None, max(pos, len(text) - len(_THINK_CLOSE) + 1)
+                self._in_think = False
+                pos = close.end()
+                continue
+            match = _START.search(text, pos)
+            if match is None:
+                partial = text.rfind('<', pos)
+                if partial >= 0 and _THINK_OPEN.startswith(text[partial:].lower()):
+                    return None, partial
+                return None, len(text)
+            if match.group() != '{':
+                self._in_think = True
+                pos = match.end()
+                continue
+            token = _NEXT_TOKEN.match(text, match.end())
+            if token is None:
+                return None, match.start()
+            if token.group(1) in '"}':
+                return match.start(), match.start()
+            pos = match.end()  # "{파전}" 같은 설명문 괄호
+
+    def _on_string(self, start, stop, events):
+        top = self._stack[-1]
+        if top.kind == 'object' and top.expect_key:
+            top.key = self._decode(start, stop)
+            if len(self._stack) == 1 and top.key in self.RECIPE_KEYS and not self._confirmed:
+                self._confirmed = True
+                events.extend(self._pending)
+                self._pending = []
+        else:
+            self._on_value(start, stop, events)
+
+    def _on_value(self, start, stop, events):
+        """부모 컨테이너 기준으로 값 하나가 완성됨"""
+        parent = self._stack[-1]
+        if parent.kind == 'object' and not parent.path:
+            if self.text[start] not in '{[' and isinstance(parent.key, str):
+                event = ('field', {"key": parent.key, "value": self._decode(start, stop)})
+                (events if self._confirmed else self._pending).append(event)
+        elif parent.kind == 'array':
+            event = self.ARRAY_EVENTS.get(parent.path)
+            if event:
+                events.append((event, self._decode(start, stop)))
+
+    def _decode(self, start, stop):
+        raw = self.text[start:stop]
+        try:
+            return json.loads(raw, strict=False)
+        except ValueError:
+            return raw.strip('"')
@@ -0,0 +1,108 @@
+"""
+캐시 테스트 - 인메모리 LRU 제거 순서/TTL, SQLite 캐시 행 수 제한, 계층 캐시 승격
+서버 없이 실행: python test_cache.py (pytest로도 실행 가능)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache import LRUCache, SQLiteCache, TieredCache
+from database import ConnectionPool
+from migrations import migrate
+
+
+def migrated_pool():
+    """최신 스키마로 만든 임시 파일 DB의 연결 풀"""
+    path = os.path.join(tempfile.mkdtemp(prefix='test_cache_'), 'test.db')
+    db = sqlite3.connect(path)
+    migrate(db)
+    db.close()
+    return ConnectionPool(path, max_size=2)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_lru_ttl_and_per_entry_override():
+    cache = LRUCache(max_size=8, ttl=0.05)
+    cache.set('short', 1)
+    cache.set('long', 2, ttl=60)
+    time.sleep(0.1)
+    assert cache.get('short') is None
+    assert cache.get('long') == 2
+    assert cache.keys() == {'long'}
+
+
+def test_sqlite_cache_keeps_most_recently_used_rows():
+    """행 수 제한을 넘으면 최근 사용 시각이 가장 오래된 행부터 제거 (조회도 사용으로 침)"""
+    cache = SQLiteCache(migrated_pool(), 'analysis_cache', max_rows=2, ttl=60, touch_interval=0)
+    cache.set('a', {"n": 1})
+    time.sleep(0.01)
+    cache.set('b', {"n": 2})
+    time.sleep(0.01)
+    assert cache.get('a') == {"n": 1}
+    time.sleep(0.01)
+    cache.set('c', {"n": 3})
+    assert cache.keys() == {'a', 'c'}
+
+
+def test_sqlite_cache_expired_rows_are_deleted():
+    pool = migrated_pool()
+    cache = SQLiteCache(pool, 'recipe_cache', ttl=0.05)
+    cache.set('k', [1, 2])
+    assert cache.get('k') == [1, 2]
+    time.sleep(0.1)
+    assert cache.get('k') is None
+    with pool.connection() as db:
+        assert db.execute('SELECT COUNT(*) FROM recipe_cache').fetchone()[0] == 0
+
+
+def test_tiered_cache_promotes_with_remaining_ttl():
+    """SQLite 적중은 남은 유효 시간만큼만 메모리에 올려 계층 간 만료 시각이 같음"""
+    cache = TieredCache(LRUCache(max_size=8, ttl=60), SQLiteCache(migrated_pool(), 'recipe_cache', ttl=60))
+    cache.set('k', {"name": "파전"}, ttl=0.2)
+    cache.memory.clear()
+    assert cache.get('k') == {"name": "파전"}
+    assert 'k' in cache.memory.keys()
+    time.sleep(0.25)
+    assert cache.get('k') is None
+    assert cache.keys() == set()
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_tiered_cache_survives_sqlite_errors():
+    """영구 계층이 실패해도(테이블 없음, 잠금 등) 메모리 계층으로 동작"""
+    pool = ConnectionPool(os.path.join(tempfile.mkdtemp(prefix='test_cache_'), 'empty.db'), max_size=1)
+    cache = TieredCache(LRUCache(max_size=8, ttl=60), SQLiteCache(pool, 'recipe_cache'))
+    cache.set('k', 1)
+    assert cache.get('k') == 1
+    cache.memory.clear()
+    assert cache.get('k') is None
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("캐시 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
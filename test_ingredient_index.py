@@ -0,0 +1,139 @@
+"""
+재료 역색인 테스트 - 보유 재료 매칭 순위/부족 재료, 증분 갱신, 사용자 인덱스 로드 중 갱신 보존, 사용자 수 제한
+서버 없이 실행: python test_ingredient_index.py (pytest로도 실행 가능)
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ingredient_index import IngredientIndex
+
+
+def recipe(*ingredients):
+    return json.dumps({"ingredients": [{"name": name} for name in ingredients]}, ensure_ascii=False)
+
+
+class SlowDB:
+    """조회 중에 다른 스레드가 레시피를 저장하는 상황을 만드는 가짜 DB (저장은 조회 결과에 포함되지 않음)"""
+
+    def __init__(self, rows, during_select=None):
+        self.rows = rows
+        self.during_select = during_select
+        self.selects = 0
+
+    def execute(self, sql, params):
+        self.selects += 1
+        if self.during_select is not None:
+            self.during_select()
+            time.sleep(0.05)
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+
+def matched_ids(index, user_id, ingredients):
+    return sorted(r['id'] for r in index.match(user_id, ingredients))
+
+
+def pantry_index():
+    index = IngredientIndex()
+    index.load(7, [
+        (1, '파계란', recipe('계란', '대파')),
+        (2, '계란당근전', recipe('계란', '대파', '당근')),
+        (3, '감자조림', recipe('당근', '감자')),
+        (4, '계란프라이', json.dumps({"ingredients": ['계란 2개']}, ensure_ascii=False)),
+    ])
+    return index
+
+
+def test_match_ranks_by_missing_then_coverage():
+    """부족 재료 수 → 보유율 → 최신 id 순, 재료 이름은 동의어/분량 표기와 무관하게 비교"""
+    results = pantry_index().match(7, ['달걀', '파 1단'])
+    assert [r['id'] for r in results] == [4, 1, 2]
+    assert results[2] == {
+        "id": 2, "name": '계란당근전', "coverage": 0.667, "missing_count": 1,
+        "matched": ['계란', '대파'], "missing": ['당근']
+    }
+
+
+def test_match_filters_and_limits():
+    index = pantry_index()
+    assert [r['id'] for r in index.match(7, ['계란', '대파'], max_missing=0)] == [4, 1]
+    assert [r['id'] for r in index.match(7, ['계란', '대파'], limit=1)] == [4]
+    assert index.match(7, ['두부']) == []
+    assert index.match(8, ['계란']) == []
+
+
+def test_incremental_add_and_remove():
+    index = pantry_index()
+    index.add(7, 5, '두부조림', recipe('두부', '대파'))
+    index.remove(7, 1)
+    assert [r['id'] for r in index.match(7, ['두부', '대파'], max_missing=0)] == [5]
+    assert [r['id'] for r in index.match(7, ['대파'])] == [5, 2]
+    index.add(9, 1, '무시됨', recipe('계란'))  # 아직 로드하지 않은 사용자는 첫 조회 때 로드
+    assert index.stats()['users'] == 1
+
+
+def test_add_during_reload_is_kept():
+    """다시 로드하는 동안 저장된 레시피가 이전 인덱스에만 반영되어 사라지면 안 됨"""
+    index = IngredientIndex(ttl=0)
+    index.load_user(SlowDB([(1, '계란찜', recipe('계란'))]), 7)
+    saver = threading.Thread(target=index.add, args=(7, 2, '계란말이', recipe('계란', '대파')))
+    index.load_user(SlowDB([(1, '계란찜', recipe('계란'))], during_select=saver.start), 7)
+    saver.join(5)
+    assert matched_ids(index, 7, ['계란']) == [1, 2]
+
+
+def test_remove_during_reload_is_kept():
+    index = IngredientIndex(ttl=0)
+    rows = [(1, '계란찜', recipe('계란')), (2, '계란말이', recipe('계란'))]
+    index.load_user(SlowDB(rows), 7)
+    deleter = threading.Thread(target=index.remove, args=(7, 2))
+    index.load_user(SlowDB(rows, during_select=deleter.start), 7)
+    deleter.join(5)
+    assert matched_ids(index, 7, ['계란']) == [1]
+
+
+def test_reload_only_after_ttl():
+    index = IngredientIndex(ttl=60)
+    db = SlowDB([(1, '계란찜', recipe('계란'))])
+    index.load_user(db, 7)
+    index.load_user(db, 7)
+    assert db.selects == 1
+
+
+def test_least_recently_used_users_are_evicted():
+    """max_users를 넘으면 가장 오래 쓰지 않은 사용자를 버리고, 다음 조회 때 DB에서 다시 로드"""
+    index = IngredientIndex(ttl=60, max_users=2)
+    dbs = {user_id: SlowDB([(user_id, f'레시피{user_id}', recipe('계란'))]) for user_id in (1, 2, 3)}
+    index.load_user(dbs[1], 1)
+    index.load_user(dbs[2], 2)
+    assert matched_ids(index, 1, ['계란']) == [1]  # 1번 사용자를 최근 사용으로
+    index.load_user(dbs[3], 3)
+
+    assert index.stats()['users'] == 2
+    assert index.match(2, ['계란']) == []
+    index.load_user(dbs[2], 2)
+    assert dbs[2].selects == 2 and dbs[1].selects == 1
+    assert matched_ids(index, 2, ['계란']) == [2]
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("재료 역색인 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
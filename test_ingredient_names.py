@@ -0,0 +1,65 @@
+"""
+재료 이름 정규화 테스트 - 동의어/영어 복수형/괄호·분량 표기가 하나의 표준 이름으로 모이는지
+기본 동의어 사전(data/ingredient_synonyms.json) 사용
+서버 없이 실행: python test_ingredient_names.py (pytest로도 실행 가능)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ingredient_names import IngredientCanonicalizer, canonical_key, canonical_name, canonical_names
+
+
+def test_aliases_map_to_canonical_name():
+    cases = {
+        '계란': ['달걀', 'Eggs', 'egg', '생계란', '계란 (10개)', '- 달걀 2개', '계란 10개 약간', 'ＥＧＧ'],
+        '양파': ['onion', 'Onions', '양파 1/2개', '양파(중)'],
+        '다진마늘': ['다진 마늘', '다진마늘 1큰술', 'minced garlic'],
+        '감자': ['potatoes', 'Potato', '감자 2개'],
+        '토마토': ['tomatoes'],
+    }
+    for canonical, aliases in cases.items():
+        for alias in aliases:
+            assert canonical_name(alias) == canonical, (alias, canonical_name(alias))
+
+
+def test_unknown_names_are_only_cleaned():
+    assert canonical_name('  돼지고기   목살 200g ') == '돼지고기 목살'
+    assert canonical_name('½ 팽이버섯') == '팽이버섯'
+    assert canonical_name('소금 약간') == '소금'
+    assert canonical_name('   ') == ''
+    assert canonical_name(None) == ''
+
+
+def test_keys_ignore_spacing_and_case():
+    assert canonical_key('다진 마늘') == canonical_key('다진마늘') == canonical_key('Minced Garlic')
+    assert canonical_key('돼지고기 목살') == canonical_key('돼지고기목살')
+
+
+def test_canonical_names_dedupes_in_order():
+    assert canonical_names(['달걀', '양파', 'eggs', '', '대파', '파', '양파 1개']) == ['계란', '양파', '대파']
+
+
+def test_custom_dictionary_and_memo_reset():
+    canonicalizer = IngredientCanonicalizer({"쪽파": ["실파"]})
+    assert canonicalizer.canonicalize('실파') == '쪽파'
+    assert canonicalizer.canonicalize('영양부추') == '영양부추'
+    canonicalizer.add('부추', ['영양부추'])
+    assert canonicalizer.canonicalize('영양부추') == '부추'
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("재료 이름 정규화 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,129 @@
+"""
+작업 큐 테스트 - 실행/실패 기록, 임대 만료 작업 재실행, 임대 갱신 중인 작업 보호, 대기열 제한
+다른 프로세스는 같은 DB 파일을 각자의 연결 풀로 여는 JobQueue 인스턴스로 흉내냄
+서버 없이 실행: python test_jobs.py (pytest로도 실행 가능)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import ConnectionPool
+from jobs import FINISHED_STATUSES, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING, JobQueue
+from migrations import migrate
+
+
+def migrated_path():
+    path = os.path.join(tempfile.mkdtemp(prefix='test_jobs_'), 'test.db')
+    db = sqlite3.connect(path)
+    migrate(db)
+    db.close()
+    return path
+
+
+def wait_finished(jobs, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job['status'] in FINISHED_STATUSES:
+            return job
+        jobs.wait(0.05)
+    raise AssertionError(f"작업이 끝나지 않음: {jobs.get(job_id)}")
+
+
+def insert_job(path, job_id, status, updated_at, payload='{"n": 1}'):
+    db = sqlite3.connect(path)
+    db.execute(
+        'INSERT INTO jobs (id, kind, user_id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (job_id, 'echo', 1, status, payload, updated_at, updated_at)
+    )
+    db.commit()
+    db.close()
+
+
+def test_job_runs_and_records_result():
+    jobs = JobQueue(ConnectionPool(migrated_path()), workers=2)
+    jobs.register('echo', lambda payload, user_id: {"n": payload['n'], "user": user_id})
+    jobs.register('fail', lambda payload, user_id: 1 / 0)
+    jobs.start()
+
+    done = wait_finished(jobs, jobs.submit('echo', {"n": 3}, user_id=7))
+    assert done['status'] == STATUS_DONE and done['result'] == {"n": 3, "user": 7}
+    failed = wait_finished(jobs, jobs.submit('fail', {}))
+    assert failed['status'] == STATUS_FAILED and 'division' in failed['error']
+
+
+def test_expired_lease_is_requeued_and_retried():
+    """임대가 만료된 running 작업(프로세스가 죽음)은 다시 실행되고, 임대가 살아 있는 작업은 그대로 둠"""
+    path = migrated_path()
+    now = time.time()
+    insert_job(path, 'dead', STATUS_RUNNING, now - 60)
+    insert_job(path, 'alive', STATUS_RUNNING, now + 60)
+    insert_job(path, 'old-done', STATUS_DONE, now - 3600)
+
+    runs = []
+    jobs = JobQueue(ConnectionPool(path), workers=1, lease=5, retention=600)
+    jobs.register('echo', lambda payload, user_id: runs.append(payload) or {"ok": True})
+    jobs.start()
+
+    assert wait_finished(jobs, 'dead')['result'] == {"ok": True}
+    assert runs == [{"n": 1}]
+    assert jobs.get('alive')['status'] == STATUS_RUNNING
+    assert jobs.get('old-done') is None
+
+
+def test_heartbeat_keeps_long_job_from_other_process():
+    """실행 시간이 임대보다 길어도 임대를 갱신하므로 다른 프로세스가 다시 실행하지 않음"""
+    path = migrated_path()
+    runs = []
+
+    def slow(payload, user_id):
+        runs.append(threading.current_thread().name)
+        time.sleep(1.0)
+        return {"ok": True}
+
+    owner = JobQueue(ConnectionPool(path), workers=1, lease=0.3)
+    other = JobQueue(ConnectionPool(path), workers=1, lease=0.3)
+    for jobs in (owner, other):
+        jobs.register('echo', slow)
+    owner.start()
+    job_id = owner.submit('echo', {})
+    time.sleep(0.1)
+    other.start()
+
+    assert wait_finished(owner, job_id)['status'] == STATUS_DONE
+    assert len(runs) == 1, runs
+
+
+def test_submit_limits_and_unknown_kind():
+    jobs = JobQueue(ConnectionPool(migrated_path()), max_pending=1)
+    jobs.register('echo', lambda payload, user_id: {})
+    first = jobs.submit('echo', {})
+    assert jobs.get(first)['status'] == STATUS_QUEUED
+    assert jobs.submit('echo', {}) is None
+    try:
+        jobs.submit('missing', {})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("등록되지 않은 작업 종류는 ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("작업 큐 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
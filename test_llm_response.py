@@ -0,0 +1,94 @@
+"""
+LLM 응답 파서 테스트 - 첫 번째 완전한 JSON 값 찾기와 잘린 JSON 복구
+기록된 모델 응답(benchmarks/llm_responses.jsonl)과 그 응답을 여러 위치에서 자른 텍스트로 확인
+서버 없이 실행: python test_llm_response.py (pytest로도 실행 가능)
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_response import SalvageStats, first_json, salvage_json
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'llm_responses.jsonl')
+
+
+def is_recipe(value):
+    return isinstance(value, dict) and 'steps' in value
+
+
+def recipe_fixtures():
+    with open(FIXTURES, encoding='utf-8') as f:
+        return [r for r in map(json.loads, f) if r['kind'] == 'recipe']
+
+
+def test_first_json_finds_the_recipe():
+    """추론 블록, 코드 펜스, 설명문의 괄호, 문자열 안의 괄호를 건너뛰고 첫 레시피를 찾음"""
+    for fixture in recipe_fixtures():
+        recipe = first_json(fixture['text'], openers='{', accept=is_recipe)
+        name = recipe['name'] if recipe is not None else None
+        assert name == fixture['expected'], (fixture['note'], name)
+
+
+def test_salvage_truncated_recipes():
+    """이름 뒤 어디서 잘려도 이름과 앞쪽 재료/단계가 복구되고, 마지막 원소만 잘린 값일 수 있음"""
+    for fixture in recipe_fixtures():
+        if fixture['expected'] is None:
+            continue
+        text = fixture['text']
+        full = first_json(text, openers='{', accept=is_recipe)
+        name = json.dumps(fixture['expected'], ensure_ascii=False)
+        begin = text.index(name, text.rfind('</think>') + 1) + len(name)
+        end = text.index(json.dumps(full['steps'][-1], ensure_ascii=False)) + 1
+        for cut in range(begin, end, 5):
+            recipe = salvage_json(text[:cut], openers='{', accept=lambda v: isinstance(v, dict) and 'name' in v)
+            label = (fixture['note'], cut)
+            assert recipe is not None and recipe['name'] == fixture['expected'], (label, recipe)
+            for key in ('ingredients', 'steps'):
+                complete = max(len(recipe.get(key) or []) - 1, 0)
+                assert recipe.get(key, [])[:complete] == full[key][:complete], (label, key, recipe.get(key))
+
+
+def test_salvage_closes_cut_strings_and_escapes():
+    assert salvage_json('{"name": "파전", "steps": ["부친') == {"name": "파전", "steps": ["부친"]}
+    assert salvage_json('{"name": "a\\u12') == {"name": "a"}
+    assert salvage_json('{"name": "a\\') == {"name": "a"}
+    assert salvage_json('{"name": "파전", "servings": ') == {"name": "파전"}
+
+
+def test_salvage_ignores_complete_values():
+    assert salvage_json('{"name": "파전"}') is None
+    assert salvage_json('설명 {파전} 끝') is None
+
+
+def test_deep_nesting_is_unparseable_not_an_error():
+    """디코더 재귀 한도를 넘는 중첩은 예외 없이 건너뛰고 뒤쪽 값을 찾음"""
+    depth = 100000
+    assert first_json('[' * depth + ']' * depth + ' {"a": 1}') == {"a": 1}
+    assert first_json('[' * depth) is None
+    assert salvage_json('{"a": ' + '[' * depth) is None
+
+
+def test_salvage_stats():
+    stats = SalvageStats()
+    stats.record(True)
+    stats.record(True)
+    stats.record(False)
+    assert stats.stats() == {"truncated": 3, "repaired": 2, "escalated": 1, "repair_rate": 0.667}
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("LLM 응답 파서 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
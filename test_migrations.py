@@ -0,0 +1,149 @@
+"""
+스키마 마이그레이션 테스트 - 이전 버전 DB를 채운 뒤 최신 버전으로 올렸을 때의 결과 확인
+서버 없이 실행: python test_migrations.py (pytest로도 실행 가능)
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ingredient_names import canonical_name
+import migrations
+from migrations import MIGRATIONS, current_version, migrate
+import recipe_search
+import user_stats
+
+
+def migrated_to(version):
+    """version까지만 마이그레이션한 임시 파일 DB"""
+    path = os.path.join(tempfile.mkdtemp(prefix='test_migrations_'), 'test.db')
+    db = sqlite3.connect(path)
+    migrate(db, [m for m in MIGRATIONS if m[0] <= version])
+    assert current_version(db) == version
+    return db
+
+
+def test_canonical_name_is_idempotent():
+    for name in ['소금 1 2', '- 간장 (2큰술) 1/2', '계란 10개 약간', 'Eggs', '  돼지고기 200g 1  ']:
+        once = canonical_name(name)
+        assert canonical_name(once) == once, (name, once)
+
+
+def test_upgrade_v6_with_legacy_ingredient_names():
+    """user_version 6 시절에는 재료 이름을 정리 없이 저장했으므로 그런 이름이 표준 이름으로 합쳐져야 함"""
+    db = migrated_to(6)
+    db.execute("INSERT INTO users (id, email, password_hash) VALUES (1, 'a@example.com', 'x')")
+    legacy = [['소금 1 2', '달걀'], ['계란', 'Eggs', '양파'], ['소금', '양파 (1개)']]
+    for ingredients in legacy:
+        cursor = db.execute(
+            'INSERT INTO analysis_history (user_id, detected_ingredients) VALUES (1, ?)',
+            (json.dumps(ingredients, ensure_ascii=False),)
+        )
+        for name in ingredients:
+            db.execute('INSERT OR IGNORE INTO ingredients (name) VALUES (?)', (name,))
+            db.execute(
+                'INSERT OR IGNORE INTO analysis_history_items (history_id, user_id, ingredient_id) '
+                'SELECT ?, 1, id FROM ingredients WHERE name = ?',
+                (cursor.lastrowid, name)
+            )
+    db.commit()
+
+    applied = migrate(db)
+
+    assert applied == [m[0] for m in MIGRATIONS if m[0] > 6]
+    names = {row[0] for row in db.execute('SELECT name FROM ingredients')}
+    assert names == {'소금', '계란', '양파'}, names
+    counts = dict(db.execute(
+        'SELECT i.name, s.count FROM user_ingredient_stats s JOIN ingredients i ON i.id = s.ingredient_id'
+    ).fetchall())
+    assert counts == {'소금': 2, '계란': 2, '양파': 2}, counts
+    assert user_stats.find_mismatches(db) == []
+
+
+def test_fresh_and_upgraded_schemas_match():
+    """처음부터 만든 DB와 단계별로 올린 DB의 스키마가 같아야 함"""
+    fresh = migrated_to(MIGRATIONS[-1][0])
+    upgraded = migrated_to(1)
+    for version, _description, _step in MIGRATIONS[1:]:
+        migrate(upgraded, [m for m in MIGRATIONS if m[0] <= version])
+
+    def schema(db):
+        return sorted(db.execute("SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"))
+    assert schema(fresh) == schema(upgraded)
+
+
+def save_recipe(db, name, recipe, tags=()):
+    db.execute("INSERT OR IGNORE INTO users (id, email, password_hash) VALUES (1, 'a@example.com', 'x')")
+    db.execute(
+        'INSERT INTO saved_recipes (user_id, recipe_name, recipe_data, tags) VALUES (1, ?, ?, ?)',
+        (name, json.dumps(recipe), json.dumps(list(tags)))
+    )
+    db.commit()
+
+
+PORK_STEW = {
+    "name": "돼지고기 김치찌개",
+    "ingredients": [{"name": "돼지고기", "amount": "200g", "available": True}, "묵은지"],
+    "steps": ["1. 돼지고기를 볶는다", "2. 묵은지를 넣고 끓인다"],
+    "tips": "멸치 육수를 쓰면 더 좋음",
+}
+
+
+def search_names(db, query):
+    return [r['name'] for r in recipe_search.search(db, 1, query)[0]]
+
+
+def test_search_indexes_ingredient_names_only():
+    """버전 12에 저장된 레시피도 버전 13에서 재료 이름만 다시 색인 (분량/보유 여부는 검색되지 않음)"""
+    db = migrated_to(12)
+    db.row_factory = sqlite3.Row
+    save_recipe(db, '돼지고기 김치찌개', PORK_STEW, tags=['저녁'])
+    assert search_names(db, '200g') == ['돼지고기 김치찌개']
+    migrate(db)
+    save_recipe(db, '두부조림', {"ingredients": [{"name": "두부", "amount": "1true"}], "steps": ["조린다"]})
+
+    assert search_names(db, '200g') == []
+    assert search_names(db, 'true') == []
+    assert search_names(db, '묵은지') == ['돼지고기 김치찌개']
+    assert search_names(db, '두부 조린') == ['두부조림']
+    assert search_names(db, '멸치 육수') == ['돼지고기 김치찌개']
+
+
+def test_search_without_fts_support():
+    """FTS5 trigram을 지원하지 않는 SQLite에서도 마이그레이션이 끝나고 인덱스 없이 검색됨"""
+    supported = migrations.fts_trigram_supported
+    migrations.fts_trigram_supported = lambda db: False
+    try:
+        db = migrated_to(MIGRATIONS[-1][0])
+    finally:
+        migrations.fts_trigram_supported = supported
+    db.row_factory = sqlite3.Row
+    assert not recipe_search.has_index(db)
+    save_recipe(db, '돼지고기 김치찌개', PORK_STEW, tags=['저녁'])
+    save_recipe(db, '두부조림', {"ingredients": ["두부"], "steps": ["조린다"]})
+
+    assert search_names(db, '200g') == []
+    assert search_names(db, '돼지고기') == ['돼지고기 김치찌개']
+    assert search_names(db, '저녁 묵은지') == ['돼지고기 김치찌개']
+    results, has_more = recipe_search.search(db, 1, '다', limit=1)
+    assert [r['name'] for r in results] == ['두부조림'] and has_more
+    assert results[0]['snippet'] == '두부조림 두부 조린<mark>다</mark>'
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("스키마 마이그레이션 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,117 @@
+"""
+모델 헤지 레이스 테스트 - 가장 빠른 유효 응답 채택, 실패 시 즉시 다음 모델 투입, 동시 호출 수 제한, 치명적 오류 중단
+app을 불러오면 시작 작업이 현재 디렉터리에 smart_recipe.db를 만들므로 임시 디렉터리에서 불러오고, 모델 호출(try_model)은 가짜로 대체
+서버 없이 실행: python test_model_race.py (pytest로도 실행 가능)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('OPENROUTER_POOL_WARMUP', '0')
+os.chdir(tempfile.mkdtemp(prefix='test_model_race_'))
+
+import app  # noqa: E402
+
+
+class FakeModels:
+    """모델별 (지연 초, 오류) 설정대로 응답하는 try_model 대체. 호출 순서와 최대 동시 호출 수 기록"""
+
+    def __init__(self, behaviors):
+        self.behaviors = behaviors
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, model, messages, timeout, parse):
+        delay, error = self.behaviors[model]
+        with self.lock:
+            self.calls.append(model)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(delay)
+        finally:
+            with self.lock:
+                self.active -= 1
+        if error is not None:
+            return None, error
+        return (f'{model} 응답', {"model": model}), None
+
+
+@contextmanager
+def racing(behaviors, hedge_delay, max_concurrency=2):
+    fake = FakeModels(behaviors)
+    saved = app.try_model, app.MODEL_HEDGE_DELAY, app.MODEL_RACE_MAX_CONCURRENCY
+    app.try_model, app.MODEL_HEDGE_DELAY, app.MODEL_RACE_MAX_CONCURRENCY = fake, hedge_delay, max_concurrency
+    try:
+        yield fake
+    finally:
+        app.try_model, app.MODEL_HEDGE_DELAY, app.MODEL_RACE_MAX_CONCURRENCY = saved
+
+
+def race(models):
+    start = time.monotonic()
+    result = app.race_models(models, [], 10, None)
+    return result, time.monotonic() - start
+
+
+def test_fast_primary_runs_alone():
+    with racing({'a': (0.01, None), 'b': (0.01, None)}, hedge_delay=1) as fake:
+        (model, content, parsed, error), _ = race(['a', 'b'])
+    assert (model, content, parsed, error) == ('a', 'a 응답', {"model": 'a'}, None)
+    assert fake.calls == ['a']
+
+
+def test_hedged_model_wins_when_primary_is_slow():
+    """헤지 지연이 지나면 다음 모델을 투입하고, 먼저 끝난 유효 응답을 기다림 없이 반환"""
+    with racing({'slow': (1.0, None), 'fast': (0.01, None)}, hedge_delay=0.05) as fake:
+        (model, _, _, error), elapsed = race(['slow', 'fast'])
+    assert (model, error) == ('fast', None)
+    assert fake.calls == ['slow', 'fast']
+    assert elapsed < 0.5, elapsed
+
+
+def test_failure_launches_next_model_without_waiting():
+    with racing({'a': (0.01, {"code": 429, "message": "rate limited"}), 'b': (0.01, None)}, hedge_delay=5) as fake:
+        (model, _, _, error), elapsed = race(['a', 'b'])
+    assert (model, error) == ('b', None)
+    assert fake.calls == ['a', 'b']
+    assert elapsed < 1, elapsed
+
+
+def test_concurrency_is_capped_and_last_error_returned():
+    behaviors = {name: (0.2, {"message": f'{name} 실패'}) for name in ('a', 'b', 'c', 'd')}
+    with racing(behaviors, hedge_delay=0.01, max_concurrency=2) as fake:
+        (model, _, _, error), _ = race(['a', 'b', 'c', 'd'])
+    assert model is None and error['message'].endswith('실패')
+    assert sorted(fake.calls) == ['a', 'b', 'c', 'd']
+    assert fake.max_active == 2
+
+
+def test_fatal_error_stops_launching():
+    """429 외의 오류 코드(인증 실패 등)는 다른 모델로도 해결되지 않으므로 더 투입하지 않음"""
+    with racing({'a': (0.01, {"code": 401, "message": "bad key"}), 'b': (0.01, None)}, hedge_delay=5) as fake:
+        (model, _, _, error), _ = race(['a', 'b'])
+    assert model is None and error['code'] == 401
+    assert fake.calls == ['a']
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("모델 헤지 레이스 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
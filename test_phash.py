@@ -0,0 +1,130 @@
+"""
+지각 해시 테스트 - 멀티 인덱스 해밍 거리 조회, 유사/다른 이미지 거리, 저장된 해시 로드와 정리
+서버 없이 실행: python test_phash.py (pytest로도 실행 가능)
+"""
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image, ImageDraw
+
+from database import ConnectionPool
+from migrations import migrate
+from phash import MultiIndexHash, PerceptualHashIndex, dhash, hamming_distance, is_informative
+
+MAX_DISTANCE = 6  # app.py PHASH_MAX_DISTANCE 기본값
+
+
+def flip_bits(value, count, rng):
+    for bit in rng.sample(range(64), count):
+        value ^= 1 << bit
+    return value
+
+
+def photo(seed, size=(640, 480)):
+    """도형 몇 개를 그린 사진 대용 이미지"""
+    rng = random.Random(seed)
+    img = Image.new('RGB', size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        w, h = rng.randrange(40, 260), rng.randrange(40, 200)
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        draw.ellipse((x, y, x + w, y + h), fill=color)
+    return img
+
+
+def encode(img, image_format='PNG', **options):
+    buf = io.BytesIO()
+    img.save(buf, image_format, **options)
+    return buf.getvalue()
+
+
+def test_within_matches_brute_force():
+    """조각 탐색 결과가 전체 비교와 같아야 함 (경계 거리 포함)"""
+    rng = random.Random(1)
+    keys = [rng.getrandbits(64) for _ in range(300)]
+    index = MultiIndexHash()
+    for i, key in enumerate(keys):
+        index.add(key, i)
+    for _ in range(200):
+        base = rng.choice(keys)
+        query = flip_bits(base, rng.randrange(0, 12), rng)
+        for max_distance in (0, 3, MAX_DISTANCE, 7, 11):
+            expected = sorted((hamming_distance(query, k), i) for i, k in enumerate(keys)
+                              if hamming_distance(query, k) <= max_distance)
+            assert index.within(query, max_distance) == expected, (query, max_distance)
+
+
+def test_threshold_is_inclusive():
+    rng = random.Random(2)
+    key = rng.getrandbits(64)
+    index = MultiIndexHash()
+    index.add(key, 'digest')
+    query = flip_bits(key, MAX_DISTANCE, rng)
+    assert index.nearest(query, MAX_DISTANCE) == (MAX_DISTANCE, 'digest')
+    assert index.nearest(query, MAX_DISTANCE - 1) is None
+
+
+def test_reencoded_photo_is_near_and_other_photo_is_far():
+    """축소/JPEG 재인코딩한 같은 사진은 기본 임계값 이내, 다른 사진은 밖"""
+    original = photo(10)
+    base = dhash(encode(original))
+    variants = [
+        encode(original, 'JPEG', quality=40),
+        encode(original.resize((320, 240)), 'JPEG', quality=70),
+        encode(original.resize((1280, 960)), 'WEBP', quality=60),
+    ]
+    for data in variants:
+        assert hamming_distance(base, dhash(data)) <= MAX_DISTANCE
+    for seed in range(11, 21):
+        assert hamming_distance(base, dhash(encode(photo(seed)))) > MAX_DISTANCE, seed
+
+
+def test_flat_image_is_not_informative():
+    assert is_informative(dhash(encode(photo(3))))
+    assert not is_informative(dhash(encode(Image.new('RGB', (64, 64), (200, 30, 30)))))
+    assert dhash(b'not an image') is None
+
+
+def test_index_loads_saved_hashes_and_prunes_dead_digests():
+    """load()는 저장된 해시를 불러온 뒤 캐시에서 사라진 다이제스트의 해시를 메모리/DB에서 지움"""
+    path = os.path.join(tempfile.mkdtemp(prefix='test_phash_'), 'test.db')
+    db = sqlite3.connect(path)
+    migrate(db)
+    db.close()
+    live = {'a', 'b'}
+    first = PerceptualHashIndex(ConnectionPool(path), live_digests=lambda: live)
+    first.add(0x0F0F0F0F0F0F0F0F, 'a')
+    first.add(0xF0F0F0F0F0F0F0F0, 'b')
+
+    live.discard('b')
+    pool = ConnectionPool(path)
+    second = PerceptualHashIndex(pool, live_digests=lambda: live)
+    assert second.find(0x0F0F0F0F0F0F0F0F, MAX_DISTANCE) == []
+    second.load()
+    assert second.find(0x0F0F0F0F0F0F0F0E, MAX_DISTANCE) == [(1, 'a')]
+    assert second.find(0xF0F0F0F0F0F0F0F0, MAX_DISTANCE) == []
+    with pool.connection() as db:
+        assert [row[0] for row in db.execute('SELECT digest FROM image_phashes')] == ['a']
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("지각 해시 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
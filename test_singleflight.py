@@ -0,0 +1,140 @@
+"""
+싱글 플라이트 테스트 - 동시 호출 병합, 예외 공유, SQLite 임대를 통한 프로세스 간 병합
+프로세스 간 병합은 같은 DB 파일을 각자의 연결 풀로 여는 두 인스턴스로 확인
+서버 없이 실행: python test_singleflight.py (pytest로도 실행 가능)
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import ConnectionPool
+from migrations import migrate
+from singleflight import SingleFlight
+
+
+def migrated_path():
+    path = os.path.join(tempfile.mkdtemp(prefix='test_singleflight_'), 'test.db')
+    db = sqlite3.connect(path)
+    migrate(db)
+    db.close()
+    return path
+
+
+def run_concurrently(flight, key, fn, count):
+    """count개 스레드가 같은 key로 호출. 첫 호출이 fn 안에 들어간 뒤 나머지를 시작하고 (결과, 공유 여부) 목록 반환"""
+    results = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            outcome = flight.do(key, fn)
+        except Exception as e:
+            outcome = e
+        with lock:
+            results.append(outcome)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    threads[0].start()
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_calls_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"recipe": "파전"}
+
+    results = run_concurrently(flight, 'recipe:a', fn, 8)
+    assert len(calls) == 1
+    assert all(result == {"recipe": "파전"} for result, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.in_flight() == 0
+
+
+def test_exception_is_shared_and_next_call_runs_again():
+    flight = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError('upstream down')
+
+    results = run_concurrently(flight, 'k', fail, 4)
+    assert len(calls) == 1
+    assert all(isinstance(e, RuntimeError) for e in results), results
+    assert flight.do('k', lambda: 'ok') == ('ok', False)
+
+
+def test_different_keys_are_not_merged():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+
+
+def test_cross_process_follower_uses_leader_result():
+    """임대를 가진 쪽만 fn을 실행하고, 다른 프로세스는 임대가 풀린 뒤 lookup으로 결과를 받음"""
+    path = migrated_path()
+    leader = SingleFlight(ConnectionPool(path), poll_interval=0.01)
+    follower = SingleFlight(ConnectionPool(path), poll_interval=0.01)
+    store = {}
+    started = threading.Event()
+
+    def generate():
+        started.set()
+        time.sleep(0.1)
+        store['k'] = '레시피'
+        return '레시피'
+
+    thread = threading.Thread(target=leader.do, args=('k', generate, lambda: store.get('k')))
+    thread.start()
+    started.wait(5)
+    result = follower.do('k', lambda: '중복 호출', lookup=lambda: store.get('k'))
+    thread.join(5)
+    assert result == ('레시피', True)
+    with ConnectionPool(path).connection() as db:
+        assert db.execute('SELECT COUNT(*) FROM singleflight_leases').fetchone()[0] == 0
+
+
+def test_expired_lease_is_taken_over():
+    """임대를 가진 프로세스가 죽어 만료된 임대는 다른 프로세스가 넘겨받아 실행"""
+    path = migrated_path()
+    pool = ConnectionPool(path)
+    with pool.connection() as db:
+        db.execute(
+            "INSERT INTO singleflight_leases (lease_key, owner, expires_at) VALUES ('k', 'dead', ?)",
+            (time.time() - 1,)
+        )
+        db.commit()
+    flight = SingleFlight(pool, poll_interval=0.01)
+    assert flight.do('k', lambda: 'new', lookup=lambda: None) == ('new', False)
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("싱글 플라이트 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
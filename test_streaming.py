@@ -0,0 +1,113 @@
+"""
+스트리밍 테스트 - 레시피 JSON 점진 파서와 SSE 유틸리티, 스트림 중단 시 서킷 브레이커 정리
+기록된 모델 응답(benchmarks/llm_responses.jsonl)을 여러 조각 크기로 나눠 넣어 확인
+서버 없이 실행: python test_streaming.py (pytest로도 실행 가능)
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_response import first_json
+from model_scoreboard import ModelScoreboard, OUTCOME_ERROR, STATE_HALF_OPEN
+from streaming import IncrementalRecipeParser, format_sse, iter_sse_data
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'llm_responses.jsonl')
+CHUNK_SIZES = (1, 2, 7, 64, 1 << 20)
+
+
+def recipe_fixtures():
+    with open(FIXTURES, encoding='utf-8') as f:
+        return [r for r in map(json.loads, f) if r['kind'] == 'recipe']
+
+
+def parse_in_chunks(text, size):
+    parser = IncrementalRecipeParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return parser, events
+
+
+def test_fixtures_stream_the_real_recipe():
+    """추론 블록/설명문의 괄호를 건너뛰고 실제 레시피 필드/재료/단계만 이벤트로 보냄"""
+    for fixture in recipe_fixtures():
+        if fixture['expected'] is None:
+            continue
+        recipe = first_json(fixture['text'], openers='{', accept=lambda v: isinstance(v, dict) and 'steps' in v)
+        for size in CHUNK_SIZES:
+            parser, events = parse_in_chunks(fixture['text'], size)
+            label = (fixture['note'], size)
+            fields = [data for event, data in events if event == 'field']
+            assert all(isinstance(field['key'], str) for field in fields), (label, fields)
+            assert fields[0] == {"key": "name", "value": fixture['expected']}, (label, fields[0])
+            assert [data for event, data in events if event == 'ingredient'] == recipe['ingredients'], label
+            assert [data for event, data in events if event == 'step'] == recipe['steps'], label
+            assert parser.done, label
+
+
+def test_text_without_json_emits_nothing():
+    for fixture in recipe_fixtures():
+        if fixture['expected'] is None:
+            parser, events = parse_in_chunks(fixture['text'], 3)
+            assert events == [] and not parser.done, events
+
+
+def test_example_object_before_recipe_is_discarded():
+    """레시피가 아닌 객체가 닫히면 보류한 필드를 버리고 다음 객체를 찾음"""
+    text = '예시 형식: {"name": "오믈렛"} 입니다.\n{"name": "파전", "servings": 2, "steps": ["부친다"]}'
+    for size in CHUNK_SIZES:
+        parser, events = parse_in_chunks(text, size)
+        assert events == [
+            ('field', {"key": "name", "value": "파전"}),
+            ('field', {"key": "servings", "value": 2}),
+            ('step', '부친다'),
+        ], (size, events)
+        assert parser.done
+
+
+def test_think_tags_split_across_chunks():
+    parser = IncrementalRecipeParser()
+    events = []
+    for chunk in ['<th', 'INK>{"name": "가짜", "steps": ["x"]}</thi', 'nk>', '{"name": "진짜", ', '"steps": ["y"]}']:
+        events.extend(parser.feed(chunk))
+    assert events == [('field', {"key": "name", "value": "진짜"}), ('step', 'y')], events
+
+
+def test_sse_round_trip():
+    message = format_sse('field', {"key": "name", "value": "파전"})
+    assert message == 'event: field\ndata: {"key": "name", "value": "파전"}\n\n'
+    lines = [': OPENROUTER PROCESSING', 'data: {"a": 1}', '', 'data: [DONE]', 'data: {"b": 2}']
+    assert list(iter_sse_data(lines)) == ['{"a": 1}']
+
+
+def test_released_probe_allows_next_call():
+    """반열림 시험 호출이 결과 없이 끝나면(클라이언트 연결 종료) release로 다음 호출이 가능해야 함"""
+    scoreboard = ModelScoreboard(failure_threshold=1, reset_timeout=0.01)
+    scoreboard.acquire('m')
+    scoreboard.record('m', OUTCOME_ERROR, 1.0)
+    time.sleep(0.02)
+    assert scoreboard.acquire('m')
+    assert not scoreboard.acquire('m')
+    scoreboard.release('m')
+    assert scoreboard.snapshot(['m'])['models']['m']['breaker'] == STATE_HALF_OPEN
+    assert scoreboard.ranked(['m']) == ['m']
+    assert scoreboard.acquire('m')
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("스트리밍 테스트")
+    print("=" * 60)
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            try:
+                func()
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,105 @@
+"""
+사용자 통계 - 레시피 수/분석 횟수/재료별 횟수를 트리거로 갱신하는 집계 테이블
+원본 테이블에 쓰는 트랜잭션 안에서 함께 갱신되므로 통계 조회는 기본 키 조회만 필요
+테이블/트리거는 migrations.py 버전 5에서 생성
+
+일관성 확인: python user_stats.py [DB 경로]
+재계산:      python user_stats.py --rebuild [DB 경로]
+"""
+
+import argparse
+import sqlite3
+
+# 원본 테이블에서 직접 계산한 통계
+EXPECTED_USER_STATS = '''
+    SELECT user_id,
+           SUM(recipe_count) AS recipe_count,
+           SUM(analysis_count) AS analysis_count
+    FROM (
+        SELECT user_id, COUNT(*) AS recipe_count, 0 AS analysis_count
+        FROM saved_recipes WHERE user_id IS NOT NULL GROUP BY user_id
+        UNION ALL
+        SELECT user_id, 0, COUNT(*)
+        FROM analysis_history WHERE user_id IS NOT NULL GROUP BY user_id
+    )
+    GROUP BY user_id
+'''
+
+EXPECTED_INGREDIENT_STATS = '''
+    SELECT user_id, ingredient_id, COUNT(*) AS count
+    FROM analysis_history_items
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id, ingredient_id
+'''
+
+REBUILD_STATEMENTS = [
+    'DELETE FROM user_stats',
+    f'INSERT INTO user_stats (user_id, recipe_count, analysis_count) {EXPECTED_USER_STATS}',
+    'DELETE FROM user_ingredient_stats',
+    f'INSERT INTO user_ingredient_stats (user_id, ingredient_id, count) {EXPECTED_INGREDIENT_STATS}',
+]
+
+
+def rebuild(db):
+    """원본 테이블에서 통계를 다시 계산 (호출자가 커밋)"""
+    for statement in REBUILD_STATEMENTS:
+        db.execute(statement)
+
+
+def find_mismatches(db):
+    """집계 테이블과 원본 계산값이 다른 항목 목록 반환: [(테이블, 키, 저장값, 기대값)]"""
+    mismatches = []
+    stored = {
+        row[0]: (row[1], row[2])
+        for row in db.execute('SELECT user_id, recipe_count, analysis_count FROM user_stats')
+    }
+    for user_id, recipe_count, analysis_count in db.execute(EXPECTED_USER_STATS).fetchall():
+        actual = stored.pop(user_id, (0, 0))
+        if actual != (recipe_count, analysis_count):
+            mismatches.append(('user_stats', user_id, actual, (recipe_count, analysis_count)))
+    for user_id, actual in stored.items():
+        if actual != (0, 0):
+            mismatches.append(('user_stats', user_id, actual, (0, 0)))
+
+    stored = {
+        (row[0], row[1]): row[2]
+        for row in db.execute('SELECT user_id, ingredient_id, count FROM user_ingredient_stats')
+    }
+    for user_id, ingredient_id, count in db.execute(EXPECTED_INGREDIENT_STATS).fetchall():
+        actual = stored.pop((user_id, ingredient_id), 0)
+        if actual != count:
+            mismatches.append(('user_ingredient_stats', (user_id, ingredient_id), actual, count))
+    for key, actual in stored.items():
+        if actual != 0:
+            mismatches.append(('user_ingredient_stats', key, actual, 0))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='사용자 통계 일관성 확인 및 재계산')
+    parser.add_argument('database', nargs='?', default='smart_recipe.db')
+    parser.add_argument('--rebuild', action='store_true', help='불일치가 있으면 원본 테이블에서 다시 계산')
+    args = parser.parse_args()
+
+    db = sqlite3.connect(args.database, timeout=30)
+    db.execute('BEGIN IMMEDIATE')  # 확인/재계산 중 쓰기 차단
+    mismatches = find_mismatches(db)
+    for table, key, actual, expected in mismatches[:20]:
+        print(f"❌ {table} {key}: 저장값 {actual}, 기대값 {expected}")
+    if len(mismatches) > 20:
+        print(f"   ... 외 {len(mismatches) - 20}건")
+
+    if not mismatches:
+        print("✅ 사용자 통계가 원본 테이블과 일치합니다")
+        db.rollback()
+    elif args.rebuild:
+        rebuild(db)
+        db.commit()
+        print(f"🔧 {len(mismatches)}건 불일치 → 통계 재계산 완료")
+    else:
+        db.rollback()
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()